@@ -4,14 +4,17 @@ from typing import Any
 
 from fastapi import APIRouter
 from psa_core.contracts import (
+    evaluate_curve_payload,
     evaluate_point_payload,
     evaluate_portfolio_payload,
     evaluate_rows_from_ranges_payload,
     evaluate_rows_payload,
 )
+from psa_core.engine import GridLimitError
 
 from psa_api.errors import ApiLimitError
 from psa_api.schema_validation import (
+    validate_curve_envelope,
     validate_point_envelope,
     validate_portfolio_envelope,
     validate_ranges_envelope,
@@ -30,6 +33,26 @@ async def evaluate_point_endpoint(payload: dict[str, Any]) -> dict[str, Any]:
     return evaluate_point_payload(payload)
 
 
+@router.post("/evaluate/curve")
+async def evaluate_curve_endpoint(payload: dict[str, Any]) -> dict[str, Any]:
+    validate_curve_envelope(payload)
+
+    timestamp_count = len(payload["timestamps"])
+    if timestamp_count > MAX_EVALUATION_ROWS:
+        raise ApiLimitError(
+            code="timestamps_limit_exceeded",
+            message=(
+                f"timestamps length must be <= {MAX_EVALUATION_ROWS}. "
+                f"Received {timestamp_count}. {CLI_HINT}"
+            ),
+            details=[
+                {"field": "timestamps", "actual": timestamp_count, "limit": MAX_EVALUATION_ROWS}
+            ],
+        )
+
+    return evaluate_curve_payload(payload)
+
+
 @router.post("/evaluate/portfolio")
 async def evaluate_portfolio_endpoint(payload: dict[str, Any]) -> dict[str, Any]:
     validate_portfolio_envelope(payload)
@@ -77,4 +100,12 @@ async def evaluate_rows_from_ranges_endpoint(payload: dict[str, Any]) -> dict[st
             ],
         )
 
-    return evaluate_rows_from_ranges_payload(payload)
+    # With a tolerance the steps only seed the grid; refinement stops at the same row limit.
+    try:
+        return evaluate_rows_from_ranges_payload(payload, max_rows=MAX_EVALUATION_ROWS)
+    except GridLimitError as exc:
+        raise ApiLimitError(
+            code="ranges_limit_exceeded",
+            message=f"{exc}. {CLI_HINT}",
+            details=[{"field": "tolerance", "limit": MAX_EVALUATION_ROWS}],
+        ) from exc
@@ -8,6 +8,7 @@ from typing import Any
 from jsonschema import Draft202012Validator, FormatChecker
 
 EVALUATE_POINT_REQUEST_SCHEMA = "evaluate_point.request.v1.json"
+EVALUATE_CURVE_REQUEST_SCHEMA = "evaluate_curve.request.v1.json"
 EVALUATE_PORTFOLIO_REQUEST_SCHEMA = "evaluate_portfolio.request.v1.json"
 EVALUATE_ROWS_REQUEST_SCHEMA = "evaluate_rows.request.v1.json"
 EVALUATE_ROWS_FROM_RANGES_REQUEST_SCHEMA = "evaluate_rows_from_ranges.request.v1.json"
@@ -17,6 +18,7 @@ _REPO_ROOT = Path(__file__).resolve().parents[3]
 _SCHEMAS_DIR = _REPO_ROOT / "schemas"
 _REQUEST_SCHEMA_FILES = (
     EVALUATE_POINT_REQUEST_SCHEMA,
+    EVALUATE_CURVE_REQUEST_SCHEMA,
     EVALUATE_PORTFOLIO_REQUEST_SCHEMA,
     EVALUATE_ROWS_REQUEST_SCHEMA,
     EVALUATE_ROWS_FROM_RANGES_REQUEST_SCHEMA,
@@ -79,6 +81,17 @@ def validate_point_envelope(payload: dict[str, Any]) -> None:
     )
 
 
+def validate_curve_envelope(payload: dict[str, Any]) -> None:
+    validate_request_payload(
+        payload.get("strategy", {}),
+        schema_name=STRATEGY_UPSERT_REQUEST_SCHEMA,
+    )
+    validate_request_payload(
+        {"timestamps": payload.get("timestamps")},
+        schema_name=EVALUATE_CURVE_REQUEST_SCHEMA,
+    )
+
+
 def validate_rows_envelope(payload: dict[str, Any]) -> None:
     validate_request_payload(
         payload.get("strategy", {}),
@@ -130,8 +143,9 @@ def validate_ranges_envelope(payload: dict[str, Any]) -> None:
         )
         if key in payload
     }
-    if "include_price_breakpoints" in payload:
-        range_request["include_price_breakpoints"] = payload["include_price_breakpoints"]
+    for optional_key in ("include_price_breakpoints", "tolerance"):
+        if optional_key in payload:
+            range_request[optional_key] = payload[optional_key]
     validate_request_payload(
         range_request,
         schema_name=EVALUATE_ROWS_FROM_RANGES_REQUEST_SCHEMA,
@@ -78,6 +78,23 @@ def test_evaluate_rows_from_ranges_success_matches_response_schema(client: TestC
     validate(response.json(), schema, format_checker=FORMAT_CHECKER)
 
 
+def test_evaluate_curve_returns_exact_knots(client: TestClient) -> None:
+    payload = _load_json(EXAMPLES / "share_curve.json")
+    response = client.post("/v1/evaluate/curve", json=payload)
+    assert response.status_code == 200
+
+    body = response.json()
+    schema = _load_json(SCHEMAS / "evaluate_curve.response.v1.json")
+    validate(body, schema, format_checker=FORMAT_CHECKER)
+    assert [curve["timestamp"] for curve in body["curves"]] == payload["timestamps"]
+    assert all(len(curve["knots"]) == 5 for curve in body["curves"])
+
+    payload["timestamps"] = []
+    response = client.post("/v1/evaluate/curve", json=payload)
+    assert response.status_code == 422
+    assert response.json()["error"]["code"] == "schema_validation_error"
+
+
 def test_schema_error_returns_unified_422(client: TestClient) -> None:
     payload = _load_json(EXAMPLES / "bear_accumulate_point.json")
     payload["strategy"]["unexpected_field"] = 1
@@ -142,6 +159,24 @@ def test_ranges_limit_returns_422_with_cli_hint(client: TestClient) -> None:
     assert "CLI workflow" in body["error"]["message"]
 
 
+def test_ranges_tolerance_refines_grid_within_limit(client: TestClient) -> None:
+    payload = _load_json(EXAMPLES / "range_timeseries_rows.json")
+    uniform = client.post("/v1/evaluate/rows-from-ranges", json=payload).json()["rows"]
+
+    payload["tolerance"] = 0.01
+    response = client.post("/v1/evaluate/rows-from-ranges", json=payload)
+    assert response.status_code == 200
+    assert len(response.json()["rows"]) > len(uniform)
+
+    payload["tolerance"] = 0.0001
+    response = client.post("/v1/evaluate/rows-from-ranges", json=payload)
+    assert response.status_code == 422
+    body = response.json()
+    _assert_error_shape(body)
+    assert body["error"]["code"] == "ranges_limit_exceeded"
+    assert "CLI workflow" in body["error"]["message"]
+
+
 def test_unexpected_error_returns_unified_500(
     client: TestClient,
     monkeypatch: pytest.MonkeyPatch,
@@ -165,6 +200,7 @@ def test_openapi_contains_v1_evaluate_paths(client: TestClient) -> None:
     assert response.status_code == 200
     paths = response.json()["paths"]
     assert "/v1/evaluate/point" in paths
+    assert "/v1/evaluate/curve" in paths
     assert "/v1/evaluate/portfolio" in paths
     assert "/v1/evaluate/rows" in paths
     assert "/v1/evaluate/rows-from-ranges" in paths
@@ -2,50 +2,148 @@ from __future__ import annotations
 
 import json
 import sys
+import time
 from argparse import Namespace
-from collections.abc import Sequence
+from collections.abc import Iterator, Sequence
 from typing import Any
 
-from psa_core.contracts import ContractError
-
-from psa_cli.errors import CliArgumentError, CliError, ExitCode
-from psa_cli.handlers import execute_command
-from psa_cli.io_json import read_json_input, write_json_output
+from psa_cli import timings
+from psa_cli.errors import CliArgumentError, CliError, CliIoError, ExitCode
 from psa_cli.parser import build_parser
-from psa_cli.schema import validate_request
+from psa_cli.timings import phase
+
+# Command modules (handlers, schema validation, psa_core) are imported inside the functions
+# that need them, so a command only pays the import cost of what it actually runs.
 
 INPUT_COMMANDS = {
     "evaluate-point",
     "evaluate-portfolio",
     "evaluate-rows",
     "evaluate-ranges",
+    "evaluate-all",
     "strategy-upsert",
     "log-append",
+    "convert-prices",
+}
+
+# NDJSON input commands validate every record against the schema of the mapped command.
+NDJSON_INPUT_COMMANDS = {
+    "log-append-batch": "log-append",
 }
 
 
+# Commands accepting `--input-format ndjson|csv` stream their items instead of one JSON request;
+# CSV cells are converted with the mapped types before schema validation.
+STREAM_INPUT_COLUMNS: dict[str, dict[str, type]] = {
+    "evaluate-rows": {"timestamp": str, "price": float},
+    "convert-prices": {"timestamp": str, "price": float},
+}
+
+
+def _iter_validated_items(command: str, input_path: str, input_format: str) -> Iterator[Any]:
+    from psa_cli.io_stream import iter_csv_records, iter_ndjson_records
+    from psa_cli.schema import validate_request_item
+
+    if input_format == "csv":
+        records = iter_csv_records(input_path, columns=STREAM_INPUT_COLUMNS[command])
+    else:
+        records = iter_ndjson_records(input_path)
+    for line, item in timings.timed_iter("input", records):
+        with phase("validate"):
+            validate_request_item(command, item, line=line)
+        yield item
+
+
 def _print_error(*, error_code: str, message: str, details: Any = None) -> None:
     payload = {"error": {"code": error_code, "message": message, "details": details}}
     sys.stderr.write(json.dumps(payload, separators=(",", ":"), sort_keys=False) + "\n")
 
 
+def _print_timings() -> None:
+    from psa_cli.locks import lock_events
+
+    payload = {"timings": {**timings.phase_timings(), "locks": lock_events()}}
+    sys.stderr.write(json.dumps(payload, separators=(",", ":"), sort_keys=False) + "\n")
+
+
 def run_command(args: Namespace) -> int:
     if not getattr(args, "json_output", False):
         raise CliArgumentError("--json is required")
 
+    from psa_cli.handlers import execute_command
+    from psa_cli.io_json import read_json_input, read_ndjson_input, write_json_output
+    from psa_cli.io_stream import StreamedResponse, write_stream_output
+
     payload: Any = None
-    if args.command_key in INPUT_COMMANDS:
-        payload = read_json_input(args.input_path)
-        validate_request(args.command_key, payload)
+    input_format = getattr(args, "input_format", "json")
+    if input_format == "binary":
+        pass  # the handler memory-maps the price history file itself
+    elif args.command_key in STREAM_INPUT_COLUMNS and input_format != "json":
+        payload = _iter_validated_items(args.command_key, args.input_path, input_format)
+    elif args.command_key in INPUT_COMMANDS:
+        with phase("input"):
+            payload = read_json_input(args.input_path)
+        with phase("validate"):
+            from psa_cli.schema import validate_request
+
+            schema_command = args.command_key
+            if schema_command == "evaluate-all":
+                from psa_cli.evaluate_all import evaluate_all_command
+
+                schema_command = evaluate_all_command(payload)
+            validate_request(schema_command, payload)
+    elif args.command_key in NDJSON_INPUT_COMMANDS:
+        with phase("input"):
+            payload = read_ndjson_input(args.input_path)
+        with phase("validate"):
+            from psa_cli.schema import validate_request
+
+            record_command = NDJSON_INPUT_COMMANDS[args.command_key]
+            for record in payload:
+                validate_request(record_command, record)
 
     response = execute_command(args.command_key, payload, args=args)
     output_path = getattr(args, "output_path", "-")
     pretty = bool(getattr(args, "pretty", False))
-    write_json_output(response, output_path, pretty=pretty)
+    with phase("output"):
+        if isinstance(response, StreamedResponse):
+            output_format = getattr(args, "output_format", "json")
+            write_stream_output(response, output_path, output_format=output_format, pretty=pretty)
+        else:
+            write_json_output(response, output_path, pretty=pretty)
     return int(ExitCode.OK)
 
 
+def _run(args: Namespace) -> int:
+    try:
+        return run_command(args)
+    except CliError as exc:
+        _print_error(error_code=exc.error_code, message=exc.message, details=exc.details)
+        return int(exc.exit_code)
+    except ValueError as exc:  # includes psa_core ContractError
+        _print_error(error_code="validation_error", message=str(exc), details=None)
+        return int(ExitCode.VALIDATION)
+    except Exception as exc:  # pragma: no cover - fallback guard
+        _print_error(error_code="internal_error", message="unexpected error", details=str(exc))
+        return int(ExitCode.INTERNAL)
+
+
+def _run_profiled(args: Namespace, profile_path: str) -> int:
+    import cProfile
+
+    profiler = cProfile.Profile()
+    exit_code = profiler.runcall(_run, args)
+    try:
+        profiler.dump_stats(profile_path)
+    except OSError as exc:
+        error = CliIoError(f"failed to write profile to {profile_path}: {exc.strerror or exc}")
+        _print_error(error_code=error.error_code, message=error.message, details=None)
+        return exit_code or int(error.exit_code)
+    return exit_code
+
+
 def main(argv: Sequence[str] | None = None) -> int:
+    started_at = time.perf_counter()
     parser = build_parser()
     try:
         args = parser.parse_args(argv)
@@ -61,14 +159,13 @@ def main(argv: Sequence[str] | None = None) -> int:
         parser.print_help()
         return int(ExitCode.OK)
 
+    if args.timings:
+        timings.enable(started_at)
     try:
-        return run_command(args)
-    except CliError as exc:
-        _print_error(error_code=exc.error_code, message=exc.message, details=exc.details)
-        return int(exc.exit_code)
-    except (ContractError, ValueError) as exc:
-        _print_error(error_code="validation_error", message=str(exc), details=None)
-        return int(ExitCode.VALIDATION)
-    except Exception as exc:  # pragma: no cover - fallback guard
-        _print_error(error_code="internal_error", message="unexpected error", details=str(exc))
-        return int(ExitCode.INTERNAL)
+        if args.profile_path is not None:
+            return _run_profiled(args, args.profile_path)
+        return _run(args)
+    finally:
+        if args.timings:
+            _print_timings()
+            timings.disable()
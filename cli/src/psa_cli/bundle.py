@@ -0,0 +1,438 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import sys
+import tarfile
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any
+
+from psa_cli import timings
+from psa_cli.errors import CliDomainError, CliIoError, CliValidationError
+from psa_cli.storage import StorageBackend, get_backend
+
+# `psa store export/import`: a whole store as one gzip-compressed tar stream. Members are
+#   psa-bundle.json                              format header (first)
+#   strategies/<id>/strategy.json                strategy record with revision and updated_at
+#   strategies/<id>/revisions/<NNNNNN>.ndjson    earlier revisions {revision, updated_at,
+#                                                strategy}, up to BUNDLE_REVISION_CHUNK each
+#   strategies/<id>/logs/<NNNNNN>.ndjson         up to BUNDLE_LOG_CHUNK log records each
+#   strategies/<id>/indexes.json                 declared log index fields
+#   manifest.json                                strategy, revision, log and member counts (last)
+# Version 1 bundles (no revision members or count) are still imported.
+# Every member carries the SHA-256 of its data in the `PSA.sha256` pax header, checked on
+# import; a missing manifest means the stream was cut short. Both directions hold at most a few
+# log chunks in memory. Import applies each strategy's members in order on worker threads, so
+# different strategies are written in parallel while the archive is read sequentially.
+
+BUNDLE_FORMAT = "psa-bundle"
+BUNDLE_VERSION = 2
+SUPPORTED_BUNDLE_VERSIONS = (1, 2)
+BUNDLE_HEADER = "psa-bundle.json"
+BUNDLE_MANIFEST = "manifest.json"
+BUNDLE_LOG_CHUNK = 10_000
+BUNDLE_REVISION_CHUNK = 1_000
+CHECKSUM_HEADER = "PSA.sha256"
+
+
+def _encode_json(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), sort_keys=False).encode("utf-8")
+
+
+def _add_member(archive: tarfile.TarFile, name: str, data: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = int(time.time())
+    info.mode = 0o644
+    info.pax_headers = {CHECKSUM_HEADER: hashlib.sha256(data).hexdigest()}
+    archive.addfile(info, io.BytesIO(data))
+
+
+def _add_chunks(
+    archive: tarfile.TarFile, prefix: str, rows: Iterable[Any], chunk_size: int
+) -> tuple[int, int]:
+    # Writes `rows` as NDJSON members `<prefix>/<NNNNNN>.ndjson`; returns (members, rows).
+    members = 0
+    count = 0
+    chunk: list[bytes] = []
+    for row in rows:
+        chunk.append(_encode_json(row) + b"\n")
+        if len(chunk) >= chunk_size:
+            members += 1
+            count += len(chunk)
+            _add_member(archive, f"{prefix}/{members:06d}.ndjson", b"".join(chunk))
+            chunk = []
+    if chunk:
+        members += 1
+        count += len(chunk)
+        _add_member(archive, f"{prefix}/{members:06d}.ndjson", b"".join(chunk))
+    return members, count
+
+
+def _export_strategy(
+    archive: tarfile.TarFile, backend: StorageBackend, strategy_id: str
+) -> dict[str, int]:
+    from psa_cli.store import iter_earlier_revisions
+
+    record = backend.read_strategy(strategy_id)
+    if record is None:
+        return {"strategies": 0, "revisions": 0, "logs": 0, "members": 0}  # deleted meanwhile
+    prefix = f"strategies/{strategy_id}"
+    _add_member(archive, f"{prefix}/strategy.json", _encode_json(record))
+    earlier = (
+        {
+            "revision": item["revision"],
+            "updated_at": item["updated_at"],
+            "strategy": item["strategy"],
+        }
+        for item in iter_earlier_revisions(backend, record)
+    )
+    revision_members, revisions = _add_chunks(
+        archive, f"{prefix}/revisions", earlier, BUNDLE_REVISION_CHUNK
+    )
+    log_members, logs = _add_chunks(
+        archive, f"{prefix}/logs", backend.iter_logs(strategy_id), BUNDLE_LOG_CHUNK
+    )
+    indexes = backend.list_log_indexes(strategy_id)
+    _add_member(archive, f"{prefix}/indexes.json", _encode_json(indexes))
+    return {
+        "strategies": 1,
+        "revisions": revisions,
+        "logs": logs,
+        "members": 2 + revision_members + log_members,
+    }
+
+
+def export_store(bundle_path: str) -> dict[str, Any]:
+    if bundle_path == "-":
+        raise CliValidationError("store export requires an output file path")
+    backend = get_backend()
+    target = Path(bundle_path)
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    counts = {"strategies": 0, "revisions": 0, "logs": 0, "members": 2}
+    try:
+        with tmp_path.open("wb") as handle:
+            with tarfile.open(fileobj=handle, mode="w|gz", format=tarfile.PAX_FORMAT) as archive:
+                header = {"format": BUNDLE_FORMAT, "version": BUNDLE_VERSION}
+                _add_member(archive, BUNDLE_HEADER, _encode_json(header))
+                for summary in backend.iter_strategies():
+                    added = _export_strategy(archive, backend, str(summary["strategy_id"]))
+                    for key, value in added.items():
+                        counts[key] += value
+                _add_member(archive, BUNDLE_MANIFEST, _encode_json(counts))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, target)
+    except OSError as exc:
+        tmp_path.unlink(missing_ok=True)
+        raise CliIoError(
+            f"failed to write output to {bundle_path}: {exc.strerror or str(exc)}"
+        ) from exc
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return {
+        "output": bundle_path,
+        "backend": backend.name,
+        "strategies": counts["strategies"],
+        "revisions": counts["revisions"],
+        "logs": counts["logs"],
+        "bytes": target.stat().st_size,
+    }
+
+
+def _invalid_bundle(source_label: str, message: str, **details: Any) -> CliDomainError:
+    return CliDomainError(
+        "invalid_bundle", f"{source_label}: {message}", details={"input": source_label, **details}
+    )
+
+
+def _iter_members(archive: tarfile.TarFile, source_label: str) -> Iterator[tuple[str, bytes]]:
+    while True:
+        try:
+            member = archive.next()
+            if member is None:
+                return
+            extracted = archive.extractfile(member) if member.isfile() else None
+            data = extracted.read() if extracted is not None else None
+        except (tarfile.TarError, EOFError, OSError) as exc:
+            raise _invalid_bundle(source_label, f"unreadable archive ({exc})") from exc
+        if data is None:
+            raise _invalid_bundle(source_label, "unexpected non-file entry", entry=member.name)
+        expected = member.pax_headers.get(CHECKSUM_HEADER)
+        if expected != hashlib.sha256(data).hexdigest():
+            raise _invalid_bundle(source_label, "checksum mismatch", entry=member.name)
+        yield member.name, data
+
+
+def _decode_json(source_label: str, name: str, data: bytes) -> Any:
+    try:
+        return json.loads(data)
+    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise _invalid_bundle(source_label, "invalid JSON entry", entry=name) from exc
+
+
+def _strategy_member(source_label: str, name: str) -> tuple[str, str]:
+    # "strategies/<id>/<rest>" -> (id, rest)
+    from psa_cli.store import STRATEGY_ID_RE
+
+    parts = name.split("/", 2)
+    if len(parts) != 3 or parts[0] != "strategies" or not STRATEGY_ID_RE.match(parts[1]):
+        raise _invalid_bundle(source_label, "unexpected entry", entry=name)
+    return parts[1], parts[2]
+
+
+class _Importer:
+    # Runs one chain of steps per strategy: each step waits for the previous step of its
+    # strategy, so records, log chunks and indexes are applied in archive order. At most
+    # `window` steps are pending, which bounds the log chunks held in memory.
+    def __init__(self, backend: StorageBackend, pool: ThreadPoolExecutor | None, window: int):
+        self.backend = backend
+        self.pool = pool
+        self.window = window
+        self.pending: deque[Future[None]] = deque()
+        self.last: dict[str, Future[None]] = {}
+
+    def submit(self, strategy_id: str, step: Callable[[StorageBackend], None]) -> None:
+        if self.pool is None:
+            step(self.backend)
+            return
+        previous = self.last.get(strategy_id)
+
+        def run() -> None:
+            if previous is not None:
+                previous.result()
+            step(self.backend)
+
+        future = self.pool.submit(run)
+        self.last[strategy_id] = future
+        self.pending.append(future)
+        while len(self.pending) > self.window or (self.pending and self.pending[0].done()):
+            self.pending.popleft().result()
+
+    def finish(self) -> None:
+        while self.pending:
+            self.pending.popleft().result()
+
+
+def _open_bundle(bundle_path: str) -> tuple[IO[bytes], str]:
+    if bundle_path == "-":
+        return sys.stdin.buffer, "stdin"
+    try:
+        return open(bundle_path, "rb"), bundle_path
+    except OSError as exc:
+        reason = exc.strerror or str(exc)
+        raise CliIoError(f"failed to read input from {bundle_path}: {reason}") from exc
+
+
+def import_store(bundle_path: str, *, jobs: int | None = None) -> dict[str, Any]:
+    if jobs is not None and jobs < 1:
+        raise CliValidationError("jobs must be >= 1")
+    workers = jobs if jobs is not None else os.cpu_count() or 1
+    if timings.enabled():
+        workers = 1  # the phase clock is not thread-safe
+    backend = get_backend()
+    if next(iter(backend.iter_strategies()), None) is not None:
+        raise CliDomainError(
+            "import_target_not_empty",
+            f"storage backend '{backend.name}' already contains strategies",
+            details={"backend": backend.name},
+        )
+
+    handle, source_label = _open_bundle(bundle_path)
+    pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    importer = _Importer(backend, pool, window=2 * workers)
+    counts = {"strategies": 0, "revisions": 0, "logs": 0, "members": 0}
+    seen: set[str] = set()
+    version = BUNDLE_VERSION
+    manifest: Any = None
+    try:
+        try:
+            archive = tarfile.open(fileobj=handle, mode="r|gz")
+        except (tarfile.TarError, EOFError, OSError) as exc:
+            raise _invalid_bundle(source_label, f"unreadable archive ({exc})") from exc
+        with archive:
+            for name, data in _iter_members(archive, source_label):
+                counts["members"] += 1
+                if manifest is not None:
+                    raise _invalid_bundle(source_label, "entry after manifest", entry=name)
+                if counts["members"] == 1:
+                    version = _read_header(source_label, name, data)
+                elif name == BUNDLE_MANIFEST:
+                    manifest = _decode_json(source_label, name, data)
+                else:
+                    _import_member(importer, source_label, name, data, counts=counts, seen=seen)
+        importer.finish()
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if handle is not sys.stdin.buffer:
+            handle.close()
+
+    if manifest is None:
+        raise _invalid_bundle(
+            source_label, "archive ended before its manifest; the store is incomplete"
+        )
+    if version == 1:
+        del counts["revisions"]  # version 1 bundles carry no history
+    if manifest != counts:
+        raise _invalid_bundle(
+            source_label, "archive does not match its manifest", manifest=manifest, read=counts
+        )
+    return {
+        "input": source_label,
+        "backend": backend.name,
+        "strategies": counts["strategies"],
+        "revisions": counts.get("revisions", 0),
+        "logs": counts["logs"],
+    }
+
+
+def _read_header(source_label: str, name: str, data: bytes) -> int:
+    header = _decode_json(source_label, name, data) if name == BUNDLE_HEADER else None
+    for version in SUPPORTED_BUNDLE_VERSIONS:
+        if header == {"format": BUNDLE_FORMAT, "version": version}:
+            return version
+    supported = ", ".join(str(version) for version in SUPPORTED_BUNDLE_VERSIONS)
+    raise _invalid_bundle(source_label, f"not a {BUNDLE_FORMAT} of version {supported}")
+
+
+def _bundle_strategy(source_label: str, name: str, strategy: Any) -> Mapping[str, Any]:
+    from psa_core.contracts import parse_strategy
+
+    if not isinstance(strategy, Mapping):
+        raise _invalid_bundle(source_label, "invalid strategy entry", entry=name)
+    try:
+        parse_strategy(strategy)
+    except ValueError as exc:  # includes psa_core ContractError
+        raise _invalid_bundle(
+            source_label, "invalid strategy entry", entry=name, error=str(exc)
+        ) from exc
+    return strategy
+
+
+def _strategy_record(source_label: str, name: str, strategy_id: str, row: Any) -> dict[str, Any]:
+    if not isinstance(row, Mapping) or row.get("strategy_id") != strategy_id:
+        raise _invalid_bundle(source_label, "strategy record does not match entry", entry=name)
+    if (
+        isinstance(row.get("revision"), bool)
+        or not isinstance(row.get("revision"), int)
+        or row["revision"] < 1
+        or not isinstance(row.get("updated_at"), str)
+    ):
+        raise _invalid_bundle(source_label, "invalid strategy entry", entry=name)
+    return {
+        "strategy_id": strategy_id,
+        "revision": row["revision"],
+        "updated_at": row["updated_at"],
+        "strategy": _bundle_strategy(source_label, name, row.get("strategy")),
+    }
+
+
+def _revision_record(source_label: str, name: str, strategy_id: str, row: Any) -> dict[str, Any]:
+    if (
+        not isinstance(row, Mapping)
+        or isinstance(row.get("revision"), bool)
+        or not isinstance(row.get("revision"), int)
+        or not isinstance(row.get("updated_at"), str)
+    ):
+        raise _invalid_bundle(source_label, "invalid revision entry", entry=name)
+    return {
+        "strategy_id": strategy_id,
+        "revision": row["revision"],
+        "updated_at": row["updated_at"],
+        "strategy": _bundle_strategy(source_label, name, row.get("strategy")),
+    }
+
+
+def _log_row(source_label: str, name: str, strategy_id: str, row: Any) -> dict[str, Any]:
+    from psa_cli.segments import parse_ts
+
+    if (
+        not isinstance(row, Mapping)
+        or not isinstance(row.get("log_id"), str)
+        or not row["log_id"]
+        or not isinstance(row.get("ts"), str)
+        or parse_ts(row["ts"]) is None
+        or not isinstance(row.get("payload"), Mapping)
+    ):
+        raise _invalid_bundle(source_label, "invalid log entry", entry=name)
+    return {
+        "log_id": row["log_id"],
+        "strategy_id": strategy_id,
+        "ts": row["ts"],
+        "payload": dict(row["payload"]),
+    }
+
+
+def _index_fields(source_label: str, name: str, fields: Any) -> list[str]:
+    from psa_cli.log_query import FIELD_RE
+
+    if not isinstance(fields, list):
+        raise _invalid_bundle(source_label, "index list must be an array", entry=name)
+    for field in fields:
+        # Fields become index file names and are inlined into SQL, so nothing else gets through.
+        if not isinstance(field, str) or not FIELD_RE.match(field):
+            raise _invalid_bundle(source_label, "invalid index field", entry=name)
+    return fields
+
+
+def _import_member(
+    importer: _Importer,
+    source_label: str,
+    name: str,
+    data: bytes,
+    *,
+    counts: dict[str, int],
+    seen: set[str],
+) -> None:
+    # A strategy's record comes before its revisions, logs and indexes, and appears once.
+    strategy_id, entry = _strategy_member(source_label, name)
+    if (entry == "strategy.json") == (strategy_id in seen):
+        raise _invalid_bundle(source_label, "entry out of order", entry=name)
+    if entry == "strategy.json":
+        record = _strategy_record(
+            source_label, name, strategy_id, _decode_json(source_label, name, data)
+        )
+        seen.add(strategy_id)
+        counts["strategies"] += 1
+        importer.submit(strategy_id, lambda backend: backend.put_strategy(record))
+    elif entry.startswith("revisions/") and entry.endswith(".ndjson"):
+        records = [
+            _revision_record(
+                source_label, name, strategy_id, _decode_json(source_label, name, line)
+            )
+            for line in data.splitlines()
+            if line
+        ]
+        counts["revisions"] += len(records)
+
+        def put_revisions(backend: StorageBackend) -> None:
+            for record in records:
+                backend.put_revision(record)
+
+        importer.submit(strategy_id, put_revisions)
+    elif entry.startswith("logs/") and entry.endswith(".ndjson"):
+        rows = [
+            _log_row(source_label, name, strategy_id, _decode_json(source_label, name, line))
+            for line in data.splitlines()
+            if line
+        ]
+        counts["logs"] += len(rows)
+        importer.submit(strategy_id, lambda backend: backend.append_logs(strategy_id, rows))
+    elif entry == "indexes.json":
+        fields = _index_fields(source_label, name, _decode_json(source_label, name, data))
+
+        def create_indexes(backend: StorageBackend) -> None:
+            for field in fields:
+                backend.create_log_index(strategy_id, field)
+
+        importer.submit(strategy_id, create_indexes)
+    else:
+        raise _invalid_bundle(source_label, "unexpected entry", entry=name)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import bisect
+import json
+import os
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+from psa_cli.errors import CliDomainError
+from psa_cli.fsutil import read_json_file, storage_error, write_atomic_json
+from psa_cli.locks import exclusive_lock
+
+# Strategy catalog for the file backend, stored next to the strategy directories:
+# - `.catalog.head.json` names the current generation (the commit point);
+# - `.catalog.<gen>.json` is a sorted snapshot of {strategy_id, revision, updated_at};
+# - `.catalog.<gen>.ndjson` is an append-only journal of upserts since that snapshot.
+# Upserts append one journal line; once the journal grows past COMPACT_JOURNAL_BYTES it is
+# folded into a new generation. Readers never take the lock: they follow the head and retry
+# when a concurrent compaction removed the generation they started from.
+
+CATALOG_VERSION = 1
+COMPACT_JOURNAL_BYTES = 1024 * 1024
+_READ_ATTEMPTS = 3
+
+CatalogEntries = dict[str, dict[str, Any]]
+
+
+def _summary(record: Mapping[str, Any]) -> dict[str, Any]:
+    summary = {
+        "strategy_id": record.get("strategy_id"),
+        "revision": record.get("revision"),
+        "updated_at": record.get("updated_at"),
+    }
+    if (
+        not isinstance(summary["strategy_id"], str)
+        or not isinstance(summary["revision"], int)
+        or not isinstance(summary["updated_at"], str)
+    ):
+        raise CliDomainError(
+            "storage_corrupted",
+            "strategy record must include strategy_id, revision and updated_at",
+            details={"strategy_id": summary["strategy_id"]},
+        )
+    return summary
+
+
+def _merge(entries: CatalogEntries, summary: Mapping[str, Any]) -> None:
+    current = entries.get(summary["strategy_id"])
+    if current is None or summary["revision"] >= current["revision"]:
+        entries[summary["strategy_id"]] = dict(summary)
+
+
+class StrategyCatalog:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    @property
+    def head_path(self) -> Path:
+        return self.root / ".catalog.head.json"
+
+    @property
+    def lock_path(self) -> Path:
+        return self.root / ".catalog.lock"
+
+    def _snapshot_path(self, generation: int) -> Path:
+        return self.root / f".catalog.{generation}.json"
+
+    def _journal_path(self, generation: int) -> Path:
+        return self.root / f".catalog.{generation}.ndjson"
+
+    def _read_generation(self) -> int | None:
+        if not self.head_path.is_file():
+            return None
+        head = read_json_file(self.head_path)
+        generation = head.get("generation")
+        if head.get("version") != CATALOG_VERSION or not isinstance(generation, int):
+            return None
+        return generation
+
+    def _read_generation_entries(self, generation: int) -> CatalogEntries:
+        entries: CatalogEntries = {}
+        snapshot_path = self._snapshot_path(generation)
+        if snapshot_path.is_file():
+            snapshot = read_json_file(snapshot_path)
+            raw_entries = snapshot.get("strategies")
+            if snapshot.get("version") != CATALOG_VERSION or not isinstance(raw_entries, list):
+                raise CliDomainError(
+                    "storage_corrupted",
+                    f"unsupported strategy catalog snapshot: {snapshot_path}",
+                    details={"path": str(snapshot_path)},
+                )
+            for item in raw_entries:
+                entries[item["strategy_id"]] = item
+
+        journal_path = self._journal_path(generation)
+        try:
+            with journal_path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    if not line.strip():
+                        continue
+                    try:
+                        _merge(entries, json.loads(line))
+                    except (json.JSONDecodeError, KeyError, TypeError):
+                        # A torn final line from an interrupted append is ignored.
+                        continue
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            raise storage_error(f"failed to read {journal_path}", journal_path, exc) from exc
+        return entries
+
+    def load(self) -> list[dict[str, Any]] | None:
+        for _ in range(_READ_ATTEMPTS):
+            generation = self._read_generation()
+            if generation is None:
+                return None
+            try:
+                entries = self._read_generation_entries(generation)
+            except CliDomainError:
+                if self._read_generation() != generation:
+                    continue
+                raise
+            if self._read_generation() == generation:
+                return [entries[key] for key in sorted(entries)]
+        return None
+
+    def _write_generation(self, generation: int, entries: CatalogEntries) -> None:
+        snapshot = {
+            "version": CATALOG_VERSION,
+            "strategies": [entries[key] for key in sorted(entries)],
+        }
+        write_atomic_json(self._snapshot_path(generation), snapshot)
+        write_atomic_json(self.head_path, {"version": CATALOG_VERSION, "generation": generation})
+
+    def _remove_generation(self, generation: int) -> None:
+        for path in (self._snapshot_path(generation), self._journal_path(generation)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as exc:
+                raise storage_error(f"failed to remove {path}", path, exc) from exc
+
+    def rebuild(self, records: Iterable[Mapping[str, Any]]) -> int:
+        with exclusive_lock(self.lock_path):
+            previous = self._read_generation()
+            entries: CatalogEntries = {}
+            for record in records:
+                _merge(entries, _summary(record))
+            generation = (previous or 0) + 1
+            self._write_generation(generation, entries)
+            if previous is not None:
+                self._remove_generation(previous)
+        return len(entries)
+
+    def put(self, record: Mapping[str, Any]) -> bool:
+        # Returns False when there is no catalog yet; the next reader rebuilds it.
+        line = json.dumps(_summary(record), separators=(",", ":"), sort_keys=False) + "\n"
+        with exclusive_lock(self.lock_path):
+            generation = self._read_generation()
+            if generation is None:
+                return False
+            journal_path = self._journal_path(generation)
+            try:
+                with journal_path.open("a", encoding="utf-8") as handle:
+                    handle.write(line)
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                    journal_size = handle.tell()
+            except OSError as exc:
+                raise storage_error(f"failed to write {journal_path}", journal_path, exc) from exc
+
+            if journal_size >= COMPACT_JOURNAL_BYTES:
+                entries = self._read_generation_entries(generation)
+                self._write_generation(generation + 1, entries)
+                self._remove_generation(generation)
+        return True
+
+
+def page(
+    entries: list[dict[str, Any]],
+    *,
+    prefix: str | None,
+    after: str | None,
+) -> list[dict[str, Any]]:
+    keys = [entry["strategy_id"] for entry in entries]
+    start = 0
+    if prefix:
+        start = bisect.bisect_left(keys, prefix)
+    if after is not None:
+        start = max(start, bisect.bisect_right(keys, after))
+    selected = entries[start:]
+    if prefix:
+        end = bisect.bisect_left(keys, prefix + "\x7f", lo=start) - start
+        selected = selected[:end]
+    return selected
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from psa_cli.errors import CliValidationError
+from psa_cli.fsutil import read_json_file, write_atomic_json
+
+STORE_BACKENDS: tuple[str, ...] = ("files", "sqlite")
+DEFAULT_STORE_BACKEND = "files"
+STORE_LAYOUTS: tuple[str, ...] = ("flat", "sharded")
+DEFAULT_STORE_LAYOUT = "flat"
+CONFIG_FILE_NAME = "config.json"
+DEFAULT_RESULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def store_home() -> Path:
+    # PSA_HOME points every working directory at one shared store.
+    env_value = os.getenv("PSA_HOME")
+    if env_value:
+        return Path(env_value).expanduser()
+    return Path.cwd() / ".psa"
+
+
+def config_path() -> Path:
+    return store_home() / CONFIG_FILE_NAME
+
+
+def load_config() -> Mapping[str, Any]:
+    path = config_path()
+    if not path.is_file():
+        return {}
+    return read_json_file(path)
+
+
+def update_config(updates: Mapping[str, Any]) -> dict[str, Any]:
+    config = dict(load_config())
+    config.update(updates)
+    write_atomic_json(config_path(), config)
+    return config
+
+
+def _validate_choice(name: Any, choices: tuple[str, ...], *, source: str) -> str:
+    if name not in choices:
+        supported = ", ".join(choices)
+        raise CliValidationError(f"{source} must be one of: {supported}")
+    return name
+
+
+def _configured_choice(key: str, env_name: str, choices: tuple[str, ...], default: str) -> str:
+    env_value = os.getenv(env_name)
+    if env_value:
+        return _validate_choice(env_value, choices, source=env_name)
+    config_value = load_config().get(key)
+    if config_value is None:
+        return default
+    return _validate_choice(config_value, choices, source=f"{config_path()} {key}")
+
+
+def configured_backend_name() -> str:
+    return _configured_choice("backend", "PSA_STORE_BACKEND", STORE_BACKENDS, DEFAULT_STORE_BACKEND)
+
+
+def configured_layout() -> str:
+    return _configured_choice("layout", "PSA_STORE_LAYOUT", STORE_LAYOUTS, DEFAULT_STORE_LAYOUT)
+
+
+def _validate_size(value: Any, *, source: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise CliValidationError(f"{source} must be an integer >= 0")
+    return value
+
+
+def configured_result_cache_max_bytes() -> int:
+    # 0 disables the evaluate-ranges result cache.
+    env_value = os.getenv("PSA_RESULT_CACHE_MAX_BYTES")
+    if env_value:
+        try:
+            parsed = int(env_value)
+        except ValueError:
+            parsed = -1
+        return _validate_size(parsed, source="PSA_RESULT_CACHE_MAX_BYTES")
+    config_value = load_config().get("result_cache_max_bytes")
+    if config_value is None:
+        return DEFAULT_RESULT_CACHE_MAX_BYTES
+    return _validate_size(config_value, source=f"{config_path()} result_cache_max_bytes")
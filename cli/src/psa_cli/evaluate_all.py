@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any
+
+from psa_core.contracts import evaluate_point_payload, evaluate_portfolio_payload
+
+from psa_cli.errors import CliError, CliValidationError
+from psa_cli.storage import get_backend
+from psa_cli.store import load_strategy_spec
+
+# `psa evaluate-all` evaluates one observation against every stored strategy. Strategy ids are
+# listed once in the parent and handed to worker processes in batches; workers load the
+# compiled strategies themselves, so only ids and result objects cross process boundaries.
+# A strategy that fails is reported as an inline error result instead of aborting the run.
+
+EVALUATE_ALL_BATCH_SIZE = 64
+
+
+def evaluate_all_command(payload: Any) -> str:
+    # Portfolio observations carry balances; plain observations only timestamp and price.
+    if isinstance(payload, Mapping) and "usd_amount" in payload:
+        return "evaluate-portfolio"
+    return "evaluate-point"
+
+
+def _evaluate_one(strategy_id: str, request: Mapping[str, Any], portfolio: bool) -> dict[str, Any]:
+    try:
+        strategy = load_strategy_spec(strategy_id)
+        if portfolio:
+            result = evaluate_portfolio_payload(request, strategy=strategy)
+        else:
+            result = evaluate_point_payload(request, strategy=strategy)
+        return {"strategy_id": strategy_id, **result}
+    except CliError as exc:
+        error = {"code": exc.error_code, "message": exc.message, "details": exc.details}
+    except ValueError as exc:
+        error = {"code": "validation_error", "message": str(exc), "details": None}
+    return {"strategy_id": strategy_id, "error": error}
+
+
+def _evaluate_batch(
+    strategy_ids: list[str], request: Mapping[str, Any], portfolio: bool
+) -> list[dict[str, Any]]:
+    return [_evaluate_one(strategy_id, request, portfolio) for strategy_id in strategy_ids]
+
+
+def iter_evaluate_all(
+    request: Mapping[str, Any], *, jobs: int | None = None, prefix: str | None = None
+) -> Iterator[dict[str, Any]]:
+    if jobs is not None and jobs < 1:
+        raise CliValidationError("jobs must be >= 1")
+    workers = jobs if jobs is not None else os.cpu_count() or 1
+    portfolio = evaluate_all_command(request) == "evaluate-portfolio"
+    request = dict(request)
+
+    strategy_ids = [
+        str(summary["strategy_id"]) for summary in get_backend().iter_strategies(prefix=prefix)
+    ]
+    batches = [
+        strategy_ids[idx : idx + EVALUATE_ALL_BATCH_SIZE]
+        for idx in range(0, len(strategy_ids), EVALUATE_ALL_BATCH_SIZE)
+    ]
+    return _iter_results(batches, request, portfolio, workers=min(workers, len(batches)))
+
+
+def _iter_results(
+    batches: list[list[str]], request: dict[str, Any], portfolio: bool, *, workers: int
+) -> Iterator[dict[str, Any]]:
+    # Results are yielded in strategy id order as each batch completes.
+    if workers <= 1:
+        for batch in batches:
+            yield from _evaluate_batch(batch, request, portfolio)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for results in pool.map(_evaluate_batch, batches, repeat(request), repeat(portfolio)):
+            yield from results
@@ -0,0 +1,484 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from collections.abc import Generator, Iterator, Mapping, Sequence
+from contextlib import closing
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from psa_cli import catalog, log_index, log_summary, positions, revisions, segments
+from psa_cli.catalog import StrategyCatalog
+from psa_cli.config import configured_layout, store_home
+from psa_cli.errors import CliDomainError, CliValidationError
+from psa_cli.fsutil import read_json_file, storage_error, write_atomic_json
+from psa_cli.locks import exclusive_lock, shared_lock
+from psa_cli.log_query import LogPredicate, matches
+from psa_cli.segments import (
+    DEFAULT_SEGMENT_MAX_AGE_SECONDS,
+    DEFAULT_SEGMENT_MAX_BYTES,
+    RotationPolicy,
+    segment_to_dict,
+)
+from psa_cli.storage import StrategyUpdate, strategy_not_found
+from psa_cli.strategy_cache import COMPILED_FILE_NAME, discard_compiled
+
+STRATEGY_FILE_NAME = "strategy.json"
+LOCK_FILE_NAME = ".lock"
+# Sharded strategy directories live under `_shards/<h[0:2]>/<h[2:4]>/<strategy_id>`, with `h`
+# the SHA-1 of the id. Strategy ids start with a letter or digit, so the fan-out directory
+# never collides with a flat strategy directory.
+SHARD_DIR_NAME = "_shards"
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or raw == "":
+        return default
+    try:
+        value = float(raw)
+    except ValueError as exc:
+        raise CliValidationError(f"environment variable {name} must be a number") from exc
+    if value < 0:
+        raise CliValidationError(f"environment variable {name} must be >= 0")
+    return value
+
+
+def segment_policy() -> RotationPolicy:
+    max_bytes = _env_number("PSA_LOG_SEGMENT_MAX_BYTES", DEFAULT_SEGMENT_MAX_BYTES)
+    max_age = _env_number("PSA_LOG_SEGMENT_MAX_AGE_SECONDS", DEFAULT_SEGMENT_MAX_AGE_SECONDS)
+    return RotationPolicy(max_bytes=int(max_bytes), max_age_seconds=float(max_age))
+
+
+class FileBackend:
+    name = "files"
+
+    def __init__(self, root: Path | None = None, *, layout: str | None = None) -> None:
+        self.root = root if root is not None else store_home() / "strategies"
+        self.layout = layout if layout is not None else configured_layout()
+        self._dirs: dict[str, Path] = {}
+
+    def layout_dir(self, strategy_id: str, layout: str) -> Path:
+        if layout == "sharded":
+            import hashlib
+
+            digest = hashlib.sha1(strategy_id.encode("utf-8")).hexdigest()
+            return self.root / SHARD_DIR_NAME / digest[:2] / digest[2:4] / strategy_id
+        return self.root / strategy_id
+
+    def strategy_dir(self, strategy_id: str) -> Path:
+        # Existing strategies are found under either layout, so a store stays usable while it
+        # is being converted; new strategies are created in the configured layout.
+        found = self._dirs.get(strategy_id)
+        if found is not None:
+            return found
+        preferred = self.layout_dir(strategy_id, self.layout)
+        other = self.layout_dir(strategy_id, "flat" if self.layout == "sharded" else "sharded")
+        for path in (preferred, other):
+            if (path / STRATEGY_FILE_NAME).is_file():
+                self._dirs[strategy_id] = path
+                return path
+        return preferred
+
+    def strategy_path(self, strategy_id: str) -> Path:
+        return self.strategy_dir(strategy_id) / STRATEGY_FILE_NAME
+
+    def lock_path(self, strategy_id: str) -> Path:
+        return self.strategy_dir(strategy_id) / LOCK_FILE_NAME
+
+    @property
+    def catalog(self) -> StrategyCatalog:
+        return StrategyCatalog(self.root)
+
+    def _catalog_put(self, record: Mapping[str, Any]) -> None:
+        if not self.catalog.put(record):
+            # First write since the catalog was introduced: index everything once.
+            self.catalog.rebuild(self._scan_strategy_records())
+
+    def strategy_exists(self, strategy_id: str) -> bool:
+        return self.strategy_path(strategy_id).is_file()
+
+    def read_strategy(self, strategy_id: str) -> Mapping[str, Any] | None:
+        path = self.strategy_path(strategy_id)
+        if not path.is_file():
+            return None
+        return read_json_file(path)
+
+    def _require_strategy(self, strategy_id: str) -> Mapping[str, Any]:
+        record = self.read_strategy(strategy_id)
+        if record is None:
+            raise strategy_not_found(strategy_id)
+        return record
+
+    def update_strategy(self, strategy_id: str, update: StrategyUpdate) -> Mapping[str, Any]:
+        with exclusive_lock(self.lock_path(strategy_id)):
+            current = self.read_strategy(strategy_id)
+            record = update(current)
+            if record is None:
+                assert current is not None
+                return current
+            self._write_record(record)
+            return record
+
+    def put_strategy(self, record: Mapping[str, Any]) -> None:
+        strategy_id = str(record["strategy_id"])
+        with exclusive_lock(self.lock_path(strategy_id)):
+            self._write_record(record)
+
+    @property
+    def blobs_root(self) -> Path:
+        return self.root.parent / revisions.BLOBS_DIR_NAME
+
+    def _write_record(self, record: Mapping[str, Any]) -> None:
+        # Called under the strategy write lock: blob, then strategy.json, then history index.
+        strategy_id = str(record["strategy_id"])
+        data = revisions.canonical_strategy(record["strategy"])
+        digest = revisions.data_hash(data)
+        revisions.write_blob(self.blobs_root, digest, data)
+        discard_compiled(self.compiled_strategy_path(strategy_id))
+        write_atomic_json(self.strategy_path(strategy_id), record)
+        self._catalog_put(record)
+        revisions.append_revision(
+            self.strategy_dir(strategy_id), revisions.revision_entry(record, digest)
+        )
+
+    def put_revision(self, record: Mapping[str, Any]) -> None:
+        strategy_id = str(record["strategy_id"])
+        with exclusive_lock(self.lock_path(strategy_id)):
+            data = revisions.canonical_strategy(record["strategy"])
+            digest = revisions.data_hash(data)
+            revisions.write_blob(self.blobs_root, digest, data)
+            revisions.append_revision(
+                self.strategy_dir(strategy_id), revisions.revision_entry(record, digest)
+            )
+
+    def iter_revisions(self, strategy_id: str) -> Iterator[dict[str, Any]]:
+        with shared_lock(self.lock_path(strategy_id)):
+            current = self.read_strategy(strategy_id)
+            if current is None:
+                raise strategy_not_found(strategy_id)
+            entries = revisions.read_revisions(self.strategy_dir(strategy_id))
+        return iter(revisions.merge_current(entries, current))
+
+    def read_revision(self, strategy_id: str, revision: int) -> Mapping[str, Any] | None:
+        with shared_lock(self.lock_path(strategy_id)):
+            current = self.read_strategy(strategy_id)
+            if current is None:
+                raise strategy_not_found(strategy_id)
+            if current["revision"] == revision:
+                return current
+            entries = revisions.read_revisions(self.strategy_dir(strategy_id))
+        for entry in revisions.merge_current(entries, current):
+            if entry["revision"] == revision:
+                strategy = revisions.read_blob(self.blobs_root, entry["content_hash"])
+                if strategy is None:
+                    return None
+                return revisions.revision_record(strategy_id, entry, strategy)
+        return None
+
+    def strategy_fingerprint(self, strategy_id: str) -> tuple[Any, ...] | None:
+        # Atomic replace gives every write a new inode, so stat alone identifies a revision.
+        path = self.strategy_path(strategy_id)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        except OSError as exc:
+            raise storage_error(f"failed to stat {path}", path, exc) from exc
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def compiled_strategy_path(self, strategy_id: str) -> Path:
+        return self.strategy_dir(strategy_id) / COMPILED_FILE_NAME
+
+    def _root_exists(self) -> bool:
+        root = self.root
+        if not root.exists():
+            return False
+        if not root.is_dir():
+            raise CliDomainError(
+                "storage_error",
+                "strategy storage root is not a directory",
+                details={"path": str(root)},
+            )
+        return True
+
+    def _strategy_dirs(self) -> list[Path]:
+        root = self.root
+        shard_root = root / SHARD_DIR_NAME
+        try:
+            dirs = [path for path in root.iterdir() if path.is_dir() and path != shard_root]
+            if shard_root.is_dir():
+                dirs.extend(path for path in shard_root.glob("*/*/*") if path.is_dir())
+        except OSError as exc:
+            raise storage_error(f"failed to list strategy storage root {root}", root, exc) from exc
+        return sorted(dirs, key=lambda path: path.name)
+
+    def _scan_strategy_records(self) -> Iterator[Mapping[str, Any]]:
+        for strategy_dir in self._strategy_dirs():
+            path = strategy_dir / STRATEGY_FILE_NAME
+            if path.is_file():
+                yield read_json_file(path)
+
+    def relayout_strategies(self, layout: str) -> int:
+        # Moves every strategy directory into `layout`. Each move is a rename under the
+        # strategy lock; readers find strategies under either layout throughout.
+        if not self._root_exists():
+            self.layout = layout
+            return 0
+        moved = 0
+        for strategy_dir in self._strategy_dirs():
+            strategy_id = strategy_dir.name
+            target = self.layout_dir(strategy_id, layout)
+            if strategy_dir == target or not (strategy_dir / STRATEGY_FILE_NAME).is_file():
+                continue
+            with exclusive_lock(strategy_dir / LOCK_FILE_NAME):
+                if target.exists():
+                    raise CliDomainError(
+                        "storage_error",
+                        f"strategy '{strategy_id}' exists in both store layouts",
+                        details={"path": str(strategy_dir), "target": str(target)},
+                    )
+                try:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    strategy_dir.rename(target)
+                except OSError as exc:
+                    raise storage_error(f"failed to move {strategy_dir}", target, exc) from exc
+            self._dirs.pop(strategy_id, None)
+            moved += 1
+        if layout == "flat":
+            self._prune_shard_dirs()
+        self.layout = layout
+        return moved
+
+    def _prune_shard_dirs(self) -> None:
+        shard_root = self.root / SHARD_DIR_NAME
+        if not shard_root.is_dir():
+            return
+        # Deepest first; non-empty directories (stray files) are left in place.
+        for path in [*shard_root.glob("*/*"), *shard_root.glob("*"), shard_root]:
+            try:
+                path.rmdir()
+            except OSError:
+                continue
+
+    def iter_strategies(
+        self, *, prefix: str | None = None, after: str | None = None
+    ) -> Iterator[Mapping[str, Any]]:
+        if not self._root_exists():
+            return
+        entries = self.catalog.load()
+        if entries is None:
+            # Missing or older-version catalog: rebuild it once from strategy.json files.
+            self.catalog.rebuild(self._scan_strategy_records())
+            entries = self.catalog.load() or []
+        yield from catalog.page(entries, prefix=prefix, after=after)
+
+    def reindex_strategies(self) -> int:
+        if not self._root_exists():
+            return 0
+        return self.catalog.rebuild(self._scan_strategy_records())
+
+    def append_logs(self, strategy_id: str, entries: Sequence[Mapping[str, Any]]) -> None:
+        policy = segment_policy()
+        serialized = "".join(
+            json.dumps(entry, separators=(",", ":"), sort_keys=False) + "\n" for entry in entries
+        ).encode("utf-8")
+
+        with exclusive_lock(self.lock_path(strategy_id)):
+            self._require_strategy(strategy_id)
+            strategy_dir = self.strategy_dir(strategy_id)
+            indexed_fields = log_index.declared_fields(strategy_dir)
+            log_bytes = segments.total_log_bytes(strategy_dir)
+            log_path = segments.active_log_path(strategy_dir)
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                with log_path.open("ab") as handle:
+                    start = os.fstat(handle.fileno()).st_size
+                    try:
+                        handle.write(serialized)
+                        handle.flush()
+                        os.fsync(handle.fileno())
+                    except OSError:
+                        # All-or-nothing: drop any partially written tail of the batch.
+                        os.ftruncate(handle.fileno(), start)
+                        os.fsync(handle.fileno())
+                        raise
+            except OSError as exc:
+                raise CliDomainError(
+                    "storage_error",
+                    f"failed to append log record for strategy '{strategy_id}'",
+                    details={"path": str(log_path), "reason": exc.strerror or str(exc)},
+                ) from exc
+
+            for field in indexed_fields:
+                log_index.append_batch(
+                    strategy_dir,
+                    field,
+                    entries,
+                    log_bytes_before=log_bytes,
+                    log_bytes_after=log_bytes + len(serialized),
+                )
+            log_summary.update_summary(
+                strategy_dir,
+                entries,
+                log_bytes_before=log_bytes,
+                log_bytes_after=log_bytes + len(serialized),
+            )
+            if segments.needs_rotation(strategy_dir, policy=policy, now=datetime.now(tz=UTC)):
+                segments.rotate(strategy_dir)
+
+    def iter_logs(
+        self,
+        strategy_id: str,
+        *,
+        from_dt: datetime | None = None,
+        to_dt: datetime | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        self._require_strategy(strategy_id)
+        return self._iter_logs_locked(strategy_id, from_dt=from_dt, to_dt=to_dt)
+
+    def _iter_logs_locked(
+        self,
+        strategy_id: str,
+        *,
+        from_dt: datetime | None,
+        to_dt: datetime | None,
+    ) -> Generator[dict[str, Any], None, None]:
+        # The shared lock keeps appends and rotation out while rows are being read; it is
+        # released when the caller exhausts or closes the iterator.
+        with shared_lock(self.lock_path(strategy_id)):
+            yield from segments.iter_log_rows(
+                self.strategy_dir(strategy_id), from_dt=from_dt, to_dt=to_dt
+            )
+
+    def query_logs(
+        self,
+        strategy_id: str,
+        predicates: Sequence[LogPredicate],
+        *,
+        from_dt: datetime | None = None,
+        to_dt: datetime | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        self._require_strategy(strategy_id)
+        return self._query_logs_locked(strategy_id, predicates, from_dt=from_dt, to_dt=to_dt)
+
+    def _query_logs_locked(
+        self,
+        strategy_id: str,
+        predicates: Sequence[LogPredicate],
+        *,
+        from_dt: datetime | None,
+        to_dt: datetime | None,
+    ) -> Generator[dict[str, Any], None, None]:
+        with shared_lock(self.lock_path(strategy_id)):
+            strategy_dir = self.strategy_dir(strategy_id)
+            ordinals = log_index.candidate_ordinals(strategy_dir, predicates)
+            if ordinals is None:
+                rows = segments.iter_log_rows(strategy_dir, from_dt=from_dt, to_dt=to_dt)
+            else:
+                rows = segments.iter_log_rows_at(strategy_dir, ordinals)
+            for row in rows:
+                if matches(row.get("payload"), predicates):
+                    yield row
+
+    def log_stats(self, strategy_id: str) -> dict[str, Any]:
+        self._require_strategy(strategy_id)
+        strategy_dir = self.strategy_dir(strategy_id)
+        with shared_lock(self.lock_path(strategy_id)):
+            summary = log_summary.read_fresh_summary(strategy_dir)
+        if summary is None:
+            # Logs written before the summary existed, or an interrupted update: rebuild once.
+            with exclusive_lock(self.lock_path(strategy_id)):
+                summary = log_summary.rebuild_summary(strategy_dir)
+        return summary
+
+    def list_log_indexes(self, strategy_id: str) -> list[str]:
+        self._require_strategy(strategy_id)
+        return log_index.declared_fields(self.strategy_dir(strategy_id))
+
+    def create_log_index(self, strategy_id: str, field: str) -> int:
+        with exclusive_lock(self.lock_path(strategy_id)):
+            self._require_strategy(strategy_id)
+            return log_index.build_index(self.strategy_dir(strategy_id), field)
+
+    def drop_log_index(self, strategy_id: str, field: str) -> bool:
+        with exclusive_lock(self.lock_path(strategy_id)):
+            self._require_strategy(strategy_id)
+            path = log_index.index_path(self.strategy_dir(strategy_id), field)
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                return False
+            except OSError as exc:
+                raise storage_error(f"failed to remove {path}", path, exc) from exc
+            return True
+
+    def position_snapshot(self, strategy_id: str) -> dict[str, Any]:
+        self._require_strategy(strategy_id)
+        strategy_dir = self.strategy_dir(strategy_id)
+        with shared_lock(self.lock_path(strategy_id)):
+            log_bytes = segments.total_log_bytes(strategy_dir)
+            checkpoint = positions.read_checkpoint(strategy_dir)
+            if checkpoint is None or checkpoint["log_bytes"] > log_bytes:
+                # The log only grows, so a checkpoint beyond its size is from another log.
+                checkpoint = {**positions.empty_checkpoint(), "log_bytes": 0}
+            start = checkpoint["records"]
+            if checkpoint["log_bytes"] != log_bytes:
+                # Row ordinals survive rotation, so replay resumes at the checkpointed count.
+                for entry in segments.iter_log_rows_at(strategy_dir, range(start, sys.maxsize)):
+                    positions.apply_entry(checkpoint["position"], entry)
+                    checkpoint["records"] += 1
+                checkpoint["log_bytes"] = log_bytes
+                positions.write_checkpoint(strategy_dir, checkpoint)
+        return {
+            "records": checkpoint["records"],
+            "replayed": checkpoint["records"] - start,
+            "position": checkpoint["position"],
+        }
+
+    def find_log(self, strategy_id: str, log_id: str) -> dict[str, Any] | None:
+        self._require_strategy(strategy_id)
+        with closing(self._iter_logs_locked(strategy_id, from_dt=None, to_dt=None)) as rows:
+            for row in rows:
+                if row.get("log_id") == log_id:
+                    return row
+        return None
+
+    def tail_logs(self, strategy_id: str, *, limit: int) -> Iterator[dict[str, Any]]:
+        self._require_strategy(strategy_id)
+        return self._tail_logs_locked(strategy_id, limit)
+
+    def _tail_logs_locked(
+        self, strategy_id: str, limit: int
+    ) -> Generator[dict[str, Any], None, None]:
+        strategy_dir = self.strategy_dir(strategy_id)
+        with shared_lock(self.lock_path(strategy_id)):
+            summary = log_summary.read_fresh_summary(strategy_dir)
+            if summary is not None:
+                # The summary row count locates the tail, so rows stream forward from there.
+                records = summary["records"]
+                yield from segments.iter_log_rows_at(
+                    strategy_dir, range(max(0, records - limit), records)
+                )
+                return
+            # Stale or missing summary (repaired by the next append): collect from the end.
+            collected: list[dict[str, Any]] = []
+            for file_rows in segments.iter_log_rows_reversed_by_file(strategy_dir):
+                collected = file_rows[-(limit - len(collected)) :] + collected
+                if len(collected) >= limit:
+                    break
+            yield from collected
+
+    def rotate_logs(self, strategy_id: str) -> dict[str, Any]:
+        with exclusive_lock(self.lock_path(strategy_id)):
+            self._require_strategy(strategy_id)
+            strategy_dir = self.strategy_dir(strategy_id)
+            sealed = segments.rotate(strategy_dir)
+            manifest = segments.read_manifest(strategy_dir)
+        return {
+            "strategy_id": strategy_id,
+            "sealed": [segment_to_dict(segment) for segment in sealed],
+            "segments": [segment_to_dict(segment) for segment in manifest],
+        }
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from psa_cli.errors import CliDomainError
+
+
+def storage_error(message: str, path: Path, exc: OSError) -> CliDomainError:
+    return CliDomainError(
+        "storage_error",
+        message,
+        details={"path": str(path), "reason": exc.strerror or str(exc)},
+    )
+
+
+def read_json_file(path: Path) -> Mapping[str, Any]:
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError as exc:
+        raise storage_error(f"failed to read {path}", path, exc) from exc
+
+    try:
+        payload = json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise CliDomainError(
+            "storage_corrupted",
+            f"file is not valid JSON: {path}",
+            details={"path": str(path), "reason": exc.msg},
+        ) from exc
+
+    if not isinstance(payload, Mapping):
+        raise CliDomainError(
+            "storage_corrupted",
+            f"file must contain a JSON object: {path}",
+            details={"path": str(path)},
+        )
+    return payload
+
+
+def write_atomic_json(path: Path, payload: Mapping[str, Any], *, durable: bool = True) -> None:
+    text = json.dumps(payload, separators=(",", ":"), sort_keys=False) + "\n"
+    write_atomic_text(path, text, durable=durable)
+
+
+def write_atomic_text(path: Path, text: str, *, durable: bool = True) -> None:
+    # `durable=False` skips the fsync for derived files that readers validate and can rebuild.
+    tmp_path = path.parent / f".{path.name}.{os.urandom(16).hex()}.tmp"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            handle.write(text)
+            handle.flush()
+            if durable:
+                os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        raise storage_error(f"failed to write {path}", path, exc) from exc
+    finally:
+        if tmp_path.exists():
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
@@ -1,29 +1,48 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+import os
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import fields
+from datetime import UTC, datetime
+from pathlib import Path
 from typing import Any
 
-from psa_core.contracts import (
-    evaluate_point_payload,
-    evaluate_portfolio_payload,
-    evaluate_rows_from_ranges_payload,
-    evaluate_rows_payload,
-)
-
-from psa_cli.errors import CliValidationError
-from psa_cli.skills import install_skill
+from psa_cli.errors import CliIoError, CliValidationError
+from psa_cli.io_stream import StreamedResponse
 from psa_cli.store import (
     append_log,
-    list_logs,
+    append_logs,
+    create_log_index,
+    diff_strategy,
+    drop_log_index,
+    iter_logs,
+    iter_queried_logs,
+    iter_tail_logs,
+    list_log_indexes,
     list_strategies,
-    load_strategy_payload,
+    load_strategy_spec,
+    log_stats,
+    migrate_store,
+    reindex_strategies,
+    relayout_store,
+    rotate_logs,
     show_log,
+    show_position,
     show_strategy,
     strategy_exists,
-    tail_logs,
+    strategy_history,
     upsert_strategy,
 )
 
+# psa_core, evaluate-all's process pool and skill installation are imported by the helpers
+# that use them, so storage-only commands start without loading them.
+
+
+def _evaluation_row_columns() -> tuple[str, ...]:
+    from psa_core.types import EvaluationRow
+
+    return tuple(field.name for field in fields(EvaluationRow))
+
 
 def _ensure_mapping(value: Any, *, name: str) -> Mapping[str, Any]:
     if not isinstance(value, Mapping):
@@ -32,69 +51,304 @@ def _ensure_mapping(value: Any, *, name: str) -> Mapping[str, Any]:
 
 
 def _evaluate_point_with_saved_strategy(strategy_id: str, payload: Any) -> dict[str, Any]:
-    request = dict(_ensure_mapping(payload, name="request"))
-    request["strategy"] = dict(load_strategy_payload(strategy_id))
-    return evaluate_point_payload(request)
+    from psa_core.contracts import evaluate_point_payload
+
+    request = _ensure_mapping(payload, name="request")
+    return evaluate_point_payload(request, strategy=load_strategy_spec(strategy_id))
 
 
 def _evaluate_rows_with_saved_strategy(strategy_id: str, payload: Any) -> dict[str, Any]:
-    request = dict(_ensure_mapping(payload, name="request"))
-    request["strategy"] = dict(load_strategy_payload(strategy_id))
-    return evaluate_rows_payload(request)
+    from psa_core.contracts import evaluate_rows_payload
+
+    request = _ensure_mapping(payload, name="request")
+    return evaluate_rows_payload(request, strategy=load_strategy_spec(strategy_id))
+
+
+def _stream_rows_with_saved_strategy(
+    strategy_id: str, rows: Iterable[Mapping[str, Any]]
+) -> StreamedResponse:
+    from psa_core.contracts import parse_observation_row, row_to_dict
+    from psa_core.engine import iter_evaluate_rows
+
+    strategy = load_strategy_spec(strategy_id)
+    observations = (parse_observation_row(row) for row in rows)
+    return StreamedResponse(
+        items_key="rows",
+        items=(row_to_dict(row) for row in iter_evaluate_rows(strategy, observations)),
+        columns=_evaluation_row_columns(),
+    )
+
+
+def _stream_price_history_with_saved_strategy(
+    strategy_id: str, input_path: str
+) -> StreamedResponse:
+    from psa_core.contracts import row_to_dict
+    from psa_core.engine import iter_evaluate_rows
+    from psa_core.price_history import PriceHistory
+
+    strategy = load_strategy_spec(strategy_id)
+    if input_path == "-":
+        raise CliValidationError("--input-format binary requires an input file path")
+    try:
+        history = PriceHistory.open(input_path)
+    except OSError as exc:
+        reason = exc.strerror or str(exc)
+        raise CliIoError(f"failed to read input from {input_path}: {reason}") from exc
+    except ValueError as exc:
+        raise CliIoError(f"invalid price history in {input_path}: {exc}") from exc
+
+    def evaluated_rows() -> Iterator[dict[str, Any]]:
+        with history:
+            for row in iter_evaluate_rows(strategy, history.iter_rows()):
+                yield row_to_dict(row)
+
+    return StreamedResponse(
+        items_key="rows", items=evaluated_rows(), columns=_evaluation_row_columns()
+    )
+
+
+def _convert_prices(payload: Any, *, input_format: str, output_path: str) -> dict[str, Any]:
+    from psa_core.price_history import timestamp_to_epoch_ms, write_price_history
+
+    if output_path == "-":
+        raise CliValidationError("convert-prices requires an output file path")
+    rows = payload if input_format != "json" else _ensure_mapping(payload, name="request")["rows"]
+    target = Path(output_path)
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        count = write_price_history(
+            tmp_path,
+            ((timestamp_to_epoch_ms(row["timestamp"]), float(row["price"])) for row in rows),
+        )
+        os.replace(tmp_path, target)
+    except OSError as exc:
+        tmp_path.unlink(missing_ok=True)
+        raise CliIoError(
+            f"failed to write output to {output_path}: {exc.strerror or str(exc)}"
+        ) from exc
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return {"output": output_path, "rows": count, "bytes": target.stat().st_size}
+
+
+def _stream_ranges_with_saved_strategy(
+    strategy_id: str, payload: Any, *, use_cache: bool
+) -> StreamedResponse:
+    from psa_core.contracts import read_evaluate_rows_ranges_request, row_to_dict
+    from psa_core.engine import iter_evaluate_rows_from_ranges
+
+    from psa_cli.config import configured_result_cache_max_bytes
+
+    # The grid is generated and written one time step at a time, so grids far beyond the
+    # API row limit run in memory independent of price_steps * time_steps.
+    request = _ensure_mapping(payload, name="request")
+    strategy, params = read_evaluate_rows_ranges_request(
+        request, strategy=load_strategy_spec(strategy_id)
+    )
+    columns = _evaluation_row_columns()
+
+    def evaluate() -> Iterator[dict[str, Any]]:
+        evaluated = iter_evaluate_rows_from_ranges(strategy, **params)
+        return (row_to_dict(row) for row in evaluated)
+
+    # Repeated grids are replayed from the result cache; 0 bytes (or --no-cache) bypasses it.
+    max_bytes = configured_result_cache_max_bytes() if use_cache else 0
+    if max_bytes == 0:
+        return StreamedResponse(items_key="rows", items=evaluate(), columns=columns)
+
+    from psa_cli.result_cache import cached_rows
 
+    items = cached_rows(
+        strategy_id, strategy, params, columns, max_bytes=max_bytes, evaluate=evaluate
+    )
+    return StreamedResponse(items_key="rows", items=items, columns=columns)
 
-def _evaluate_ranges_with_saved_strategy(strategy_id: str, payload: Any) -> dict[str, Any]:
-    request = dict(_ensure_mapping(payload, name="request"))
-    request["strategy"] = dict(load_strategy_payload(strategy_id))
-    return evaluate_rows_from_ranges_payload(request)
+
+def _evaluate_all_strategies(
+    payload: Any, *, jobs: int | None, prefix: str | None
+) -> StreamedResponse:
+    from psa_cli.evaluate_all import iter_evaluate_all
+
+    request = _ensure_mapping(payload, name="request")
+    return StreamedResponse(
+        items_key="results",
+        items=iter_evaluate_all(request, jobs=jobs, prefix=prefix),
+        columns=("strategy_id",),
+    )
+
+
+def _stream_logs(strategy_id: str, logs: Iterable[Mapping[str, Any]]) -> StreamedResponse:
+    # Records are written as they are read from storage; JSON output keeps the
+    # {"strategy_id", "logs"} envelope of the materialized response.
+    return StreamedResponse(
+        items_key="logs", items=logs, columns=(), envelope={"strategy_id": strategy_id}
+    )
+
+
+def _watch(args: Any) -> StreamedResponse:
+    from psa_cli.watch import Holdings, extra_columns, iter_watch
+
+    if (args.usd_amount is None) != (args.asset_amount is None):
+        raise CliValidationError("--usd-amount and --asset-amount must be given together")
+    holdings = (
+        Holdings(usd_amount=args.usd_amount, asset_amount=args.asset_amount)
+        if args.usd_amount is not None
+        else None
+    )
+    records = iter_watch(
+        args.strategy_id,
+        args.feed_path,
+        holdings=holdings,
+        share_threshold=args.share_threshold,
+        delta_threshold=args.delta_threshold,
+        poll_seconds=args.poll_seconds,
+        idle_timeout=args.idle_timeout,
+    )
+    return StreamedResponse(
+        items_key="records",
+        items=records,
+        columns=(*_evaluation_row_columns(), *extra_columns(holdings)),
+        flush=True,
+    )
+
+
+def _show_position(
+    strategy_id: str, *, price: float | None, timestamp: str | None
+) -> dict[str, Any]:
+    from psa_core.contracts import evaluate_portfolio_payload
+
+    if price is None and timestamp is not None:
+        raise CliValidationError("--timestamp requires --price")
+    result = show_position(strategy_id)
+    if price is None:
+        return result
+    # The replayed holdings become an evaluate-portfolio request at the given price.
+    position = result["position"]
+    request: dict[str, Any] = {
+        "timestamp": timestamp or datetime.now(tz=UTC).isoformat().replace("+00:00", "Z"),
+        "price": price,
+        "usd_amount": position["usd_amount"],
+        "asset_amount": position["asset_amount"],
+    }
+    if position["avg_entry_price"] is not None:
+        request["avg_entry_price"] = position["avg_entry_price"]
+    evaluated = evaluate_portfolio_payload(request, strategy=load_strategy_spec(strategy_id))
+    return {**result, **evaluated}
 
 
 def _evaluate_portfolio_with_saved_strategy(strategy_id: str, payload: Any) -> dict[str, Any]:
-    request = dict(_ensure_mapping(payload, name="request"))
-    request["strategy"] = dict(load_strategy_payload(strategy_id))
-    return evaluate_portfolio_payload(request)
+    from psa_core.contracts import evaluate_portfolio_payload
+
+    request = _ensure_mapping(payload, name="request")
+    return evaluate_portfolio_payload(request, strategy=load_strategy_spec(strategy_id))
 
 
-def execute_command(command: str, payload: Any, *, args: Any) -> dict[str, Any]:
+def execute_command(command: str, payload: Any, *, args: Any) -> dict[str, Any] | StreamedResponse:
     if command == "evaluate-point":
         return _evaluate_point_with_saved_strategy(args.strategy_id, payload)
     if command == "evaluate-portfolio":
         return _evaluate_portfolio_with_saved_strategy(args.strategy_id, payload)
     if command == "evaluate-rows":
+        if args.input_format == "binary":
+            return _stream_price_history_with_saved_strategy(args.strategy_id, args.input_path)
+        if args.input_format != "json":
+            return _stream_rows_with_saved_strategy(args.strategy_id, payload)
+        if args.output_format != "json":
+            request = _ensure_mapping(payload, name="request")
+            return _stream_rows_with_saved_strategy(args.strategy_id, request["rows"])
         return _evaluate_rows_with_saved_strategy(args.strategy_id, payload)
     if command == "evaluate-ranges":
-        return _evaluate_ranges_with_saved_strategy(args.strategy_id, payload)
+        return _stream_ranges_with_saved_strategy(
+            args.strategy_id, payload, use_cache=args.use_cache
+        )
+    if command == "evaluate-all":
+        return _evaluate_all_strategies(payload, jobs=args.jobs, prefix=args.prefix)
+    if command == "watch":
+        return _watch(args)
+    if command == "convert-prices":
+        return _convert_prices(
+            payload, input_format=args.input_format, output_path=args.history_path
+        )
     if command == "strategy-upsert":
         return upsert_strategy(args.strategy_id, payload)
     if command == "strategy-list":
-        return {"strategies": list_strategies()}
+        return list_strategies(
+            prefix=args.prefix,
+            cursor=args.cursor,
+            limit=args.limit,
+            with_log_stats=args.with_log_stats,
+        )
+    if command == "strategy-reindex":
+        return reindex_strategies()
     if command == "strategy-show":
-        return show_strategy(args.strategy_id)
+        return show_strategy(args.strategy_id, revision=args.revision)
+    if command == "strategy-history":
+        return strategy_history(args.strategy_id)
+    if command == "strategy-diff":
+        return diff_strategy(
+            args.strategy_id, from_revision=args.from_revision, to_revision=args.to_revision
+        )
     if command == "strategy-exists":
         return {"strategy_id": args.strategy_id, "exists": strategy_exists(args.strategy_id)}
     if command == "log-append":
         return append_log(args.strategy_id, payload)
-    if command == "log-list":
+    if command == "log-append-batch":
         return {
             "strategy_id": args.strategy_id,
-            "logs": list_logs(
+            "logs": append_logs(args.strategy_id, payload),
+        }
+    if command == "log-list":
+        return _stream_logs(
+            args.strategy_id,
+            iter_logs(args.strategy_id, limit=args.limit, from_ts=args.from_ts, to_ts=args.to_ts),
+        )
+    if command == "position-show":
+        return _show_position(args.strategy_id, price=args.price, timestamp=args.timestamp)
+    if command == "log-stats":
+        return log_stats(args.strategy_id)
+    if command == "log-query":
+        return _stream_logs(
+            args.strategy_id,
+            iter_queried_logs(
                 args.strategy_id,
+                where=args.where,
+                has=args.has,
                 limit=args.limit,
                 from_ts=args.from_ts,
                 to_ts=args.to_ts,
             ),
-        }
+        )
+    if command == "log-index-add":
+        return create_log_index(args.strategy_id, args.field)
+    if command == "log-index-drop":
+        return drop_log_index(args.strategy_id, args.field)
+    if command == "log-index-list":
+        return list_log_indexes(args.strategy_id)
     if command == "log-show":
         return {
             "strategy_id": args.strategy_id,
             "log": show_log(args.strategy_id, log_id=args.log_id),
         }
     if command == "log-tail":
-        return {
-            "strategy_id": args.strategy_id,
-            "logs": tail_logs(args.strategy_id, limit=args.limit),
-        }
+        return _stream_logs(args.strategy_id, iter_tail_logs(args.strategy_id, limit=args.limit))
+    if command == "log-rotate":
+        return rotate_logs(args.strategy_id)
+    if command == "store-migrate":
+        return migrate_store(args.target_backend)
+    if command == "store-relayout":
+        return relayout_store(args.layout)
+    if command == "store-export":
+        from psa_cli.bundle import export_store
+
+        return export_store(args.bundle_path)
+    if command == "store-import":
+        from psa_cli.bundle import import_store
+
+        return import_store(args.bundle_path, jobs=args.jobs)
     if command == "install-skill":
+        from psa_cli.skills import install_skill
+
         return install_skill(
             args.runtime,
             skills_dir_override=getattr(args, "skills_dir", None),
@@ -8,7 +8,7 @@ from typing import Any
 from psa_cli.errors import CliIoError
 
 
-def read_json_input(input_path: str) -> Any:
+def _read_text_input(input_path: str) -> tuple[str, str]:
     source_label = "stdin" if input_path == "-" else input_path
     try:
         if input_path == "-":
@@ -20,13 +20,30 @@ def read_json_input(input_path: str) -> Any:
     except OSError as exc:
         reason = exc.strerror or str(exc)
         raise CliIoError(f"failed to read input from {source_label}: {reason}") from exc
+    return raw, source_label
+
 
+def read_json_input(input_path: str) -> Any:
+    raw, source_label = _read_text_input(input_path)
     try:
         return json.loads(raw)
     except json.JSONDecodeError as exc:
         raise CliIoError(f"invalid JSON in {source_label}: {exc.msg}") from exc
 
 
+def read_ndjson_input(input_path: str) -> list[Any]:
+    raw, source_label = _read_text_input(input_path)
+    records: list[Any] = []
+    for idx, line in enumerate(raw.splitlines()):
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError as exc:
+            raise CliIoError(f"invalid JSON in {source_label} line {idx + 1}: {exc.msg}") from exc
+    return records
+
+
 def write_json_output(payload: Any, output_path: str, *, pretty: bool) -> None:
     if pretty:
         text = json.dumps(payload, indent=2, sort_keys=False) + "\n"
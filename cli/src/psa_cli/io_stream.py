@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import sys
+import time
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, TextIO
+
+from psa_cli.errors import CliIoError, CliValidationError
+
+STREAM_FORMATS = ("json", "ndjson", "csv")
+
+
+@dataclass(frozen=True, slots=True)
+class StreamedResponse:
+    # A response whose `items_key` list is produced lazily and written item by item.
+    # `envelope` holds the scalar fields written before the list in JSON output. `flush` pushes
+    # every NDJSON/CSV record out as soon as it is written, for long-running streams.
+    items_key: str
+    items: Iterable[Mapping[str, Any]]
+    columns: tuple[str, ...]
+    envelope: Mapping[str, Any] = field(default_factory=dict)
+    flush: bool = False
+
+
+@contextmanager
+def _open_input(input_path: str) -> Iterator[tuple[TextIO, str]]:
+    source_label = "stdin" if input_path == "-" else input_path
+    if input_path == "-":
+        yield sys.stdin, source_label
+        return
+    try:
+        handle = open(input_path, encoding="utf-8", newline="")
+    except OSError as exc:
+        reason = exc.strerror or str(exc)
+        raise CliIoError(f"failed to read input from {source_label}: {reason}") from exc
+    with handle:
+        yield handle, source_label
+
+
+def _iter_lines(handle: TextIO, source_label: str) -> Iterator[str]:
+    try:
+        yield from handle
+    except UnicodeDecodeError as exc:
+        raise CliIoError(f"invalid UTF-8 input in {source_label}: {exc}") from exc
+    except OSError as exc:
+        reason = exc.strerror or str(exc)
+        raise CliIoError(f"failed to read input from {source_label}: {reason}") from exc
+
+
+def iter_ndjson_records(input_path: str) -> Iterator[tuple[int, Any]]:
+    with _open_input(input_path) as (handle, source_label):
+        for idx, line in enumerate(_iter_lines(handle, source_label)):
+            if not line.strip():
+                continue
+            try:
+                yield idx + 1, json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise CliIoError(
+                    f"invalid JSON in {source_label} line {idx + 1}: {exc.msg}"
+                ) from exc
+
+
+def _replaced(path: Path, handle: BinaryIO) -> bool:
+    try:
+        current = path.stat()
+    except FileNotFoundError:
+        return False  # mid-rotation: keep reading the old file until a new one appears
+    opened = os.fstat(handle.fileno())
+    return current.st_ino != opened.st_ino or current.st_size < handle.tell()
+
+
+def _open_followed(path: Path) -> BinaryIO:
+    try:
+        return path.open("rb")
+    except OSError as exc:
+        reason = exc.strerror or str(exc)
+        raise CliIoError(f"failed to read input from {path}: {reason}") from exc
+
+
+def _follow_lines(
+    path: Path, handle: BinaryIO, *, poll_seconds: float, idle_timeout: float | None
+) -> Iterator[bytes]:
+    pending = b""
+    idle_since = time.monotonic()
+    try:
+        while True:
+            try:
+                chunk = handle.readline()
+            except OSError as exc:
+                reason = exc.strerror or str(exc)
+                raise CliIoError(f"failed to read input from {path}: {reason}") from exc
+            if chunk:
+                pending += chunk
+                idle_since = time.monotonic()
+                if pending.endswith(b"\n"):
+                    yield pending
+                    pending = b""
+                continue
+            if _replaced(path, handle):
+                handle.close()
+                handle = _open_followed(path)
+                pending = b""
+                continue
+            if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                if pending:
+                    yield pending
+                return
+            time.sleep(poll_seconds)
+    finally:
+        handle.close()
+
+
+def _decode_followed(input_path: str, lines: Iterator[bytes]) -> Iterator[tuple[int, Any]]:
+    for idx, raw in enumerate(lines):
+        try:
+            line = raw.decode("utf-8")
+        except UnicodeDecodeError as exc:
+            raise CliIoError(f"invalid UTF-8 input in {input_path}: {exc}") from exc
+        if not line.strip():
+            continue
+        try:
+            yield idx + 1, json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise CliIoError(f"invalid JSON in {input_path} line {idx + 1}: {exc.msg}") from exc
+
+
+def follow_ndjson_records(
+    input_path: str, *, poll_seconds: float, idle_timeout: float | None
+) -> Iterator[tuple[int, Any]]:
+    # Like iter_ndjson_records, but a file is followed as it grows (tail -F): at end of file the
+    # reader polls for appended lines until `idle_timeout` seconds pass without new data (None
+    # follows forever). A partial last line waits for its newline; a truncated or replaced file
+    # is read again from the start. stdin is read until EOF. The file is opened eagerly.
+    if input_path == "-":
+        return iter_ndjson_records(input_path)
+    path = Path(input_path)
+    lines = _follow_lines(
+        path, _open_followed(path), poll_seconds=poll_seconds, idle_timeout=idle_timeout
+    )
+    return _decode_followed(input_path, lines)
+
+
+def iter_csv_records(
+    input_path: str, *, columns: Mapping[str, type]
+) -> Iterator[tuple[int, dict[str, Any]]]:
+    # `columns` maps the required header names to the type each cell is converted to.
+    with _open_input(input_path) as (handle, source_label):
+        reader = csv.reader(_iter_lines(handle, source_label))
+        try:
+            header = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            raise CliIoError(f"invalid CSV in {source_label} line 1: {exc}") from exc
+        if sorted(header) != sorted(columns):
+            expected = ",".join(columns)
+            raise CliValidationError(f"CSV header in {source_label} must be: {expected}")
+
+        while True:
+            try:
+                cells = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as exc:
+                raise CliIoError(
+                    f"invalid CSV in {source_label} line {reader.line_num}: {exc}"
+                ) from exc
+            if not cells:
+                continue
+            if len(cells) != len(header):
+                raise CliValidationError(
+                    f"CSV row in {source_label} line {reader.line_num} must have "
+                    f"{len(header)} fields"
+                )
+            record: dict[str, Any] = {}
+            for name, raw in zip(header, cells, strict=True):
+                try:
+                    record[name] = columns[name](raw)
+                except ValueError as exc:
+                    raise CliValidationError(
+                        f"CSV field '{name}' in {source_label} line {reader.line_num} "
+                        f"must be {columns[name].__name__}"
+                    ) from exc
+            yield reader.line_num, record
+
+
+def _indent(text: str, prefix: str) -> str:
+    return text.replace("\n", "\n" + prefix)
+
+
+def _iter_json_chunks(response: StreamedResponse, *, pretty: bool) -> Iterator[str]:
+    # Byte-for-byte identical to write_json_output on the materialized response.
+    fields = [*response.envelope.items()]
+    if pretty:
+        yield "{\n"
+        for key, value in fields:
+            rendered = _indent(json.dumps(value, indent=2, sort_keys=False), "  ")
+            yield f"  {json.dumps(key)}: {rendered},\n"
+        yield f"  {json.dumps(response.items_key)}: ["
+        first = True
+        for item in response.items:
+            rendered = _indent(json.dumps(item, indent=2, sort_keys=False), "    ")
+            yield ("\n    " if first else ",\n    ") + rendered
+            first = False
+        yield "]\n}\n" if first else "\n  ]\n}\n"
+        return
+
+    yield "{"
+    for key, value in fields:
+        yield f"{json.dumps(key)}:{json.dumps(value, separators=(',', ':'), sort_keys=False)},"
+    yield f"{json.dumps(response.items_key)}:["
+    first = True
+    for item in response.items:
+        rendered = json.dumps(item, separators=(",", ":"), sort_keys=False)
+        yield rendered if first else "," + rendered
+        first = False
+    yield "]}\n"
+
+
+def _write_items(
+    handle: TextIO, response: StreamedResponse, *, output_format: str, pretty: bool
+) -> None:
+    if output_format == "ndjson":
+        for item in response.items:
+            handle.write(json.dumps(item, separators=(",", ":"), sort_keys=False) + "\n")
+            if response.flush:
+                handle.flush()
+    elif output_format == "csv":
+        writer = csv.writer(handle, lineterminator="\n")
+        writer.writerow(response.columns)
+        for item in response.items:
+            writer.writerow([item[column] for column in response.columns])
+            if response.flush:
+                handle.flush()
+    else:
+        for chunk in _iter_json_chunks(response, pretty=pretty):
+            handle.write(chunk)
+
+
+def write_stream_output(
+    response: StreamedResponse, output_path: str, *, output_format: str, pretty: bool
+) -> None:
+    target_label = "stdout" if output_path == "-" else output_path
+    if output_path == "-":
+        try:
+            _write_items(sys.stdout, response, output_format=output_format, pretty=pretty)
+        except OSError as exc:
+            raise CliIoError(
+                f"failed to write output to {target_label}: {exc.strerror or str(exc)}"
+            ) from exc
+        return
+
+    # File targets are written to a sibling temp file and renamed on success, so a failure
+    # part-way through the stream never leaves truncated output behind.
+    target = Path(output_path)
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8", newline="") as handle:
+            _write_items(handle, response, output_format=output_format, pretty=pretty)
+        os.replace(tmp_path, target)
+    except OSError as exc:
+        tmp_path.unlink(missing_ok=True)
+        raise CliIoError(
+            f"failed to write output to {target_label}: {exc.strerror or str(exc)}"
+        ) from exc
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
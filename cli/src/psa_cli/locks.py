@@ -2,24 +2,111 @@ from __future__ import annotations
 
 import fcntl
 import os
+import signal
+import threading
 import time
+from collections import deque
 from collections.abc import Iterator
 from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 from psa_cli.errors import CliDomainError
+from psa_cli.timings import phase
 
 LOCK_TIMEOUT_SECONDS = 5.0
-LOCK_POLL_INTERVAL_SECONDS = 0.05
+# Backoff bounds for waits that cannot use a blocking flock (see _wait_for_lock).
+LOCK_BACKOFF_MIN_SECONDS = 0.001
+LOCK_BACKOFF_MAX_SECONDS = 0.05
+LOCK_EVENT_HISTORY = 10_000
+
+
+@dataclass(frozen=True, slots=True)
+class LockEvent:
+    lock_path: str
+    mode: str
+    contended: bool
+    wait_ms: float
+    hold_ms: float
+
+
+_events: deque[LockEvent] = deque(maxlen=LOCK_EVENT_HISTORY)
+
+
+def lock_events() -> list[dict[str, Any]]:
+    return [
+        {
+            "lock_path": event.lock_path,
+            "mode": event.mode,
+            "contended": event.contended,
+            "wait_ms": round(event.wait_ms, 3),
+            "hold_ms": round(event.hold_ms, 3),
+        }
+        for event in _events
+    ]
+
+
+def reset_lock_events() -> None:
+    _events.clear()
+
+
+class _LockWaitExpired(Exception):
+    pass
+
+
+def _raise_wait_expired(signum: int, frame: Any) -> None:
+    raise _LockWaitExpired
+
+
+def _can_use_alarm() -> bool:
+    return (
+        threading.current_thread() is threading.main_thread()
+        and signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+        and signal.getsignal(signal.SIGALRM) in (signal.SIG_DFL, signal.SIG_IGN, None)
+    )
+
+
+def _wait_for_lock(fd: int, operation: int, timeout_seconds: float) -> bool:
+    # Blocks in flock() until the holder releases, so waiters wake as soon as the lock is free.
+    # The timeout is enforced by a one-shot SIGALRM; where that is unavailable (worker threads,
+    # a timer already armed by the host program) fall back to exponential backoff polling.
+    if timeout_seconds > 0 and _can_use_alarm():
+        previous = signal.signal(signal.SIGALRM, _raise_wait_expired)
+        try:
+            signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
+            try:
+                fcntl.flock(fd, operation)
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        except _LockWaitExpired:
+            return False
+        finally:
+            signal.signal(signal.SIGALRM, previous)
+        return True
+
+    deadline = time.monotonic() + timeout_seconds
+    delay = LOCK_BACKOFF_MIN_SECONDS
+    while True:
+        try:
+            fcntl.flock(fd, operation | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, LOCK_BACKOFF_MAX_SECONDS)
 
 
 @contextmanager
-def exclusive_lock(
-    lock_path: Path, *, timeout_seconds: float = LOCK_TIMEOUT_SECONDS
+def _file_lock(
+    lock_path: Path, *, operation: int, mode: str, create_parent: bool, timeout_seconds: float
 ) -> Iterator[None]:
     fd: int | None = None
     try:
-        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        if create_parent:
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
         fd = os.open(lock_path, os.O_CREAT | os.O_RDWR, 0o600)
     except OSError as exc:
         raise CliDomainError(
@@ -28,25 +115,65 @@ def exclusive_lock(
             details={"lock_path": str(lock_path), "reason": exc.strerror or str(exc)},
         ) from exc
 
-    start = time.monotonic()
-    acquired = False
+    start = time.perf_counter()
+    acquired_at: float | None = None
+    contended = False
     try:
-        while True:
+        with phase("lock_wait"):
             try:
-                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-                acquired = True
-                break
+                fcntl.flock(fd, operation | fcntl.LOCK_NB)
             except BlockingIOError:
-                if time.monotonic() - start >= timeout_seconds:
+                contended = True
+                if not _wait_for_lock(fd, operation, timeout_seconds):
                     raise CliDomainError(
                         "lock_timeout",
                         f"failed to acquire lock for {lock_path}",
-                        details={"lock_path": str(lock_path)},
+                        details={"lock_path": str(lock_path), "mode": mode},
                     ) from None
-                time.sleep(LOCK_POLL_INTERVAL_SECONDS)
+        acquired_at = time.perf_counter()
         yield
     finally:
-        if acquired and fd is not None:
+        released_at = time.perf_counter()
+        if acquired_at is not None:
             fcntl.flock(fd, fcntl.LOCK_UN)
         if fd is not None:
             os.close(fd)
+        waited_until = acquired_at if acquired_at is not None else released_at
+        _events.append(
+            LockEvent(
+                lock_path=str(lock_path),
+                mode=mode,
+                contended=contended,
+                wait_ms=(waited_until - start) * 1000.0,
+                hold_ms=(released_at - acquired_at) * 1000.0 if acquired_at is not None else 0.0,
+            )
+        )
+
+
+@contextmanager
+def exclusive_lock(
+    lock_path: Path, *, timeout_seconds: float = LOCK_TIMEOUT_SECONDS
+) -> Iterator[None]:
+    with _file_lock(
+        lock_path,
+        operation=fcntl.LOCK_EX,
+        mode="exclusive",
+        create_parent=True,
+        timeout_seconds=timeout_seconds,
+    ):
+        yield
+
+
+@contextmanager
+def shared_lock(
+    lock_path: Path, *, timeout_seconds: float = LOCK_TIMEOUT_SECONDS
+) -> Iterator[None]:
+    # Readers never create directories: callers check that the locked object exists first.
+    with _file_lock(
+        lock_path,
+        operation=fcntl.LOCK_SH,
+        mode="shared",
+        create_parent=False,
+        timeout_seconds=timeout_seconds,
+    ):
+        yield
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+from psa_cli import segments
+from psa_cli.fsutil import storage_error, write_atomic_text
+from psa_cli.log_query import (
+    FIELD_RE,
+    MISSING,
+    LogPredicate,
+    index_key,
+    index_key_value,
+    payload_value,
+    value_matches,
+)
+
+# Payload field indexes for the directory backend, one file per declared field:
+# `indexes/<field>.ndjson` holds a header line followed by one line per indexed append batch,
+# {"log_bytes", "rows", "postings": {key: [ordinal, ...]}}. Ordinals number log rows across
+# all segments in append order, which rotation preserves. `log_bytes` is the raw size of the
+# whole log after the batch: an index whose last line does not match the current log size
+# (a crash between the log append and the index append, or a torn index line) is stale.
+# Queries ignore stale indexes and scan instead; the next append under the write lock
+# rebuilds them.
+
+INDEX_DIR_NAME = "indexes"
+INDEX_FILE_SUFFIX = ".ndjson"
+INDEX_VERSION = 1
+_TAIL_CHUNK_BYTES = 64 * 1024
+
+Postings = dict[str, list[int]]
+
+
+def index_dir(strategy_dir: Path) -> Path:
+    return strategy_dir / INDEX_DIR_NAME
+
+
+def index_path(strategy_dir: Path, field: str) -> Path:
+    return index_dir(strategy_dir) / f"{field}{INDEX_FILE_SUFFIX}"
+
+
+def declared_fields(strategy_dir: Path) -> list[str]:
+    directory = index_dir(strategy_dir)
+    try:
+        names = [path.name for path in directory.iterdir()]
+    except FileNotFoundError:
+        return []
+    except OSError as exc:
+        raise storage_error(f"failed to list {directory}", directory, exc) from exc
+    fields = (name.removesuffix(INDEX_FILE_SUFFIX) for name in names)
+    return sorted(
+        field
+        for field, name in zip(fields, names, strict=True)
+        if name.endswith(INDEX_FILE_SUFFIX) and FIELD_RE.match(field)
+    )
+
+
+def _add_posting(postings: Postings, field: str, ordinal: int, row: Mapping[str, Any]) -> None:
+    value = payload_value(row.get("payload"), field)
+    if value is not MISSING:
+        postings.setdefault(index_key(value), []).append(ordinal)
+
+
+def _batch_line(*, log_bytes: int, rows: int, postings: Postings) -> str:
+    batch = {"log_bytes": log_bytes, "rows": rows, "postings": postings}
+    return json.dumps(batch, separators=(",", ":"), sort_keys=False) + "\n"
+
+
+def build_index(strategy_dir: Path, field: str) -> int:
+    # Caller must hold the strategy write lock.
+    log_bytes = segments.total_log_bytes(strategy_dir)
+    rows = 0
+    postings: Postings = {}
+    for ordinal, row in enumerate(segments.iter_log_rows(strategy_dir)):
+        _add_posting(postings, field, ordinal, row)
+        rows = ordinal + 1
+    header = {"version": INDEX_VERSION, "field": field}
+    text = json.dumps(header, separators=(",", ":"), sort_keys=False) + "\n"
+    write_atomic_text(
+        index_path(strategy_dir, field),
+        text + _batch_line(log_bytes=log_bytes, rows=rows, postings=postings),
+    )
+    return rows
+
+
+def _read_last_line(path: Path) -> bytes:
+    with path.open("rb") as handle:
+        end = handle.seek(0, os.SEEK_END)
+        data = b""
+        position = end
+        while position > 0:
+            step = min(_TAIL_CHUNK_BYTES, position)
+            position -= step
+            handle.seek(position)
+            data = handle.read(step) + data
+            if data.rstrip(b"\n").find(b"\n") >= 0:
+                break
+    return data.rstrip(b"\n").rsplit(b"\n", 1)[-1]
+
+
+def _batch_state(batch: Any) -> tuple[int, int] | None:
+    if not isinstance(batch, dict):
+        return None
+    log_bytes = batch.get("log_bytes")
+    rows = batch.get("rows")
+    if not isinstance(log_bytes, int) or not isinstance(rows, int):
+        return None
+    return log_bytes, rows
+
+
+def append_batch(
+    strategy_dir: Path,
+    field: str,
+    entries: Sequence[Mapping[str, Any]],
+    *,
+    log_bytes_before: int,
+    log_bytes_after: int,
+) -> None:
+    # Caller must hold the strategy write lock and has already appended `entries` to the log.
+    path = index_path(strategy_dir, field)
+    try:
+        state = _batch_state(json.loads(_read_last_line(path)))
+    except (OSError, ValueError):
+        state = None
+    if state is None or state[0] != log_bytes_before:
+        build_index(strategy_dir, field)
+        return
+
+    _, rows = state
+    postings: Postings = {}
+    for ordinal, entry in enumerate(entries, start=rows):
+        _add_posting(postings, field, ordinal, entry)
+    line = _batch_line(
+        log_bytes=log_bytes_after, rows=rows + len(entries), postings=postings
+    ).encode("utf-8")
+    try:
+        with path.open("ab") as handle:
+            start = os.fstat(handle.fileno()).st_size
+            try:
+                handle.write(line)
+                handle.flush()
+                os.fsync(handle.fileno())
+            except OSError:
+                os.ftruncate(handle.fileno(), start)
+                raise
+    except OSError:
+        # The log records are already committed; a missing index line only makes the index
+        # stale, which readers detect and the next append repairs.
+        return
+
+
+def _load_postings(path: Path) -> tuple[int, Postings] | None:
+    postings: Postings = {}
+    log_bytes: int | None = None
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            for idx, line in enumerate(handle):
+                if idx == 0 or not line.strip():
+                    continue
+                batch = json.loads(line)
+                state = _batch_state(batch)
+                if state is None or not isinstance(batch.get("postings"), dict):
+                    return None
+                log_bytes = state[0]
+                for key, ordinals in batch["postings"].items():
+                    postings.setdefault(key, []).extend(ordinals)
+    except (OSError, ValueError):
+        return None
+    if log_bytes is None:
+        return None
+    return log_bytes, postings
+
+
+def candidate_ordinals(strategy_dir: Path, predicates: Sequence[LogPredicate]) -> list[int] | None:
+    # Ascending ordinals of rows that can satisfy every indexed predicate, or None when no
+    # predicate has a fresh index. Callers still apply all predicates to the returned rows.
+    fields = set(declared_fields(strategy_dir))
+    if not any(predicate.field in fields for predicate in predicates):
+        return None
+    log_bytes = segments.total_log_bytes(strategy_dir)
+    loaded: dict[str, Postings | None] = {}
+    candidates: set[int] | None = None
+    for predicate in predicates:
+        if predicate.field not in fields:
+            continue
+        if predicate.field not in loaded:
+            index = _load_postings(index_path(strategy_dir, predicate.field))
+            loaded[predicate.field] = index[1] if index and index[0] == log_bytes else None
+        postings = loaded[predicate.field]
+        if postings is None:
+            continue
+        matched: set[int] = set()
+        for key, ordinals in postings.items():
+            if value_matches(predicate, index_key_value(key)):
+                matched.update(ordinals)
+        candidates = matched if candidates is None else candidates & matched
+    return None if candidates is None else sorted(candidates)
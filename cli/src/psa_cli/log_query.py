@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from psa_cli.errors import CliValidationError
+
+# Payload predicates for `psa log query`. Fields are dotted paths into the log payload
+# (`order.side`). Values only compare with values of the same JSON kind, so `1` never
+# matches `true` and `"42"` never matches `42`; ranges apply to numbers and strings.
+
+FIELD_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}(?:\.[A-Za-z0-9_-]{1,64}){0,7}$")
+RANGE_OPS = (">", ">=", "<", "<=")
+_WHERE_RE = re.compile(r"^\s*([^<>=\s]+)\s*(>=|<=|=|>|<)\s*(.*?)\s*$")
+
+
+class _Missing:
+    pass
+
+
+MISSING = _Missing()
+
+
+@dataclass(frozen=True, slots=True)
+class LogPredicate:
+    field: str
+    op: str
+    value: Any = None
+
+
+def validate_field(field: str) -> str:
+    if not FIELD_RE.match(field):
+        raise CliValidationError(
+            f"field '{field}' must be a dotted payload path of [A-Za-z0-9_-] segments"
+        )
+    return field
+
+
+def value_kind(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int | float):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    return "json"
+
+
+def parse_where(expression: str) -> LogPredicate:
+    match = _WHERE_RE.match(expression)
+    if match is None:
+        raise CliValidationError(
+            f"where expression '{expression}' must be <field><op><value> "
+            "with op one of =, >, >=, <, <="
+        )
+    field, op, raw_value = match.groups()
+    validate_field(field)
+    try:
+        value = json.loads(raw_value)
+    except json.JSONDecodeError:
+        value = raw_value
+    if op in RANGE_OPS and value_kind(value) not in ("number", "string"):
+        raise CliValidationError(
+            f"where expression '{expression}' must compare with a number or string"
+        )
+    return LogPredicate(field=field, op=op, value=value)
+
+
+def exists_predicate(field: str) -> LogPredicate:
+    return LogPredicate(field=validate_field(field), op="exists")
+
+
+def payload_value(payload: Any, field: str) -> Any:
+    value = payload
+    for part in field.split("."):
+        if not isinstance(value, Mapping) or part not in value:
+            return MISSING
+        value = value[part]
+    return value
+
+
+def value_matches(predicate: LogPredicate, value: Any) -> bool:
+    if value is MISSING:
+        return False
+    if predicate.op == "exists":
+        return True
+    if value_kind(value) != value_kind(predicate.value):
+        return False
+    if predicate.op == "=":
+        return value == predicate.value
+    if predicate.op == ">":
+        return value > predicate.value
+    if predicate.op == ">=":
+        return value >= predicate.value
+    if predicate.op == "<":
+        return value < predicate.value
+    return value <= predicate.value
+
+
+def matches(payload: Any, predicates: Sequence[LogPredicate]) -> bool:
+    return all(
+        value_matches(predicate, payload_value(payload, predicate.field))
+        for predicate in predicates
+    )
+
+
+def index_key(value: Any) -> str:
+    # Canonical posting key: equal values of the same kind share one key (1 and 1.0 alike).
+    kind = value_kind(value)
+    if kind == "number":
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        return f"n:{value!r}"
+    if kind == "string":
+        return f"s:{value}"
+    if kind == "bool":
+        return "b:true" if value else "b:false"
+    if kind == "null":
+        return "z:"
+    return "j:" + json.dumps(value, separators=(",", ":"), sort_keys=True)
+
+
+def index_key_value(key: str) -> Any:
+    tag, text = key[:2], key[2:]
+    if tag == "n:":
+        try:
+            return int(text)
+        except ValueError:
+            return float(text)
+    if tag == "s:":
+        return text
+    if tag == "b:":
+        return text == "true"
+    if tag == "z:":
+        return None
+    return json.loads(text)
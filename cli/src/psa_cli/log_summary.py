@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Mapping
+from datetime import UTC
+from pathlib import Path
+from typing import Any
+
+from psa_cli import segments
+from psa_cli.fsutil import write_atomic_json
+
+# Log activity summary: record count, first/last ts in append order, raw log size and record
+# counts per UTC day. The directory backend keeps it in `log.summary.json`, updated with every
+# append under the strategy write lock. Like payload indexes it stores the raw log size it
+# covers (`bytes`); a sidecar that does not match the current log size is stale and rebuilt
+# from the log.
+
+SUMMARY_FILE_NAME = "log.summary.json"
+SUMMARY_VERSION = 1
+
+
+def empty_summary() -> dict[str, Any]:
+    return {"records": 0, "first_ts": None, "last_ts": None, "bytes": 0, "days": {}}
+
+
+def log_day(ts: Any) -> str | None:
+    parsed = segments.parse_ts(ts) if isinstance(ts, str) else None
+    return parsed.astimezone(UTC).date().isoformat() if parsed is not None else None
+
+
+def add_entries(summary: dict[str, Any], entries: Iterable[Mapping[str, Any]]) -> None:
+    days: dict[str, int] = summary["days"]
+    for entry in entries:
+        ts = entry.get("ts")
+        summary["records"] += 1
+        if isinstance(ts, str):
+            if summary["first_ts"] is None:
+                summary["first_ts"] = ts
+            summary["last_ts"] = ts
+        day = log_day(ts)
+        if day is not None:
+            days[day] = days.get(day, 0) + 1
+
+
+def summary_path(strategy_dir: Path) -> Path:
+    return strategy_dir / SUMMARY_FILE_NAME
+
+
+def _read_summary(strategy_dir: Path) -> dict[str, Any] | None:
+    try:
+        payload = json.loads(summary_path(strategy_dir).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != SUMMARY_VERSION:
+        return None
+    summary = {key: payload.get(key) for key in empty_summary()}
+    if (
+        not isinstance(summary["records"], int)
+        or not isinstance(summary["bytes"], int)
+        or not isinstance(summary["days"], dict)
+    ):
+        return None
+    return summary
+
+
+def _write_summary(strategy_dir: Path, summary: Mapping[str, Any]) -> None:
+    # The sidecar is derived and self-validating, so it is replaced atomically without fsync.
+    days = summary["days"]
+    payload = {
+        "version": SUMMARY_VERSION,
+        **summary,
+        "days": {day: days[day] for day in sorted(days)},
+    }
+    write_atomic_json(summary_path(strategy_dir), payload, durable=False)
+
+
+def read_fresh_summary(strategy_dir: Path) -> dict[str, Any] | None:
+    summary = _read_summary(strategy_dir)
+    if summary is None or summary["bytes"] != segments.total_log_bytes(strategy_dir):
+        return None
+    return summary
+
+
+def rebuild_summary(strategy_dir: Path) -> dict[str, Any]:
+    # Caller must hold the strategy write lock.
+    summary = empty_summary()
+    summary["bytes"] = segments.total_log_bytes(strategy_dir)
+    add_entries(summary, segments.iter_log_rows(strategy_dir))
+    _write_summary(strategy_dir, summary)
+    return summary
+
+
+def update_summary(
+    strategy_dir: Path,
+    entries: Iterable[Mapping[str, Any]],
+    *,
+    log_bytes_before: int,
+    log_bytes_after: int,
+) -> None:
+    # Caller must hold the strategy write lock and has already appended `entries` to the log.
+    summary = _read_summary(strategy_dir)
+    if summary is None or summary["bytes"] != log_bytes_before:
+        rebuild_summary(strategy_dir)
+        return
+    add_entries(summary, entries)
+    summary["bytes"] = log_bytes_after
+    _write_summary(strategy_dir, summary)
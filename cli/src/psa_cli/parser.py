@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import argparse
-from importlib.metadata import PackageNotFoundError, version
+import sys
 from typing import Any, NoReturn
 
+from psa_cli.config import STORE_BACKENDS, STORE_LAYOUTS
 from psa_cli.errors import CliArgumentError
+from psa_cli.io_stream import STREAM_FORMATS
 from psa_cli.skills import supported_runtimes
 
 
@@ -14,12 +16,24 @@ class CliArgumentParser(argparse.ArgumentParser):
 
 
 def _cli_version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
     try:
         return version("psa-strategy-cli")
     except PackageNotFoundError:
         return "0.1.0"
 
 
+class _VersionAction(argparse.Action):
+    # Like argparse's "version" action, but package metadata is only read when --version is used.
+    def __init__(self, option_strings: list[str], dest: str, **kwargs: Any) -> None:
+        super().__init__(option_strings, dest, nargs=0, default=argparse.SUPPRESS, **kwargs)
+
+    def __call__(self, parser: argparse.ArgumentParser, *_: Any) -> NoReturn:
+        sys.stdout.write(f"psa-strategy-cli {_cli_version()}\n")
+        parser.exit()
+
+
 def _add_required_json_flag(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "--json",
@@ -49,6 +63,64 @@ def _add_evaluate_commands(subparsers: Any) -> None:
         )
         _add_required_json_flag(subparser)
         subparser.add_argument("--pretty", action="store_true", help="Pretty-print JSON output")
+        if command == "evaluate-rows":
+            subparser.add_argument(
+                "--input-format",
+                choices=(*STREAM_FORMATS, "binary"),
+                default="json",
+                help=(
+                    "json request object, one observation row per NDJSON line / CSV record, "
+                    "or a binary price history file (see convert-prices)"
+                ),
+            )
+        if command in ("evaluate-rows", "evaluate-ranges"):
+            subparser.add_argument(
+                "--output-format",
+                choices=STREAM_FORMATS,
+                default="json",
+                help="json response object, or one evaluated row per NDJSON line / CSV record",
+            )
+        if command == "evaluate-ranges":
+            subparser.add_argument(
+                "--no-cache",
+                dest="use_cache",
+                action="store_false",
+                help="Evaluate without reading or writing the on-disk result cache",
+            )
+
+
+def _add_evaluate_all_command(subparsers: Any) -> None:
+    evaluate_all = subparsers.add_parser(
+        "evaluate-all", help="Evaluate one observation against every stored strategy"
+    )
+    evaluate_all.set_defaults(command_key="evaluate-all")
+    evaluate_all.add_argument(
+        "--input",
+        dest="input_path",
+        required=True,
+        help="evaluate-point or evaluate-portfolio request JSON file or -",
+    )
+    evaluate_all.add_argument(
+        "--output", dest="output_path", required=True, help="Output JSON file or -"
+    )
+    evaluate_all.add_argument(
+        "--prefix", required=False, default=None, help="Only evaluate strategy ids with prefix"
+    )
+    evaluate_all.add_argument(
+        "--jobs",
+        type=int,
+        required=False,
+        default=None,
+        help="Worker processes (default: CPU count; 1 evaluates in-process)",
+    )
+    evaluate_all.add_argument(
+        "--output-format",
+        choices=("json", "ndjson"),
+        default="json",
+        help="json response object, or one per-strategy result per NDJSON line",
+    )
+    _add_required_json_flag(evaluate_all)
+    evaluate_all.add_argument("--pretty", action="store_true", help="Pretty-print JSON output")
 
 
 def _add_strategy_commands(subparsers: Any) -> None:
@@ -63,13 +135,60 @@ def _add_strategy_commands(subparsers: Any) -> None:
 
     list_cmd = strategy_subparsers.add_parser("list", help="List stored strategies")
     list_cmd.set_defaults(command_key="strategy-list")
+    list_cmd.add_argument("--prefix", required=False, default=None, help="Strategy id prefix")
+    list_cmd.add_argument(
+        "--cursor", required=False, default=None, help="next_cursor from the previous page"
+    )
+    list_cmd.add_argument("--limit", type=int, required=False, default=None, help="Page size")
+    list_cmd.add_argument(
+        "--with-log-stats",
+        action="store_true",
+        help="Include log record count, first/last ts and size for each strategy",
+    )
     _add_required_json_flag(list_cmd)
 
+    reindex = strategy_subparsers.add_parser(
+        "reindex", help="Rebuild the strategy catalog from stored strategies"
+    )
+    reindex.set_defaults(command_key="strategy-reindex")
+    _add_required_json_flag(reindex)
+
     show = strategy_subparsers.add_parser("show", help="Show one stored strategy")
     show.set_defaults(command_key="strategy-show")
     show.add_argument("--strategy-id", required=True, help="Strategy id")
+    show.add_argument(
+        "--revision", type=int, required=False, default=None, help="Show an older revision"
+    )
     _add_required_json_flag(show)
 
+    history = strategy_subparsers.add_parser(
+        "history", help="List stored revisions with their content hashes"
+    )
+    history.set_defaults(command_key="strategy-history")
+    history.add_argument("--strategy-id", required=True, help="Strategy id")
+    _add_required_json_flag(history)
+
+    diff = strategy_subparsers.add_parser("diff", help="Compare two revisions segment by segment")
+    diff.set_defaults(command_key="strategy-diff")
+    diff.add_argument("--strategy-id", required=True, help="Strategy id")
+    diff.add_argument(
+        "--from",
+        dest="from_revision",
+        type=int,
+        required=False,
+        default=None,
+        help="Older revision (default: the one before --to)",
+    )
+    diff.add_argument(
+        "--to",
+        dest="to_revision",
+        type=int,
+        required=False,
+        default=None,
+        help="Newer revision (default: current)",
+    )
+    _add_required_json_flag(diff)
+
     exists = strategy_subparsers.add_parser("exists", help="Check strategy existence")
     exists.set_defaults(command_key="strategy-exists")
     exists.add_argument("--strategy-id", required=True, help="Strategy id")
@@ -98,6 +217,22 @@ def _add_install_skill_command(subparsers: Any) -> None:
     _add_required_json_flag(install)
 
 
+def _add_log_output_flags(command: Any) -> None:
+    command.add_argument(
+        "--output",
+        dest="output_path",
+        required=False,
+        default="-",
+        help="Output file or - (default: stdout)",
+    )
+    command.add_argument(
+        "--output-format",
+        choices=("json", "ndjson"),
+        default="json",
+        help="json response object, or one log record per NDJSON line",
+    )
+
+
 def _add_log_commands(subparsers: Any) -> None:
     log_parser = subparsers.add_parser("log", help="Log storage operations")
     log_subparsers = log_parser.add_subparsers(dest="log_command", required=True)
@@ -108,12 +243,23 @@ def _add_log_commands(subparsers: Any) -> None:
     append.add_argument("--input", dest="input_path", required=True, help="Input JSON file or -")
     _add_required_json_flag(append)
 
+    append_batch = log_subparsers.add_parser(
+        "append-batch", help="Append NDJSON log records atomically with one fsync"
+    )
+    append_batch.set_defaults(command_key="log-append-batch")
+    append_batch.add_argument("--strategy-id", required=True, help="Strategy id")
+    append_batch.add_argument(
+        "--input", dest="input_path", required=True, help="Input NDJSON file or -"
+    )
+    _add_required_json_flag(append_batch)
+
     list_cmd = log_subparsers.add_parser("list", help="List log records")
     list_cmd.set_defaults(command_key="log-list")
     list_cmd.add_argument("--strategy-id", required=True, help="Strategy id")
     list_cmd.add_argument("--limit", type=int, required=False, default=None, help="Maximum items")
     list_cmd.add_argument("--from-ts", required=False, default=None, help="Lower RFC3339 bound")
     list_cmd.add_argument("--to-ts", required=False, default=None, help="Upper RFC3339 bound")
+    _add_log_output_flags(list_cmd)
     _add_required_json_flag(list_cmd)
 
     show = log_subparsers.add_parser("show", help="Show one log record by id")
@@ -126,16 +272,240 @@ def _add_log_commands(subparsers: Any) -> None:
     tail.set_defaults(command_key="log-tail")
     tail.add_argument("--strategy-id", required=True, help="Strategy id")
     tail.add_argument("--limit", type=int, required=True, help="Tail size")
+    _add_log_output_flags(tail)
     _add_required_json_flag(tail)
 
+    stats = log_subparsers.add_parser(
+        "stats", help="Show log record count, first/last ts, size and per-day counts"
+    )
+    stats.set_defaults(command_key="log-stats")
+    stats.add_argument("--strategy-id", required=True, help="Strategy id")
+    _add_required_json_flag(stats)
+
+    query = log_subparsers.add_parser(
+        "query", help="Return log records whose payload fields match all predicates"
+    )
+    query.set_defaults(command_key="log-query")
+    query.add_argument("--strategy-id", required=True, help="Strategy id")
+    query.add_argument(
+        "--where",
+        action="append",
+        default=[],
+        help="Payload predicate <path><op><value>, op one of = > >= < <= (repeatable)",
+    )
+    query.add_argument(
+        "--has",
+        action="append",
+        default=[],
+        help="Payload path that must exist (repeatable)",
+    )
+    query.add_argument("--limit", type=int, required=False, default=None, help="Maximum items")
+    query.add_argument("--from-ts", required=False, default=None, help="Lower RFC3339 bound")
+    query.add_argument("--to-ts", required=False, default=None, help="Upper RFC3339 bound")
+    _add_log_output_flags(query)
+    _add_required_json_flag(query)
+
+    index_parser = log_subparsers.add_parser("index", help="Payload field index operations")
+    index_subparsers = index_parser.add_subparsers(dest="log_index_command", required=True)
+    index_help = {
+        "add": "Declare (or rebuild) an index on a payload path",
+        "drop": "Remove a payload path index",
+        "list": "List indexed payload paths",
+    }
+    for action, help_text in index_help.items():
+        index_cmd = index_subparsers.add_parser(action, help=help_text)
+        index_cmd.set_defaults(command_key=f"log-index-{action}")
+        index_cmd.add_argument("--strategy-id", required=True, help="Strategy id")
+        if action != "list":
+            index_cmd.add_argument("--field", required=True, help="Dotted payload path")
+        _add_required_json_flag(index_cmd)
+
+    rotate = log_subparsers.add_parser(
+        "rotate", help="Seal the active log segment into a compressed archive segment"
+    )
+    rotate.set_defaults(command_key="log-rotate")
+    rotate.add_argument("--strategy-id", required=True, help="Strategy id")
+    _add_required_json_flag(rotate)
+
+
+def _add_convert_prices_command(subparsers: Any) -> None:
+    convert = subparsers.add_parser(
+        "convert-prices", help="Convert observation rows into a binary price history file"
+    )
+    convert.set_defaults(command_key="convert-prices")
+    convert.add_argument("--input", dest="input_path", required=True, help="Input file or -")
+    convert.add_argument(
+        "--input-format",
+        choices=STREAM_FORMATS,
+        required=True,
+        help="json request object, or one observation row per NDJSON line / CSV record",
+    )
+    convert.add_argument(
+        "--output", dest="history_path", required=True, help="Binary price history file"
+    )
+    _add_required_json_flag(convert)
+
+
+def _add_watch_command(subparsers: Any) -> None:
+    watch = subparsers.add_parser(
+        "watch", help="Follow a price feed and print evaluations only when they change"
+    )
+    watch.set_defaults(command_key="watch")
+    watch.add_argument("--strategy-id", required=True, help="Stored strategy id")
+    watch.add_argument(
+        "--feed",
+        dest="feed_path",
+        required=True,
+        help="NDJSON observation rows; a file is followed as it grows, - reads stdin to EOF",
+    )
+    watch.add_argument(
+        "--share-threshold",
+        type=float,
+        default=0.0,
+        help="Emit when target_share moved by more than this since the last record",
+    )
+    watch.add_argument(
+        "--delta-threshold",
+        type=float,
+        default=0.0,
+        help="Emit when asset_amount_delta moved by more than this since the last record",
+    )
+    watch.add_argument(
+        "--usd-amount", type=float, default=None, help="Held USD, to report the rebalance delta"
+    )
+    watch.add_argument(
+        "--asset-amount",
+        type=float,
+        default=None,
+        help="Held asset amount, to report the rebalance delta",
+    )
+    watch.add_argument(
+        "--poll-interval",
+        dest="poll_seconds",
+        type=float,
+        default=0.25,
+        help="Seconds between checks for new feed lines",
+    )
+    watch.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=None,
+        help="Stop after this many seconds without new feed lines (default: follow forever)",
+    )
+    watch.add_argument(
+        "--output-format",
+        choices=("ndjson", "csv"),
+        default="ndjson",
+        help="One record per NDJSON line or CSV row, flushed as it is emitted",
+    )
+    _add_required_json_flag(watch)
+
+
+def _add_position_commands(subparsers: Any) -> None:
+    position_parser = subparsers.add_parser(
+        "position", help="Holdings replayed from fill and transfer log records"
+    )
+    position_subparsers = position_parser.add_subparsers(dest="position_command", required=True)
+
+    show = position_subparsers.add_parser(
+        "show", help="Show the position, replaying only logs appended since the last checkpoint"
+    )
+    show.set_defaults(command_key="position-show")
+    show.add_argument("--strategy-id", required=True, help="Strategy id")
+    show.add_argument(
+        "--price",
+        type=float,
+        required=False,
+        default=None,
+        help="Also evaluate the position as an evaluate-portfolio request at this price",
+    )
+    show.add_argument(
+        "--timestamp",
+        required=False,
+        default=None,
+        help="RFC3339 observation time for --price (default: now)",
+    )
+    _add_required_json_flag(show)
+
+
+def _add_store_commands(subparsers: Any) -> None:
+    store_parser = subparsers.add_parser("store", help="Store-wide maintenance operations")
+    store_subparsers = store_parser.add_subparsers(dest="store_command", required=True)
+
+    migrate = store_subparsers.add_parser(
+        "migrate", help="Copy all strategies and logs into another storage backend"
+    )
+    migrate.set_defaults(command_key="store-migrate")
+    migrate.add_argument(
+        "--to",
+        dest="target_backend",
+        choices=STORE_BACKENDS,
+        required=True,
+        help="Target storage backend",
+    )
+    _add_required_json_flag(migrate)
+
+    relayout = store_subparsers.add_parser(
+        "relayout", help="Move strategy directories into a flat or sharded layout"
+    )
+    relayout.set_defaults(command_key="store-relayout")
+    relayout.add_argument(
+        "--layout",
+        choices=STORE_LAYOUTS,
+        required=True,
+        help="flat: one directory per strategy; sharded: two-level hashed fan-out",
+    )
+    _add_required_json_flag(relayout)
+
+    export = store_subparsers.add_parser(
+        "export", help="Write every strategy and log into one streaming bundle file"
+    )
+    export.set_defaults(command_key="store-export")
+    export.add_argument(
+        "--output", dest="bundle_path", required=True, help="Bundle file (.tar.gz) to write"
+    )
+    _add_required_json_flag(export)
+
+    import_parser = store_subparsers.add_parser(
+        "import", help="Load a bundle written by store export into an empty store"
+    )
+    import_parser.set_defaults(command_key="store-import")
+    import_parser.add_argument(
+        "--input", dest="bundle_path", required=True, help="Bundle file or -"
+    )
+    import_parser.add_argument(
+        "--jobs",
+        type=int,
+        required=False,
+        default=None,
+        help="Strategies written in parallel (default: CPU count; 1 imports sequentially)",
+    )
+    _add_required_json_flag(import_parser)
+
 
 def build_parser() -> argparse.ArgumentParser:
     parser = CliArgumentParser(prog="psa")
-    parser.add_argument("--version", action="version", version=f"psa-strategy-cli {_cli_version()}")
+    parser.add_argument("--version", action=_VersionAction, help="Show the CLI version and exit")
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Write phase and lock timings as JSON to stderr after the command",
+    )
+    parser.add_argument(
+        "--profile",
+        dest="profile_path",
+        metavar="PATH",
+        help="Profile the command with cProfile and write the stats to PATH",
+    )
 
     subparsers = parser.add_subparsers(dest="command_key")
     _add_evaluate_commands(subparsers)
+    _add_evaluate_all_command(subparsers)
+    _add_watch_command(subparsers)
     _add_strategy_commands(subparsers)
     _add_log_commands(subparsers)
+    _add_position_commands(subparsers)
+    _add_store_commands(subparsers)
+    _add_convert_prices_command(subparsers)
     _add_install_skill_command(subparsers)
     return parser
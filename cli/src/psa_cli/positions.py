@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import math
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from psa_cli.errors import CliValidationError
+from psa_cli.fsutil import write_atomic_json
+
+# Position snapshots replayed from structured log records. Two optional event shapes move the
+# position; every other log record is ignored:
+#   {"event_type": "fill", "fill": {"side": "buy"|"sell", "asset_amount", "price", "fee_usd"?}}
+#   {"event_type": "transfer", "transfer": {"usd_amount"}}  (negative for withdrawals)
+# Appends reject malformed position events. Records that still cannot be applied during replay
+# (written before validation existed, or sells beyond current holdings, including any sell with
+# no holdings) are counted in `rejected` and otherwise skipped. Backends keep a checkpoint of
+# the snapshot and the number of log records it covers, so each read only replays records
+# appended since.
+
+FILL_EVENT_TYPE = "fill"
+TRANSFER_EVENT_TYPE = "transfer"
+FILL_SIDES = ("buy", "sell")
+CHECKPOINT_FILE_NAME = "position.checkpoint.json"
+CHECKPOINT_VERSION = 1
+_DUST = 1e-12
+
+
+def empty_position() -> dict[str, Any]:
+    return {
+        "asset_amount": 0.0,
+        "usd_amount": 0.0,
+        "avg_entry_price": None,
+        "cost_basis_usd": 0.0,
+        "realized_pnl_usd": 0.0,
+        "fees_usd": 0.0,
+        "fills": 0,
+        "transfers": 0,
+        "rejected": 0,
+        "last_event_ts": None,
+    }
+
+
+def _number(obj: Mapping[str, Any], key: str, *, name: str, positive: bool) -> float:
+    value = obj.get(key)
+    if isinstance(value, bool) or not isinstance(value, int | float) or not math.isfinite(value):
+        raise CliValidationError(f"{name}.{key} must be a finite number")
+    if positive and value <= 0:
+        raise CliValidationError(f"{name}.{key} must be > 0")
+    return float(value)
+
+
+def _read_fill(payload: Mapping[str, Any], *, name: str) -> tuple[str, float, float, float]:
+    fill = payload.get("fill")
+    name = f"{name}.fill"
+    if not isinstance(fill, Mapping):
+        raise CliValidationError(f"{name} must be an object")
+    side = fill.get("side")
+    if side not in FILL_SIDES:
+        raise CliValidationError(f"{name}.side must be one of: {', '.join(FILL_SIDES)}")
+    amount = _number(fill, "asset_amount", name=name, positive=True)
+    price = _number(fill, "price", name=name, positive=True)
+    fee = _number(fill, "fee_usd", name=name, positive=False) if "fee_usd" in fill else 0.0
+    if fee < 0:
+        raise CliValidationError(f"{name}.fee_usd must be >= 0")
+    return side, amount, price, fee
+
+
+def _read_transfer(payload: Mapping[str, Any], *, name: str) -> float:
+    transfer = payload.get("transfer")
+    if not isinstance(transfer, Mapping):
+        raise CliValidationError(f"{name}.transfer must be an object")
+    return _number(transfer, "usd_amount", name=f"{name}.transfer", positive=False)
+
+
+def validate_position_event(payload: Mapping[str, Any], *, name: str) -> None:
+    event_type = payload.get("event_type")
+    if event_type == FILL_EVENT_TYPE:
+        _read_fill(payload, name=name)
+    elif event_type == TRANSFER_EVENT_TYPE:
+        _read_transfer(payload, name=name)
+
+
+def _apply_fill(
+    position: dict[str, Any], side: str, amount: float, price: float, fee: float
+) -> bool:
+    held = position["asset_amount"]
+    if side == "buy":
+        cost = amount * price + fee
+        position["asset_amount"] = held + amount
+        position["usd_amount"] -= cost
+        position["cost_basis_usd"] += cost
+    else:
+        if held <= _DUST or amount > held + _DUST:
+            return False
+        released = position["cost_basis_usd"] * (1.0 if amount >= held else amount / held)
+        proceeds = amount * price - fee
+        position["asset_amount"] = held - amount
+        position["usd_amount"] += proceeds
+        position["cost_basis_usd"] -= released
+        position["realized_pnl_usd"] += proceeds - released
+        if position["asset_amount"] <= _DUST:
+            position["asset_amount"] = 0.0
+            position["cost_basis_usd"] = 0.0
+    held = position["asset_amount"]
+    position["avg_entry_price"] = position["cost_basis_usd"] / held if held > 0 else None
+    position["fees_usd"] += fee
+    position["fills"] += 1
+    return True
+
+
+def apply_entry(position: dict[str, Any], entry: Mapping[str, Any]) -> None:
+    payload = entry.get("payload")
+    if not isinstance(payload, Mapping):
+        return
+    event_type = payload.get("event_type")
+    if event_type not in (FILL_EVENT_TYPE, TRANSFER_EVENT_TYPE):
+        return
+    try:
+        if event_type == FILL_EVENT_TYPE:
+            applied = _apply_fill(position, *_read_fill(payload, name="log payload"))
+        else:
+            position["usd_amount"] += _read_transfer(payload, name="log payload")
+            position["transfers"] += 1
+            applied = True
+    except CliValidationError:
+        applied = False
+    if not applied:
+        position["rejected"] += 1
+        return
+    position["last_event_ts"] = entry.get("ts")
+
+
+def empty_checkpoint() -> dict[str, Any]:
+    return {"records": 0, "position": empty_position()}
+
+
+def checkpoint_path(strategy_dir: Path) -> Path:
+    return strategy_dir / CHECKPOINT_FILE_NAME
+
+
+def read_checkpoint(strategy_dir: Path) -> dict[str, Any] | None:
+    try:
+        payload = json.loads(checkpoint_path(strategy_dir).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != CHECKPOINT_VERSION:
+        return None
+    records = payload.get("records")
+    log_bytes = payload.get("log_bytes")
+    position = payload.get("position")
+    if not isinstance(records, int) or not isinstance(log_bytes, int):
+        return None
+    if not isinstance(position, dict) or set(position) != set(empty_position()):
+        return None
+    return {"records": records, "log_bytes": log_bytes, "position": position}
+
+
+def write_checkpoint(strategy_dir: Path, checkpoint: Mapping[str, Any]) -> None:
+    # Derived and self-validating like the log summary: replaced atomically without fsync.
+    payload = {"version": CHECKPOINT_VERSION, **checkpoint}
+    write_atomic_json(checkpoint_path(strategy_dir), payload, durable=False)
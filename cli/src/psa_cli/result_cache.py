@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import marshal
+import os
+import struct
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import astuple
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from psa_cli import timings
+from psa_cli.config import store_home
+from psa_cli.errors import CliIoError
+
+if TYPE_CHECKING:
+    from psa_core.types import StrategySpec
+
+# Content-addressed cache of evaluate-ranges results under `<store>/cache/results`. An entry is
+# keyed by a hash of the parsed strategy and the normalized range request, so an upserted
+# strategy never hits an entry of a different revision, and reverting to an earlier strategy
+# hits its entries again. An entry holds the evaluated rows as marshal-ed chunks of column
+# tuples and a fixed trailer (magic, row count). It is written to a temp file while the rows
+# stream out and renamed into place only when the evaluation completes. The directory is bounded
+# by `result_cache_max_bytes`, evicting least recently used entries first (hits refresh mtime).
+
+RESULT_CACHE_DIR = "cache/results"
+RESULT_CACHE_VERSION = 1
+ENTRY_SUFFIX = ".rows"
+STALE_TMP_SECONDS = 3600
+_CHUNK_ROWS = 4096
+_TRAILER = struct.Struct("<8sQ")
+_MAGIC = b"PSARES01"
+
+
+def cache_dir() -> Path:
+    return store_home() / RESULT_CACHE_DIR
+
+
+def _strategy_prefix(strategy_id: str) -> str:
+    return hashlib.sha1(strategy_id.encode("utf-8")).hexdigest()[:16]
+
+
+def _normalized_ts(value: Any) -> Any:
+    # Equivalent spellings of one instant produce the same grid, so they share an entry.
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return value
+    if parsed.tzinfo is None:
+        return value
+    return parsed.astimezone(UTC).isoformat()
+
+
+def result_key(strategy: StrategySpec, params: Mapping[str, Any], columns: Sequence[str]) -> str:
+    request = {
+        **params,
+        "time_start": _normalized_ts(params.get("time_start")),
+        "time_end": _normalized_ts(params.get("time_end")),
+    }
+    material = [RESULT_CACHE_VERSION, list(columns), astuple(strategy), request]
+    encoded = json.dumps(material, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def entry_path(strategy_id: str, key: str) -> Path:
+    return cache_dir() / f"{_strategy_prefix(strategy_id)}.{key}{ENTRY_SUFFIX}"
+
+
+def _unlink(path: Path | str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _iter_entry(
+    handle: BinaryIO, path: Path, end: int, columns: Sequence[str]
+) -> Iterator[dict[str, Any]]:
+    with handle:
+        while handle.tell() < end:
+            try:
+                chunk = marshal.load(handle)
+            except (EOFError, ValueError, TypeError) as exc:
+                _unlink(path)
+                raise CliIoError(
+                    f"result cache entry {path} is corrupt and was removed; run the command again"
+                ) from exc
+            for values in chunk:
+                yield dict(zip(columns, values, strict=True))
+
+
+def read_rows(path: Path, columns: Sequence[str]) -> Iterator[dict[str, Any]] | None:
+    # None on a miss, including entries without a valid trailer (never completed or damaged).
+    try:
+        handle = path.open("rb")
+    except OSError:
+        return None
+    try:
+        end = os.fstat(handle.fileno()).st_size - _TRAILER.size
+        if end < 0:
+            raise ValueError("entry too short")
+        handle.seek(end)
+        magic, _ = _TRAILER.unpack(handle.read(_TRAILER.size))
+        if magic != _MAGIC:
+            raise ValueError("bad trailer")
+        handle.seek(0)
+        os.utime(path)
+    except (OSError, ValueError, struct.error):
+        handle.close()
+        return None
+    return _iter_entry(handle, path, end, columns)
+
+
+def record_rows(
+    path: Path, rows: Iterable[Mapping[str, Any]], columns: Sequence[str], *, max_bytes: int
+) -> Iterator[Mapping[str, Any]]:
+    # Yields `rows` unchanged while writing them to a new entry. Caching is best-effort: write
+    # failures, entries larger than `max_bytes` and abandoned streams leave no entry behind.
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle: BinaryIO | None = tmp_path.open("wb")
+    except OSError:
+        handle = None
+    count = 0
+    written = 0
+    chunk: list[tuple[Any, ...]] = []
+    try:
+        for row in rows:
+            yield row
+            if handle is None:
+                continue
+            chunk.append(tuple(row[column] for column in columns))
+            if len(chunk) < _CHUNK_ROWS:
+                continue
+            count += len(chunk)
+            written += _write_chunk(handle, chunk)
+            chunk = []
+            if written > max_bytes:
+                handle.close()
+                _unlink(tmp_path)
+                handle = None
+        if handle is None:
+            return
+        count += len(chunk)
+        written += _write_chunk(handle, chunk) if chunk else 0
+        handle.write(_TRAILER.pack(_MAGIC, count))
+        handle.close()
+        written += _TRAILER.size
+        if written <= max_bytes:
+            os.replace(tmp_path, path)
+            evict(max_bytes)
+    except OSError:
+        pass
+    finally:
+        if handle is not None and not handle.closed:
+            handle.close()
+        _unlink(tmp_path)
+
+
+def _write_chunk(handle: BinaryIO, chunk: list[tuple[Any, ...]]) -> int:
+    data = marshal.dumps(chunk)
+    handle.write(data)
+    return len(data)
+
+
+def cached_rows(
+    strategy_id: str,
+    strategy: StrategySpec,
+    params: Mapping[str, Any],
+    columns: Sequence[str],
+    *,
+    max_bytes: int,
+    evaluate: Callable[[], Iterable[Mapping[str, Any]]],
+) -> Iterable[Mapping[str, Any]]:
+    path = entry_path(strategy_id, result_key(strategy, params, columns))
+    with timings.phase("store"):
+        hit = read_rows(path, columns)
+    if hit is not None:
+        return timings.timed_iter("store", hit)
+    return record_rows(path, evaluate(), columns, max_bytes=max_bytes)
+
+
+def _iter_files(directory: Path) -> Iterator[os.DirEntry[str]]:
+    try:
+        with os.scandir(directory) as entries:
+            yield from entries
+    except OSError:
+        return
+
+
+def evict(max_bytes: int) -> None:
+    # Removes least recently used entries until the directory fits `max_bytes`, plus temp
+    # files left behind by interrupted writers.
+    stale_before = time.time() - STALE_TMP_SECONDS
+    entries: list[tuple[int, int, str]] = []
+    for entry in _iter_files(cache_dir()):
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        if entry.name.endswith(".tmp"):
+            if stat.st_mtime < stale_before:
+                _unlink(entry.path)
+        elif entry.name.endswith(ENTRY_SUFFIX):
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        _unlink(path)
+        total -= size
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+from psa_cli.fsutil import read_json_file, storage_error, write_atomic_text
+
+# Strategy revision history. The strategy payload of every stored revision is kept as a
+# content-addressed blob named by the SHA-256 of its canonical JSON (sorted keys, compact), so
+# identical payloads, including reverts, share one blob. A per-strategy index lists revision,
+# updated_at and content_hash. The directory backend keeps blobs in `<store>/blobs/<h[0:2]>/`
+# and appends the index (`revisions.ndjson`) under the strategy write lock after strategy.json
+# is replaced; the sqlite backend writes both tables in the upsert transaction. Revisions
+# missing from the index (stores created before history existed, or a crash between the two
+# writes) are filled in from the current record when read.
+
+REVISIONS_FILE_NAME = "revisions.ndjson"
+BLOBS_DIR_NAME = "blobs"
+
+
+def canonical_strategy(strategy: Mapping[str, Any]) -> bytes:
+    return json.dumps(strategy, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def data_hash(data: bytes) -> str:
+    import hashlib
+
+    return hashlib.sha256(data).hexdigest()
+
+
+def content_hash(strategy: Mapping[str, Any]) -> str:
+    return data_hash(canonical_strategy(strategy))
+
+
+def revision_entry(record: Mapping[str, Any], digest: str) -> dict[str, Any]:
+    return {
+        "revision": record["revision"],
+        "updated_at": record["updated_at"],
+        "content_hash": digest,
+    }
+
+
+def merge_current(
+    entries: Iterable[Mapping[str, Any]], current: Mapping[str, Any] | None
+) -> list[dict[str, Any]]:
+    # Index entries by revision (a later line for the same revision wins), plus the current
+    # record when the index does not cover it yet.
+    by_revision = {entry["revision"]: dict(entry) for entry in entries}
+    if current is not None:
+        revision = current["revision"]
+        indexed = by_revision.get(revision)
+        if indexed is None or indexed["updated_at"] != current["updated_at"]:
+            by_revision[revision] = revision_entry(current, content_hash(current["strategy"]))
+        for stale in [number for number in by_revision if number > revision]:
+            del by_revision[stale]  # written to the index but never became current
+    return [by_revision[number] for number in sorted(by_revision)]
+
+
+def revision_record(
+    strategy_id: str, entry: Mapping[str, Any], strategy: Mapping[str, Any]
+) -> dict[str, Any]:
+    return {
+        "strategy_id": strategy_id,
+        "revision": entry["revision"],
+        "updated_at": entry["updated_at"],
+        "strategy": strategy,
+    }
+
+
+def blob_path(blobs_root: Path, digest: str) -> Path:
+    return blobs_root / digest[:2] / f"{digest}.json"
+
+
+def write_blob(blobs_root: Path, digest: str, data: bytes) -> None:
+    path = blob_path(blobs_root, digest)
+    if path.is_file():
+        return  # content-addressed: an existing blob already holds these bytes
+    write_atomic_text(path, data.decode("utf-8") + "\n")
+
+
+def read_blob(blobs_root: Path, digest: str) -> Mapping[str, Any] | None:
+    path = blob_path(blobs_root, digest)
+    if not path.is_file():
+        return None
+    return read_json_file(path)
+
+
+def revisions_path(strategy_dir: Path) -> Path:
+    return strategy_dir / REVISIONS_FILE_NAME
+
+
+def append_revision(strategy_dir: Path, entry: Mapping[str, Any]) -> None:
+    path = revisions_path(strategy_dir)
+    line = json.dumps(entry, separators=(",", ":"), sort_keys=False) + "\n"
+    try:
+        with path.open("a+b") as handle:
+            if handle.tell() > 0:
+                handle.seek(-1, os.SEEK_END)
+                if handle.read(1) != b"\n":
+                    line = "\n" + line  # close a torn line left by an interrupted append
+            handle.write(line.encode("utf-8"))
+            handle.flush()
+            os.fsync(handle.fileno())
+    except OSError as exc:
+        raise storage_error(f"failed to append {path}", path, exc) from exc
+
+
+def read_revisions(strategy_dir: Path) -> list[dict[str, Any]]:
+    path = revisions_path(strategy_dir)
+    try:
+        text = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return []
+    except OSError as exc:
+        raise storage_error(f"failed to read {path}", path, exc) from exc
+    entries: list[dict[str, Any]] = []
+    for line in text.splitlines():
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue  # torn last line of an interrupted append
+        if isinstance(entry, dict) and isinstance(entry.get("revision"), int):
+            entries.append(entry)
+    return entries
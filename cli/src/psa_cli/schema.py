@@ -7,11 +7,13 @@ from datetime import datetime
 from functools import cache
 from importlib.resources import files
 from pathlib import Path
-from typing import Any
-
-from jsonschema import Draft202012Validator, FormatChecker, ValidationError
+from typing import TYPE_CHECKING, Any
 
 from psa_cli.errors import CliValidationError
+from psa_cli.schema_compiler import Check, compile_schema
+
+if TYPE_CHECKING:
+    from jsonschema import Draft202012Validator, FormatChecker
 
 REQUEST_SCHEMAS: dict[str, str] = {
     "evaluate-point": "evaluate_point.request.v1.json",
@@ -20,16 +22,22 @@ REQUEST_SCHEMAS: dict[str, str] = {
     "evaluate-ranges": "evaluate_rows_from_ranges.request.v1.json",
     "strategy-upsert": "strategy_upsert.request.v1.json",
     "log-append": "log_append.request.v1.json",
+    "convert-prices": "evaluate_rows.request.v1.json",
+}
+
+# Streamed inputs are validated one item at a time against a `$defs` entry of the request schema.
+ITEM_SCHEMAS: dict[str, tuple[str, str]] = {
+    "evaluate-rows": ("evaluate_rows.request.v1.json", "ObservationRow"),
+    "convert-prices": ("evaluate_rows.request.v1.json", "ObservationRow"),
+    "watch": ("evaluate_rows.request.v1.json", "ObservationRow"),
 }
 
-FORMAT_CHECKER = FormatChecker()
 RFC3339_DATETIME_RE = re.compile(
     r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})$"
 )
 PACKAGED_SCHEMA_ROOT = "psa_cli/schemas"
 
 
-@FORMAT_CHECKER.checks("date-time")
 def _is_rfc3339_datetime(value: object) -> bool:
     if not isinstance(value, str):
         return False
@@ -44,6 +52,42 @@ def _is_rfc3339_datetime(value: object) -> bool:
     return True
 
 
+FORMATS: dict[str, Check] = {"date-time": _is_rfc3339_datetime}
+
+
+@cache
+def _format_checker() -> FormatChecker:
+    from jsonschema import FormatChecker
+
+    checker = FormatChecker()
+    for name, check in FORMATS.items():
+        checker.checks(name)(check)
+    return checker
+
+
+class _CachedValidator:
+    # One per schema and process. Valid payloads pass the compiled check without touching
+    # jsonschema; the jsonschema validator is built on first rejection to report the error.
+    def __init__(self, schema_file: str, schema: dict[str, Any]) -> None:
+        self.schema_file = schema_file
+        self._schema = schema
+        self._check = compile_schema(schema, formats=FORMATS)
+        self._validator: Draft202012Validator | None = None
+
+    def error(self, payload: Any) -> str | None:
+        if self._check is not None and self._check(payload):
+            return None
+        from jsonschema import Draft202012Validator, ValidationError
+
+        if self._validator is None:
+            self._validator = Draft202012Validator(self._schema, format_checker=_format_checker())
+        try:
+            self._validator.validate(payload)
+        except ValidationError as exc:
+            return exc.message
+        return None
+
+
 def _schema_candidates() -> list[tuple[str, Path]]:
     candidates: list[tuple[str, Path]] = []
     env_dir = os.getenv("PSA_SCHEMA_DIR")
@@ -118,16 +162,38 @@ def load_schema(schema_file: str) -> dict[str, Any]:
     raise CliValidationError(f"schema '{schema_file}' not found (checked: {checked_locations})")
 
 
-def validate_request(command: str, payload: Any) -> None:
+@cache
+def _request_validator(command: str) -> _CachedValidator:
     schema_file = REQUEST_SCHEMAS.get(command)
     if schema_file is None:
         raise CliValidationError(f"unsupported command: {command}")
+    return _CachedValidator(schema_file, load_schema(schema_file))
+
+
+def validate_request(command: str, payload: Any) -> None:
+    validator = _request_validator(command)
+    message = validator.error(payload)
+    if message is not None:
+        raise CliValidationError(
+            f"request does not match schema '{validator.schema_file}': {message}"
+        )
 
+
+@cache
+def _item_validator(command: str) -> _CachedValidator:
+    item_schema = ITEM_SCHEMAS.get(command)
+    if item_schema is None:
+        raise CliValidationError(f"unsupported streamed command: {command}")
+    schema_file, definition = item_schema
     schema = load_schema(schema_file)
-    validator = Draft202012Validator(schema, format_checker=FORMAT_CHECKER)
-    try:
-        validator.validate(payload)
-    except ValidationError as exc:
+    item_root = {"$ref": f"#/$defs/{definition}", "$defs": schema.get("$defs", {})}
+    return _CachedValidator(schema_file, item_root)
+
+
+def validate_request_item(command: str, item: Any, *, line: int) -> None:
+    validator = _item_validator(command)
+    message = validator.error(item)
+    if message is not None:
         raise CliValidationError(
-            f"request does not match schema '{schema_file}': {exc.message}"
-        ) from exc
+            f"line {line} does not match schema '{validator.schema_file}': {message}"
+        )
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Mapping
+from typing import Any
+
+# Compiles the JSON Schema subset used by the request schemas into plain Python predicates, so
+# valid requests are accepted without importing or constructing jsonschema validators (the
+# largest import in the CLI). A predicate only answers "valid or not": rejected payloads are
+# re-validated with jsonschema, which stays the source of truth and produces the error message.
+# A schema using any keyword outside the subset compiles to None and always uses jsonschema.
+
+Check = Callable[[Any], bool]
+
+_ANNOTATIONS = frozenset(
+    {"$schema", "$comment", "$defs", "title", "description", "default", "examples", "deprecated"}
+)
+_DEFS_REF_PREFIX = "#/$defs/"
+
+
+class _UnsupportedSchema(Exception):
+    pass
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def _is_integer(value: Any) -> bool:
+    return _is_number(value) and (isinstance(value, int) or value.is_integer())
+
+
+_TYPE_CHECKS: dict[str, Check] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "number": _is_number,
+    "integer": _is_integer,
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+
+def json_equal(one: Any, two: Any) -> bool:
+    # JSON equality as jsonschema applies it to enum/const: booleans never equal numbers.
+    if isinstance(one, str) or isinstance(two, str):
+        return one == two
+    if isinstance(one, list) and isinstance(two, list):
+        return len(one) == len(two) and all(map(json_equal, one, two))
+    if isinstance(one, dict) and isinstance(two, dict):
+        return one.keys() == two.keys() and all(json_equal(one[key], two[key]) for key in one)
+    if isinstance(one, bool) or isinstance(two, bool):
+        return isinstance(one, bool) and isinstance(two, bool) and one == two
+    return one == two
+
+
+class _Compiler:
+    def __init__(self, root: Mapping[str, Any], formats: Mapping[str, Check]) -> None:
+        self._root_defs = root.get("$defs", {})
+        self._formats = formats
+        self._defs: dict[str, Check] = {}
+
+    def compile(self, schema: Any, *, root: bool = False) -> Check:
+        if schema is True:
+            return lambda value: True
+        if schema is False:
+            return lambda value: False
+        if not isinstance(schema, Mapping):
+            raise _UnsupportedSchema("schema must be an object or boolean")
+        checks: list[Check] = []
+        for keyword, argument in schema.items():
+            if keyword in _ANNOTATIONS or (root and keyword == "$id"):
+                continue
+            if keyword in ("properties", "required", "additionalProperties"):
+                continue
+            if keyword in ("contains", "minContains", "maxContains"):
+                continue
+            checks.append(self._keyword(keyword, argument))
+        if "properties" in schema or "required" in schema or "additionalProperties" in schema:
+            checks.append(self._object(schema))
+        if "contains" in schema:
+            checks.append(self._contains(schema))
+        if len(checks) == 1:
+            return checks[0]
+        return lambda value: all(check(value) for check in checks)
+
+    def _keyword(self, keyword: str, argument: Any) -> Check:
+        if keyword == "$ref":
+            return self._ref(argument)
+        if keyword == "type":
+            names = [argument] if isinstance(argument, str) else argument
+            if not isinstance(names, list) or any(name not in _TYPE_CHECKS for name in names):
+                raise _UnsupportedSchema(f"unsupported type {argument!r}")
+            type_checks = [_TYPE_CHECKS[name] for name in names]
+            return lambda value: any(check(value) for check in type_checks)
+        if keyword == "enum":
+            if not isinstance(argument, list):
+                raise _UnsupportedSchema("enum must be an array")
+            return lambda value: any(json_equal(value, option) for option in argument)
+        if keyword == "const":
+            return lambda value: json_equal(value, argument)
+        if keyword in ("minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum"):
+            return self._bound(keyword, argument)
+        if keyword in ("minLength", "maxLength", "minItems", "maxItems"):
+            return self._size(keyword, argument)
+        if keyword == "pattern":
+            pattern = re.compile(argument)
+            return lambda value: not isinstance(value, str) or pattern.search(value) is not None
+        if keyword == "format":
+            format_check = self._formats.get(argument)
+            if format_check is None:
+                raise _UnsupportedSchema(f"unsupported format {argument!r}")
+            return format_check
+        if keyword == "items":
+            if isinstance(argument, list):
+                raise _UnsupportedSchema("array-form items")
+            item_check = self.compile(argument)
+            return lambda value: not isinstance(value, list) or all(map(item_check, value))
+        if keyword in ("anyOf", "allOf", "oneOf"):
+            if not isinstance(argument, list) or not argument:
+                raise _UnsupportedSchema(f"{keyword} must be a non-empty array")
+            branches = [self.compile(branch) for branch in argument]
+            if keyword == "anyOf":
+                return lambda value: any(branch(value) for branch in branches)
+            if keyword == "allOf":
+                return lambda value: all(branch(value) for branch in branches)
+            return lambda value: sum(1 for branch in branches if branch(value)) == 1
+        if keyword == "not":
+            negated = self.compile(argument)
+            return lambda value: not negated(value)
+        raise _UnsupportedSchema(f"unsupported keyword {keyword!r}")
+
+    def _ref(self, ref: Any) -> Check:
+        if not isinstance(ref, str) or not ref.startswith(_DEFS_REF_PREFIX):
+            raise _UnsupportedSchema(f"unsupported $ref {ref!r}")
+        name = ref.removeprefix(_DEFS_REF_PREFIX)
+        if "/" in name or "~" in name or name not in self._root_defs:
+            raise _UnsupportedSchema(f"unsupported $ref {ref!r}")
+        if name not in self._defs:
+            # Placeholder first, so recursive definitions resolve at call time.
+            self._defs[name] = lambda value: self._defs[name](value)
+            self._defs[name] = self.compile(self._root_defs[name])
+        return self._defs[name]
+
+    def _bound(self, keyword: str, limit: Any) -> Check:
+        if not _is_number(limit):
+            raise _UnsupportedSchema(f"{keyword} must be a number")
+        if keyword == "minimum":
+            return lambda value: not _is_number(value) or value >= limit
+        if keyword == "maximum":
+            return lambda value: not _is_number(value) or value <= limit
+        if keyword == "exclusiveMinimum":
+            return lambda value: not _is_number(value) or value > limit
+        return lambda value: not _is_number(value) or value < limit
+
+    def _size(self, keyword: str, limit: Any) -> Check:
+        if not _is_integer(limit):
+            raise _UnsupportedSchema(f"{keyword} must be an integer")
+        kind = str if keyword.endswith("Length") else list
+        if keyword.startswith("min"):
+            return lambda value: not isinstance(value, kind) or len(value) >= limit
+        return lambda value: not isinstance(value, kind) or len(value) <= limit
+
+    def _object(self, schema: Mapping[str, Any]) -> Check:
+        properties = schema.get("properties", {})
+        required = schema.get("required", [])
+        additional = schema.get("additionalProperties", True)
+        if not isinstance(properties, Mapping) or not isinstance(required, list):
+            raise _UnsupportedSchema("properties must be an object and required an array")
+        property_checks = {name: self.compile(sub) for name, sub in properties.items()}
+        additional_check = None if additional is True else self.compile(additional)
+
+        def check(value: Any) -> bool:
+            if not isinstance(value, dict):
+                return True
+            if any(name not in value for name in required):
+                return False
+            for name, item in value.items():
+                property_check = property_checks.get(name)
+                if property_check is not None:
+                    if not property_check(item):
+                        return False
+                elif additional_check is not None and not additional_check(item):
+                    return False
+            return True
+
+        return check
+
+    def _contains(self, schema: Mapping[str, Any]) -> Check:
+        item_check = self.compile(schema["contains"])
+        min_contains = schema.get("minContains", 1)
+        max_contains = schema.get("maxContains")
+        if not _is_integer(min_contains) or not (max_contains is None or _is_integer(max_contains)):
+            raise _UnsupportedSchema("minContains/maxContains must be integers")
+
+        def check(value: Any) -> bool:
+            if not isinstance(value, list):
+                return True
+            matched = sum(1 for item in value if item_check(item))
+            return matched >= min_contains and (max_contains is None or matched <= max_contains)
+
+        return check
+
+
+def compile_schema(schema: Mapping[str, Any], *, formats: Mapping[str, Check]) -> Check | None:
+    try:
+        return _Compiler(schema, formats).compile(schema, root=True)
+    except (_UnsupportedSchema, re.error, TypeError):
+        return None
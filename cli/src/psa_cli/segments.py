@@ -0,0 +1,426 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import re
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, TextIO
+
+from psa_cli.errors import CliDomainError
+from psa_cli.fsutil import read_json_file, storage_error, write_atomic_json
+
+# Log layout inside one strategy directory:
+# - `log.ndjson` is the active segment and the only file that receives appends;
+# - `segments/NNNNNN.ndjson.gz` are sealed, gzip-compressed, read-only segments;
+# - `segments.json` is the manifest of sealed segments (the commit point of a rotation).
+# A crash between moving the active file aside and committing the manifest leaves a
+# `segments/NNNNNN.ndjson` file behind; readers treat it as a pending segment and the
+# next rotation finishes sealing it.
+
+ACTIVE_LOG_NAME = "log.ndjson"
+SEGMENTS_DIR_NAME = "segments"
+MANIFEST_NAME = "segments.json"
+MANIFEST_VERSION = 1
+
+DEFAULT_SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_SEGMENT_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+
+_PENDING_SEGMENT_RE = re.compile(r"^(\d{6,})\.ndjson$")
+
+
+@dataclass(frozen=True, slots=True)
+class SegmentInfo:
+    seq: int
+    file: str
+    records: int
+    first_ts: str | None
+    last_ts: str | None
+    min_ts: str | None
+    max_ts: str | None
+    bytes: int
+    compressed_bytes: int
+
+
+@dataclass(frozen=True, slots=True)
+class RotationPolicy:
+    max_bytes: int = DEFAULT_SEGMENT_MAX_BYTES
+    max_age_seconds: float = DEFAULT_SEGMENT_MAX_AGE_SECONDS
+
+
+def parse_ts(value: str) -> datetime | None:
+    normalized = value[:-1] + "+00:00" if value.endswith("Z") else value
+    try:
+        parsed = datetime.fromisoformat(normalized)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None or parsed.utcoffset() is None:
+        return None
+    return parsed
+
+
+def active_log_path(strategy_dir: Path) -> Path:
+    return strategy_dir / ACTIVE_LOG_NAME
+
+
+def segments_dir(strategy_dir: Path) -> Path:
+    return strategy_dir / SEGMENTS_DIR_NAME
+
+
+def manifest_path(strategy_dir: Path) -> Path:
+    return strategy_dir / MANIFEST_NAME
+
+
+def segment_to_dict(segment: SegmentInfo) -> dict[str, Any]:
+    return {
+        "seq": segment.seq,
+        "file": segment.file,
+        "records": segment.records,
+        "first_ts": segment.first_ts,
+        "last_ts": segment.last_ts,
+        "min_ts": segment.min_ts,
+        "max_ts": segment.max_ts,
+        "bytes": segment.bytes,
+        "compressed_bytes": segment.compressed_bytes,
+    }
+
+
+def _segment_from_dict(item: Mapping[str, Any], *, path: Path) -> SegmentInfo:
+    try:
+        return SegmentInfo(
+            seq=int(item["seq"]),
+            file=str(item["file"]),
+            records=int(item["records"]),
+            first_ts=item.get("first_ts"),
+            last_ts=item.get("last_ts"),
+            min_ts=item.get("min_ts"),
+            max_ts=item.get("max_ts"),
+            bytes=int(item["bytes"]),
+            compressed_bytes=int(item["compressed_bytes"]),
+        )
+    except (KeyError, TypeError, ValueError) as exc:
+        raise CliDomainError(
+            "storage_corrupted",
+            f"segment manifest entry is invalid: {path}",
+            details={"path": str(path)},
+        ) from exc
+
+
+def read_manifest(strategy_dir: Path) -> list[SegmentInfo]:
+    path = manifest_path(strategy_dir)
+    if not path.is_file():
+        return []
+    payload = read_json_file(path)
+    if payload.get("version") != MANIFEST_VERSION:
+        raise CliDomainError(
+            "storage_corrupted",
+            f"unsupported segment manifest: {path}",
+            details={"path": str(path)},
+        )
+    raw_segments = payload.get("segments")
+    if not isinstance(raw_segments, list):
+        raise CliDomainError(
+            "storage_corrupted",
+            f"segment manifest must contain a segments array: {path}",
+            details={"path": str(path)},
+        )
+    segments = [_segment_from_dict(item, path=path) for item in raw_segments]
+    return sorted(segments, key=lambda item: item.seq)
+
+
+def _write_manifest(strategy_dir: Path, segments: list[SegmentInfo]) -> None:
+    payload = {
+        "version": MANIFEST_VERSION,
+        "segments": [segment_to_dict(segment) for segment in segments],
+    }
+    write_atomic_json(manifest_path(strategy_dir), payload)
+
+
+def pending_segments(strategy_dir: Path, sealed: list[SegmentInfo]) -> list[tuple[int, Path]]:
+    directory = segments_dir(strategy_dir)
+    if not directory.is_dir():
+        return []
+    last_seq = sealed[-1].seq if sealed else 0
+    pending: list[tuple[int, Path]] = []
+    try:
+        for path in directory.iterdir():
+            match = _PENDING_SEGMENT_RE.match(path.name)
+            if match and int(match.group(1)) > last_seq:
+                pending.append((int(match.group(1)), path))
+    except OSError as exc:
+        raise storage_error(f"failed to list {directory}", directory, exc) from exc
+    return sorted(pending)
+
+
+def _open_text(path: Path) -> TextIO:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open("r", encoding="utf-8")
+
+
+def _iter_json_lines(path: Path) -> Iterator[dict[str, Any]]:
+    try:
+        handle = _open_text(path)
+    except OSError as exc:
+        raise storage_error(f"failed to read {path}", path, exc) from exc
+    with handle:
+        try:
+            for idx, line in enumerate(handle):
+                if not line.strip():
+                    continue
+                try:
+                    payload = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise CliDomainError(
+                        "storage_corrupted",
+                        f"log line {idx + 1} is not valid JSON",
+                        details={"path": str(path), "line": idx + 1, "reason": exc.msg},
+                    ) from exc
+                if not isinstance(payload, dict):
+                    raise CliDomainError(
+                        "storage_corrupted",
+                        f"log line {idx + 1} must be a JSON object",
+                        details={"path": str(path), "line": idx + 1},
+                    )
+                yield payload
+        except (OSError, EOFError) as exc:
+            reason = exc.strerror if isinstance(exc, OSError) and exc.strerror else str(exc)
+            raise CliDomainError(
+                "storage_error",
+                f"failed to read {path}",
+                details={"path": str(path), "reason": reason},
+            ) from exc
+
+
+def _overlaps(
+    segment: SegmentInfo,
+    *,
+    from_dt: datetime | None,
+    to_dt: datetime | None,
+) -> bool:
+    min_dt = parse_ts(segment.min_ts) if segment.min_ts else None
+    max_dt = parse_ts(segment.max_ts) if segment.max_ts else None
+    if from_dt is not None and max_dt is not None and max_dt < from_dt:
+        return False
+    if to_dt is not None and min_dt is not None and min_dt > to_dt:
+        return False
+    return True
+
+
+def segment_files(
+    strategy_dir: Path,
+    *,
+    from_dt: datetime | None = None,
+    to_dt: datetime | None = None,
+) -> list[Path]:
+    # Oldest first; sealed segments outside [from_dt, to_dt] are skipped without opening them.
+    sealed = read_manifest(strategy_dir)
+    directory = segments_dir(strategy_dir)
+    paths = [
+        directory / segment.file
+        for segment in sealed
+        if _overlaps(segment, from_dt=from_dt, to_dt=to_dt)
+    ]
+    paths.extend(path for _, path in pending_segments(strategy_dir, sealed))
+    active = active_log_path(strategy_dir)
+    if active.is_file():
+        paths.append(active)
+    return paths
+
+
+def iter_log_rows(
+    strategy_dir: Path,
+    *,
+    from_dt: datetime | None = None,
+    to_dt: datetime | None = None,
+) -> Iterator[dict[str, Any]]:
+    for path in segment_files(strategy_dir, from_dt=from_dt, to_dt=to_dt):
+        yield from _iter_json_lines(path)
+
+
+def iter_log_rows_at(strategy_dir: Path, ordinals: Sequence[int]) -> Iterator[dict[str, Any]]:
+    # `ordinals` are ascending 0-based row positions across all segments in append order.
+    # Sealed segments holding none of them are skipped using their manifest record counts.
+    sealed = read_manifest(strategy_dir)
+    directory = segments_dir(strategy_dir)
+    sources: list[tuple[Path, int | None]] = [
+        (directory / segment.file, segment.records) for segment in sealed
+    ]
+    sources.extend((path, None) for _, path in pending_segments(strategy_dir, sealed))
+    active = active_log_path(strategy_dir)
+    if active.is_file():
+        sources.append((active, None))
+
+    wanted = iter(ordinals)
+    target = next(wanted, None)
+    position = 0
+    for path, records in sources:
+        if target is None:
+            return
+        if records is not None and target >= position + records:
+            position += records
+            continue
+        for row in _iter_json_lines(path):
+            if position == target:
+                yield row
+                target = next(wanted, None)
+            position += 1
+            if target is None:
+                return
+
+
+def total_log_bytes(strategy_dir: Path) -> int:
+    # Raw size of the whole log. Rotation moves bytes between files without changing it, so
+    # it identifies exactly how much of the log a derived structure (e.g. an index) covers.
+    sealed = read_manifest(strategy_dir)
+    total = sum(segment.bytes for segment in sealed)
+    paths = [path for _, path in pending_segments(strategy_dir, sealed)]
+    paths.append(active_log_path(strategy_dir))
+    for path in paths:
+        try:
+            total += path.stat().st_size
+        except FileNotFoundError:
+            continue
+        except OSError as exc:
+            raise storage_error(f"failed to stat {path}", path, exc) from exc
+    return total
+
+
+def iter_log_rows_reversed_by_file(strategy_dir: Path) -> Iterator[list[dict[str, Any]]]:
+    for path in reversed(segment_files(strategy_dir)):
+        yield list(_iter_json_lines(path))
+
+
+def _first_record_ts(path: Path) -> datetime | None:
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                try:
+                    payload = json.loads(line)
+                except json.JSONDecodeError:
+                    return None
+                ts = payload.get("ts") if isinstance(payload, dict) else None
+                return parse_ts(ts) if isinstance(ts, str) else None
+    except OSError:
+        return None
+    return None
+
+
+def needs_rotation(strategy_dir: Path, *, policy: RotationPolicy, now: datetime) -> bool:
+    active = active_log_path(strategy_dir)
+    try:
+        size = active.stat().st_size
+    except FileNotFoundError:
+        return False
+    except OSError as exc:
+        raise storage_error(f"failed to stat {active}", active, exc) from exc
+    if size == 0:
+        return False
+    if policy.max_bytes > 0 and size >= policy.max_bytes:
+        return True
+    if policy.max_age_seconds > 0:
+        first_dt = _first_record_ts(active)
+        if first_dt is not None and (now - first_dt).total_seconds() >= policy.max_age_seconds:
+            return True
+    return False
+
+
+def _seal_file(source: Path, *, seq: int, strategy_dir: Path) -> SegmentInfo:
+    directory = segments_dir(strategy_dir)
+    file_name = f"{seq:06d}.ndjson.gz"
+    target = directory / file_name
+    tmp_path = directory / f".{file_name}.{os.urandom(16).hex()}.tmp"
+
+    records = 0
+    raw_bytes = 0
+    first_ts: str | None = None
+    last_ts: str | None = None
+    min_ts: str | None = None
+    max_ts: str | None = None
+    min_dt: datetime | None = None
+    max_dt: datetime | None = None
+    try:
+        with source.open("rb") as src, tmp_path.open("wb") as raw_out:
+            with gzip.GzipFile(filename="", mode="wb", fileobj=raw_out, mtime=0) as gz_out:
+                for line in src:
+                    raw_bytes += len(line)
+                    gz_out.write(line)
+                    if not line.strip():
+                        continue
+                    records += 1
+                    try:
+                        payload = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    ts = payload.get("ts") if isinstance(payload, dict) else None
+                    if not isinstance(ts, str):
+                        continue
+                    if first_ts is None:
+                        first_ts = ts
+                    last_ts = ts
+                    ts_dt = parse_ts(ts)
+                    if ts_dt is None:
+                        continue
+                    if min_dt is None or ts_dt < min_dt:
+                        min_dt, min_ts = ts_dt, ts
+                    if max_dt is None or ts_dt > max_dt:
+                        max_dt, max_ts = ts_dt, ts
+            raw_out.flush()
+            os.fsync(raw_out.fileno())
+        os.replace(tmp_path, target)
+        compressed_bytes = target.stat().st_size
+    except OSError as exc:
+        raise storage_error(f"failed to seal log segment {target}", target, exc) from exc
+    finally:
+        if tmp_path.exists():
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    return SegmentInfo(
+        seq=seq,
+        file=file_name,
+        records=records,
+        first_ts=first_ts,
+        last_ts=last_ts,
+        min_ts=min_ts,
+        max_ts=max_ts,
+        bytes=raw_bytes,
+        compressed_bytes=compressed_bytes,
+    )
+
+
+def rotate(strategy_dir: Path) -> list[SegmentInfo]:
+    # Caller must hold the strategy write lock.
+    sealed = read_manifest(strategy_dir)
+    pending = pending_segments(strategy_dir, sealed)
+    next_seq = max([sealed[-1].seq if sealed else 0, *(seq for seq, _ in pending)]) + 1
+
+    active = active_log_path(strategy_dir)
+    if active.is_file() and active.stat().st_size > 0:
+        directory = segments_dir(strategy_dir)
+        moved = directory / f"{next_seq:06d}.ndjson"
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            os.replace(active, moved)
+        except OSError as exc:
+            raise storage_error(f"failed to rotate {active}", active, exc) from exc
+        pending.append((next_seq, moved))
+
+    created: list[SegmentInfo] = []
+    for seq, path in pending:
+        segment = _seal_file(path, seq=seq, strategy_dir=strategy_dir)
+        sealed.append(segment)
+        _write_manifest(strategy_dir, sealed)
+        try:
+            path.unlink()
+        except OSError as exc:
+            raise storage_error(f"failed to remove {path}", path, exc) from exc
+        created.append(segment)
+    return created
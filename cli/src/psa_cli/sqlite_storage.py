@@ -0,0 +1,642 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from psa_cli import positions, revisions
+from psa_cli.config import store_home
+from psa_cli.errors import CliDomainError
+from psa_cli.locks import LOCK_TIMEOUT_SECONDS
+from psa_cli.log_query import LogPredicate, matches, value_kind
+from psa_cli.log_summary import empty_summary, log_day
+from psa_cli.storage import StrategyUpdate, strategy_not_found, unsupported_operation
+from psa_cli.strategy_cache import discard_compiled
+
+DATABASE_FILE_NAME = "store.sqlite3"
+COMPILED_CACHE_DIR = "cache/strategies"
+SCHEMA_VERSION = 6
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+# Size of a log row as the NDJSON line the files backend writes for it, so `bytes` in log stats
+# means the same on both backends.
+_LOG_LINE_BYTES = (
+    "LENGTH(CAST('{\"log_id\":' || json_quote(log_id) || ',\"strategy_id\":' || "
+    "json_quote(strategy_id) || ',\"ts\":' || json_quote(ts) || ',\"payload\":' || payload "
+    "|| '}' AS BLOB)) + 1"
+)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS strategies (
+        strategy_id TEXT PRIMARY KEY,
+        revision INTEGER NOT NULL,
+        updated_at TEXT NOT NULL,
+        record TEXT NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS logs (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        strategy_id TEXT NOT NULL,
+        log_id TEXT NOT NULL,
+        ts TEXT NOT NULL,
+        ts_us INTEGER NOT NULL,
+        payload TEXT NOT NULL
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS logs_strategy_log_id ON logs (strategy_id, log_id)",
+    "CREATE INDEX IF NOT EXISTS logs_strategy_ts ON logs (strategy_id, ts_us)",
+    "CREATE INDEX IF NOT EXISTS logs_strategy_seq ON logs (strategy_id, seq)",
+    """
+    CREATE TABLE IF NOT EXISTS log_indexes (
+        strategy_id TEXT NOT NULL,
+        field TEXT NOT NULL,
+        PRIMARY KEY (strategy_id, field)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS log_summaries (
+        strategy_id TEXT PRIMARY KEY,
+        records INTEGER NOT NULL,
+        first_ts TEXT,
+        last_ts TEXT,
+        bytes INTEGER NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS log_days (
+        strategy_id TEXT NOT NULL,
+        day TEXT NOT NULL,
+        records INTEGER NOT NULL,
+        PRIMARY KEY (strategy_id, day)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS positions (
+        strategy_id TEXT PRIMARY KEY,
+        last_seq INTEGER NOT NULL,
+        records INTEGER NOT NULL,
+        position TEXT NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS strategy_blobs (
+        content_hash TEXT PRIMARY KEY,
+        strategy TEXT NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS strategy_revisions (
+        strategy_id TEXT NOT NULL,
+        revision INTEGER NOT NULL,
+        updated_at TEXT NOT NULL,
+        content_hash TEXT NOT NULL,
+        PRIMARY KEY (strategy_id, revision)
+    ) WITHOUT ROWID
+    """,
+    # Backfill summaries for logs written before the summary tables existed.
+    f"""
+    INSERT OR IGNORE INTO log_summaries (strategy_id, records, first_ts, last_ts, bytes)
+    SELECT
+        strategy_id,
+        COUNT(*),
+        (SELECT ts FROM logs AS f WHERE f.strategy_id = l.strategy_id ORDER BY seq LIMIT 1),
+        (SELECT ts FROM logs AS f WHERE f.strategy_id = l.strategy_id ORDER BY seq DESC LIMIT 1),
+        SUM({_LOG_LINE_BYTES})
+    FROM logs AS l
+    GROUP BY strategy_id
+    """,
+    # Summaries written before version 6 counted payload bytes only.
+    f"""
+    UPDATE log_summaries SET bytes = (
+        SELECT COALESCE(SUM({_LOG_LINE_BYTES}), 0)
+        FROM logs WHERE logs.strategy_id = log_summaries.strategy_id
+    )
+    """,
+    """
+    INSERT OR IGNORE INTO log_days (strategy_id, day, records)
+    SELECT strategy_id, date(ts_us / 1000000, 'unixepoch'), COUNT(*)
+    FROM logs
+    WHERE ts_us <> 0
+    GROUP BY strategy_id, date(ts_us / 1000000, 'unixepoch')
+    """,
+)
+
+
+def _ts_to_us(value: str) -> int:
+    normalized = value[:-1] + "+00:00" if value.endswith("Z") else value
+    try:
+        parsed = datetime.fromisoformat(normalized)
+    except ValueError:
+        return 0
+    if parsed.tzinfo is None:
+        return 0
+    return (parsed - _EPOCH) // timedelta(microseconds=1)
+
+
+def _dt_to_us(value: datetime) -> int:
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def _json_path(field: str) -> str:
+    # Fields are validated dotted paths ([A-Za-z0-9_-] segments), safe to inline as SQL literals
+    # so that queries repeat the exact indexed expression.
+    return "$" + "".join(f'."{part}"' for part in field.split("."))
+
+
+def _field_expression(field: str) -> str:
+    return f"json_extract(payload, '{_json_path(field)}')"
+
+
+def _field_index_name(field: str) -> str:
+    return "logs_payload_" + hashlib.sha1(field.encode("utf-8")).hexdigest()[:16]
+
+
+def _predicate_condition(predicate: LogPredicate) -> str | None:
+    # SQL pre-filter that keeps every row the predicate accepts (json_extract maps JSON strings
+    # and numbers onto TEXT and INTEGER/REAL); rows are re-checked exactly in Python.
+    if predicate.op == "exists" or value_kind(predicate.value) not in ("number", "string"):
+        return None
+    return f"{_field_expression(predicate.field)} {predicate.op} ?"
+
+
+def _row_to_log(row: sqlite3.Row | tuple[Any, ...]) -> dict[str, Any]:
+    log_id, strategy_id, ts, payload = row
+    return {
+        "log_id": log_id,
+        "strategy_id": strategy_id,
+        "ts": ts,
+        "payload": json.loads(payload),
+    }
+
+
+class SqliteBackend:
+    name = "sqlite"
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path if path is not None else store_home() / DATABASE_FILE_NAME
+
+    def _error(self, message: str, exc: sqlite3.Error) -> CliDomainError:
+        if isinstance(exc, sqlite3.OperationalError) and "locked" in str(exc):
+            return CliDomainError(
+                "lock_timeout",
+                f"failed to acquire lock for {self.path}",
+                details={"lock_path": str(self.path)},
+            )
+        return CliDomainError(
+            "storage_error",
+            message,
+            details={"path": str(self.path), "reason": str(exc)},
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as exc:
+            raise CliDomainError(
+                "storage_error",
+                f"failed to create {self.path.parent}",
+                details={"path": str(self.path.parent), "reason": exc.strerror or str(exc)},
+            ) from exc
+        try:
+            connection = sqlite3.connect(
+                self.path, timeout=LOCK_TIMEOUT_SECONDS, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=FULL")
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                connection.execute("BEGIN IMMEDIATE")
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+                connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+                connection.execute("COMMIT")
+        except sqlite3.Error as exc:
+            raise self._error(f"failed to open {self.path}", exc) from exc
+        return connection
+
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connect()
+        try:
+            yield connection
+        except sqlite3.Error as exc:
+            raise self._error(f"failed to read {self.path}", exc) from exc
+        finally:
+            connection.close()
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        except sqlite3.Error as exc:
+            raise self._error(f"failed to write {self.path}", exc) from exc
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _select_record(
+        connection: sqlite3.Connection, strategy_id: str
+    ) -> Mapping[str, Any] | None:
+        row = connection.execute(
+            "SELECT record FROM strategies WHERE strategy_id = ?", (strategy_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    @staticmethod
+    def _upsert_record(connection: sqlite3.Connection, record: Mapping[str, Any]) -> None:
+        connection.execute(
+            "INSERT INTO strategies (strategy_id, revision, updated_at, record) "
+            "VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (strategy_id) DO UPDATE SET "
+            "revision = excluded.revision, updated_at = excluded.updated_at, "
+            "record = excluded.record",
+            (
+                record["strategy_id"],
+                record["revision"],
+                record["updated_at"],
+                json.dumps(record, separators=(",", ":"), sort_keys=False),
+            ),
+        )
+        SqliteBackend._insert_revision(connection, record)
+
+    @staticmethod
+    def _insert_revision(connection: sqlite3.Connection, record: Mapping[str, Any]) -> None:
+        data = revisions.canonical_strategy(record["strategy"])
+        digest = revisions.data_hash(data)
+        connection.execute(
+            "INSERT OR IGNORE INTO strategy_blobs (content_hash, strategy) VALUES (?, ?)",
+            (digest, data.decode("utf-8")),
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO strategy_revisions "
+            "(strategy_id, revision, updated_at, content_hash) VALUES (?, ?, ?, ?)",
+            (record["strategy_id"], record["revision"], record["updated_at"], digest),
+        )
+
+    def strategy_exists(self, strategy_id: str) -> bool:
+        if not self.path.is_file():
+            return False
+        with self._read() as connection:
+            row = connection.execute(
+                "SELECT 1 FROM strategies WHERE strategy_id = ?", (strategy_id,)
+            ).fetchone()
+        return row is not None
+
+    def read_strategy(self, strategy_id: str) -> Mapping[str, Any] | None:
+        if not self.path.is_file():
+            return None
+        with self._read() as connection:
+            return self._select_record(connection, strategy_id)
+
+    def update_strategy(self, strategy_id: str, update: StrategyUpdate) -> Mapping[str, Any]:
+        with self._write() as connection:
+            current = self._select_record(connection, strategy_id)
+            record = update(current)
+            if record is None:
+                assert current is not None
+                return current
+            self._upsert_record(connection, record)
+        discard_compiled(self.compiled_strategy_path(strategy_id))
+        return record
+
+    def put_strategy(self, record: Mapping[str, Any]) -> None:
+        with self._write() as connection:
+            self._upsert_record(connection, record)
+        discard_compiled(self.compiled_strategy_path(str(record["strategy_id"])))
+
+    def put_revision(self, record: Mapping[str, Any]) -> None:
+        with self._write() as connection:
+            self._insert_revision(connection, record)
+
+    def _revision_entries(
+        self, connection: sqlite3.Connection, strategy_id: str
+    ) -> tuple[Mapping[str, Any], list[dict[str, Any]]]:
+        current = self._select_record(connection, strategy_id)
+        if current is None:
+            raise strategy_not_found(strategy_id)
+        rows = connection.execute(
+            "SELECT revision, updated_at, content_hash FROM strategy_revisions "
+            "WHERE strategy_id = ? ORDER BY revision",
+            (strategy_id,),
+        ).fetchall()
+        entries = [
+            {"revision": revision, "updated_at": updated_at, "content_hash": digest}
+            for revision, updated_at, digest in rows
+        ]
+        return current, revisions.merge_current(entries, current)
+
+    def iter_revisions(self, strategy_id: str) -> Iterator[dict[str, Any]]:
+        if not self.path.is_file():
+            raise strategy_not_found(strategy_id)
+        with self._read() as connection:
+            _, entries = self._revision_entries(connection, strategy_id)
+        return iter(entries)
+
+    def read_revision(self, strategy_id: str, revision: int) -> Mapping[str, Any] | None:
+        if not self.path.is_file():
+            raise strategy_not_found(strategy_id)
+        with self._read() as connection:
+            current, entries = self._revision_entries(connection, strategy_id)
+            if current["revision"] == revision:
+                return current
+            entry = next((item for item in entries if item["revision"] == revision), None)
+            if entry is None:
+                return None
+            row = connection.execute(
+                "SELECT strategy FROM strategy_blobs WHERE content_hash = ?",
+                (entry["content_hash"],),
+            ).fetchone()
+        if row is None:
+            return None
+        return revisions.revision_record(strategy_id, entry, json.loads(row[0]))
+
+    def strategy_fingerprint(self, strategy_id: str) -> tuple[Any, ...] | None:
+        if not self.path.is_file():
+            return None
+        with self._read() as connection:
+            row = connection.execute(
+                "SELECT revision, updated_at FROM strategies WHERE strategy_id = ?",
+                (strategy_id,),
+            ).fetchone()
+        return tuple(row) if row is not None else None
+
+    def compiled_strategy_path(self, strategy_id: str) -> Path:
+        return self.path.parent / COMPILED_CACHE_DIR / f"{strategy_id}.compiled"
+
+    def iter_strategies(
+        self, *, prefix: str | None = None, after: str | None = None
+    ) -> Iterator[Mapping[str, Any]]:
+        if not self.path.is_file():
+            return
+        query = "SELECT strategy_id, revision, updated_at FROM strategies"
+        conditions: list[str] = []
+        params: list[Any] = []
+        if prefix:
+            # Range scan on the primary key; ids are ASCII so U+10FFFF sorts after any suffix.
+            conditions.append("strategy_id >= ? AND strategy_id < ?")
+            params.extend([prefix, prefix + "\U0010ffff"])
+        if after is not None:
+            conditions.append("strategy_id > ?")
+            params.append(after)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY strategy_id"
+        with self._read() as connection:
+            for strategy_id, revision, updated_at in connection.execute(query, params):
+                yield {"strategy_id": strategy_id, "revision": revision, "updated_at": updated_at}
+
+    def reindex_strategies(self) -> int:
+        if not self.path.is_file():
+            return 0
+        with self._read() as connection:
+            return connection.execute("SELECT COUNT(*) FROM strategies").fetchone()[0]
+
+    def append_logs(self, strategy_id: str, entries: Sequence[Mapping[str, Any]]) -> None:
+        rows = [
+            (
+                strategy_id,
+                entry["log_id"],
+                entry["ts"],
+                _ts_to_us(entry["ts"]),
+                json.dumps(entry["payload"], separators=(",", ":"), sort_keys=False),
+            )
+            for entry in entries
+        ]
+        days: dict[str, int] = {}
+        for entry in entries:
+            day = log_day(entry["ts"])
+            if day is not None:
+                days[day] = days.get(day, 0) + 1
+        log_bytes = sum(
+            len(json.dumps(entry, separators=(",", ":"), sort_keys=False)) + 1 for entry in entries
+        )
+        with self._write() as connection:
+            if self._select_record(connection, strategy_id) is None:
+                raise strategy_not_found(strategy_id)
+            connection.executemany(
+                "INSERT INTO logs (strategy_id, log_id, ts, ts_us, payload) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            if not rows:
+                return
+            connection.execute(
+                "INSERT INTO log_summaries (strategy_id, records, first_ts, last_ts, bytes) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (strategy_id) DO UPDATE SET "
+                "records = records + excluded.records, last_ts = excluded.last_ts, "
+                "bytes = bytes + excluded.bytes",
+                (strategy_id, len(rows), rows[0][2], rows[-1][2], log_bytes),
+            )
+            connection.executemany(
+                "INSERT INTO log_days (strategy_id, day, records) VALUES (?, ?, ?) "
+                "ON CONFLICT (strategy_id, day) DO UPDATE SET "
+                "records = records + excluded.records",
+                [(strategy_id, day, count) for day, count in days.items()],
+            )
+
+    def _require_strategy(self, connection: sqlite3.Connection, strategy_id: str) -> None:
+        row = connection.execute(
+            "SELECT 1 FROM strategies WHERE strategy_id = ?", (strategy_id,)
+        ).fetchone()
+        if row is None:
+            raise strategy_not_found(strategy_id)
+
+    def iter_logs(
+        self,
+        strategy_id: str,
+        *,
+        from_dt: datetime | None = None,
+        to_dt: datetime | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        if not self.path.is_file():
+            raise strategy_not_found(strategy_id)
+        with self._read() as connection:
+            self._require_strategy(connection, strategy_id)
+
+        query, params = self._logs_query(strategy_id, from_dt=from_dt, to_dt=to_dt)
+        return self._iter_query(query + " ORDER BY seq", params)
+
+    @staticmethod
+    def _logs_query(
+        strategy_id: str, *, from_dt: datetime | None, to_dt: datetime | None
+    ) -> tuple[str, list[Any]]:
+        query = "SELECT log_id, strategy_id, ts, payload FROM logs WHERE strategy_id = ?"
+        params: list[Any] = [strategy_id]
+        if from_dt is not None:
+            query += " AND ts_us >= ?"
+            params.append(_dt_to_us(from_dt))
+        if to_dt is not None:
+            query += " AND ts_us <= ?"
+            params.append(_dt_to_us(to_dt))
+        return query, params
+
+    def query_logs(
+        self,
+        strategy_id: str,
+        predicates: Sequence[LogPredicate],
+        *,
+        from_dt: datetime | None = None,
+        to_dt: datetime | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        if not self.path.is_file():
+            raise strategy_not_found(strategy_id)
+        with self._read() as connection:
+            self._require_strategy(connection, strategy_id)
+
+        query, params = self._logs_query(strategy_id, from_dt=from_dt, to_dt=to_dt)
+        for predicate in predicates:
+            condition = _predicate_condition(predicate)
+            if condition is not None:
+                query += f" AND {condition}"
+                params.append(predicate.value)
+        rows = self._iter_query(query + " ORDER BY seq", params)
+        return (row for row in rows if matches(row["payload"], predicates))
+
+    def log_stats(self, strategy_id: str) -> dict[str, Any]:
+        if not self.path.is_file():
+            raise strategy_not_found(strategy_id)
+        summary = empty_summary()
+        with self._read() as connection:
+            self._require_strategy(connection, strategy_id)
+            row = connection.execute(
+                "SELECT records, first_ts, last_ts, bytes FROM log_summaries WHERE strategy_id = ?",
+                (strategy_id,),
+            ).fetchone()
+            if row is not None:
+                summary.update(zip(("records", "first_ts", "last_ts", "bytes"), row, strict=True))
+            summary["days"] = dict(
+                connection.execute(
+                    "SELECT day, records FROM log_days WHERE strategy_id = ? ORDER BY day",
+                    (strategy_id,),
+                ).fetchall()
+            )
+        return summary
+
+    def list_log_indexes(self, strategy_id: str) -> list[str]:
+        if not self.path.is_file():
+            raise strategy_not_found(strategy_id)
+        with self._read() as connection:
+            self._require_strategy(connection, strategy_id)
+            rows = connection.execute(
+                "SELECT field FROM log_indexes WHERE strategy_id = ? ORDER BY field",
+                (strategy_id,),
+            ).fetchall()
+        return [field for (field,) in rows]
+
+    def create_log_index(self, strategy_id: str, field: str) -> int:
+        # One expression index per field serves every strategy declaring it; log_indexes
+        # records the declarations so the index is dropped with the last one.
+        with self._write() as connection:
+            self._require_strategy(connection, strategy_id)
+            connection.execute(
+                "INSERT OR IGNORE INTO log_indexes (strategy_id, field) VALUES (?, ?)",
+                (strategy_id, field),
+            )
+            connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {_field_index_name(field)} "
+                f"ON logs (strategy_id, {_field_expression(field)})"
+            )
+            return connection.execute(
+                "SELECT COUNT(*) FROM logs WHERE strategy_id = ?", (strategy_id,)
+            ).fetchone()[0]
+
+    def drop_log_index(self, strategy_id: str, field: str) -> bool:
+        with self._write() as connection:
+            self._require_strategy(connection, strategy_id)
+            deleted = connection.execute(
+                "DELETE FROM log_indexes WHERE strategy_id = ? AND field = ?",
+                (strategy_id, field),
+            ).rowcount
+            remaining = connection.execute(
+                "SELECT 1 FROM log_indexes WHERE field = ? LIMIT 1", (field,)
+            ).fetchone()
+            if remaining is None:
+                connection.execute(f"DROP INDEX IF EXISTS {_field_index_name(field)}")
+        return deleted > 0
+
+    def position_snapshot(self, strategy_id: str) -> dict[str, Any]:
+        if not self.path.is_file():
+            raise strategy_not_found(strategy_id)
+        with self._read() as connection:
+            self._require_strategy(connection, strategy_id)
+            checkpoint = connection.execute(
+                "SELECT last_seq, records, position FROM positions WHERE strategy_id = ?",
+                (strategy_id,),
+            ).fetchone()
+            last_seq, records, position = 0, 0, positions.empty_position()
+            if checkpoint is not None:
+                last_seq, records = checkpoint[0], checkpoint[1]
+                position = json.loads(checkpoint[2])
+            start = records
+            for seq, *row in connection.execute(
+                "SELECT seq, log_id, strategy_id, ts, payload FROM logs "
+                "WHERE strategy_id = ? AND seq > ? ORDER BY seq",
+                (strategy_id, last_seq),
+            ):
+                positions.apply_entry(position, _row_to_log(tuple(row)))
+                last_seq, records = seq, records + 1
+        if records > start:
+            # Concurrent readers may race to store a checkpoint; only a newer one replaces it.
+            with self._write() as connection:
+                connection.execute(
+                    "INSERT INTO positions (strategy_id, last_seq, records, position) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT (strategy_id) DO UPDATE SET "
+                    "last_seq = excluded.last_seq, records = excluded.records, "
+                    "position = excluded.position WHERE excluded.last_seq > positions.last_seq",
+                    (strategy_id, last_seq, records, json.dumps(position, separators=(",", ":"))),
+                )
+        return {"records": records, "replayed": records - start, "position": position}
+
+    def _iter_query(self, query: str, params: Sequence[Any]) -> Iterator[dict[str, Any]]:
+        with self._read() as connection:
+            for row in connection.execute(query, params):
+                yield _row_to_log(row)
+
+    def find_log(self, strategy_id: str, log_id: str) -> dict[str, Any] | None:
+        if not self.path.is_file():
+            raise strategy_not_found(strategy_id)
+        with self._read() as connection:
+            self._require_strategy(connection, strategy_id)
+            row = connection.execute(
+                "SELECT log_id, strategy_id, ts, payload FROM logs "
+                "WHERE strategy_id = ? AND log_id = ?",
+                (strategy_id, log_id),
+            ).fetchone()
+        return _row_to_log(row) if row is not None else None
+
+    def tail_logs(self, strategy_id: str, *, limit: int) -> Iterator[dict[str, Any]]:
+        if not self.path.is_file():
+            raise strategy_not_found(strategy_id)
+        with self._read() as connection:
+            self._require_strategy(connection, strategy_id)
+
+        # Find the first seq of the tail, then stream forward from it in append order.
+        return self._iter_query(
+            "SELECT log_id, strategy_id, ts, payload FROM logs WHERE strategy_id = ? "
+            "AND seq >= COALESCE((SELECT seq FROM logs WHERE strategy_id = ? "
+            "ORDER BY seq DESC LIMIT 1 OFFSET ?), 0) ORDER BY seq",
+            (strategy_id, strategy_id, limit - 1),
+        )
+
+    def rotate_logs(self, strategy_id: str) -> dict[str, Any]:
+        raise unsupported_operation(self.name, "log rotation")
+
+    def relayout_strategies(self, layout: str) -> int:
+        raise unsupported_operation(self.name, "store layouts")
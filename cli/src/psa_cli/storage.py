@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol, cast
+
+from psa_cli import timings
+from psa_cli.config import configured_backend_name
+from psa_cli.errors import CliDomainError
+
+if TYPE_CHECKING:
+    from psa_cli.log_query import LogPredicate
+
+# Storage backends own the physical layout only. Business rules (id validation, revision
+# numbering, log envelope construction, ts filtering semantics) live in store.py.
+
+StrategyUpdate = Callable[[Mapping[str, Any] | None], Mapping[str, Any] | None]
+
+
+class StorageBackend(Protocol):
+    name: str
+
+    def strategy_exists(self, strategy_id: str) -> bool: ...
+
+    def read_strategy(self, strategy_id: str) -> Mapping[str, Any] | None: ...
+
+    # Atomically applies `update` to the current record (None when missing).
+    # `update` returns the record to write, or None to keep the current one.
+    def update_strategy(self, strategy_id: str, update: StrategyUpdate) -> Mapping[str, Any]: ...
+
+    def put_strategy(self, record: Mapping[str, Any]) -> None: ...
+
+    # Cheap identity of the stored record (None when missing), used to key compiled sidecars.
+    def strategy_fingerprint(self, strategy_id: str) -> tuple[Any, ...] | None: ...
+
+    def compiled_strategy_path(self, strategy_id: str) -> Path: ...
+
+    # Yields {revision, updated_at, content_hash} for every stored revision, oldest first.
+    def iter_revisions(self, strategy_id: str) -> Iterator[dict[str, Any]]: ...
+
+    # The record of one revision (None when unknown); older revisions come from their blobs.
+    def read_revision(self, strategy_id: str, revision: int) -> Mapping[str, Any] | None: ...
+
+    # Stores one earlier revision record (as returned by read_revision) in the history of an
+    # existing strategy without changing its current record; used by migration and import.
+    def put_revision(self, record: Mapping[str, Any]) -> None: ...
+
+    # Yields {strategy_id, revision, updated_at} summaries ordered by strategy_id,
+    # restricted to ids starting with `prefix` and sorting strictly after `after`.
+    def iter_strategies(
+        self, *, prefix: str | None = None, after: str | None = None
+    ) -> Iterator[Mapping[str, Any]]: ...
+
+    def reindex_strategies(self) -> int: ...
+
+    def relayout_strategies(self, layout: str) -> int: ...
+
+    def append_logs(self, strategy_id: str, entries: Sequence[Mapping[str, Any]]) -> None: ...
+
+    def iter_logs(
+        self,
+        strategy_id: str,
+        *,
+        from_dt: datetime | None = None,
+        to_dt: datetime | None = None,
+    ) -> Iterator[dict[str, Any]]: ...
+
+    # Rows in append order whose payload satisfies every predicate. Declared field indexes
+    # (maintained by append_logs) narrow the rows read; `from_dt`/`to_dt` may prune coarsely.
+    def query_logs(
+        self,
+        strategy_id: str,
+        predicates: Sequence[LogPredicate],
+        *,
+        from_dt: datetime | None = None,
+        to_dt: datetime | None = None,
+    ) -> Iterator[dict[str, Any]]: ...
+
+    # {records, first_ts, last_ts, bytes, days: {YYYY-MM-DD: records}} maintained on append;
+    # `bytes` is the size of the rows as uncompressed NDJSON lines, whatever the backend stores.
+    def log_stats(self, strategy_id: str) -> dict[str, Any]: ...
+
+    def list_log_indexes(self, strategy_id: str) -> list[str]: ...
+
+    # Declares (or rebuilds) the payload index on `field`; returns the number of rows indexed.
+    def create_log_index(self, strategy_id: str, field: str) -> int: ...
+
+    def drop_log_index(self, strategy_id: str, field: str) -> bool: ...
+
+    def find_log(self, strategy_id: str, log_id: str) -> dict[str, Any] | None: ...
+
+    def tail_logs(self, strategy_id: str, *, limit: int) -> Iterator[dict[str, Any]]: ...
+
+    def position_snapshot(self, strategy_id: str) -> dict[str, Any]: ...
+
+    def rotate_logs(self, strategy_id: str) -> dict[str, Any]: ...
+
+
+def strategy_not_found(strategy_id: str) -> CliDomainError:
+    return CliDomainError(
+        "strategy_not_found",
+        f"strategy '{strategy_id}' was not found",
+        details={"strategy_id": strategy_id},
+    )
+
+
+def unsupported_operation(backend: str, operation: str) -> CliDomainError:
+    return CliDomainError(
+        "unsupported_operation",
+        f"storage backend '{backend}' does not support {operation}",
+        details={"backend": backend, "operation": operation},
+    )
+
+
+class _TimedBackend:
+    # Used under `--timings`: every backend call, and every step of an iterator it returns,
+    # is recorded as the store phase.
+    def __init__(self, backend: StorageBackend) -> None:
+        self._backend = backend
+        self.name = backend.name
+
+    def __getattr__(self, attribute: str) -> Any:
+        value = getattr(self._backend, attribute)
+        if not callable(value):
+            return value
+
+        def timed_call(*args: Any, **kwargs: Any) -> Any:
+            with timings.phase("store"):
+                result = value(*args, **kwargs)
+            return timings.timed_iter("store", result) if isinstance(result, Iterator) else result
+
+        return timed_call
+
+
+def _open_backend(backend_name: str) -> StorageBackend:
+    if backend_name == "sqlite":
+        from psa_cli.sqlite_storage import SqliteBackend
+
+        return SqliteBackend()
+
+    from psa_cli.file_storage import FileBackend
+
+    return FileBackend()
+
+
+def get_backend(name: str | None = None) -> StorageBackend:
+    with timings.phase("store"):
+        backend = _open_backend(name or configured_backend_name())
+    if timings.enabled():
+        return cast(StorageBackend, _TimedBackend(backend))
+    return backend
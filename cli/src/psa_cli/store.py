@@ -1,20 +1,24 @@
 from __future__ import annotations
 
-import json
-import os
 import re
-import uuid
-from collections.abc import Mapping
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from datetime import UTC, datetime
-from pathlib import Path
-from typing import Any
-
-from psa_core.contracts import parse_strategy
+from typing import TYPE_CHECKING, Any
 
+from psa_cli.config import config_path, update_config
 from psa_cli.errors import CliDomainError, CliValidationError
-from psa_cli.locks import exclusive_lock
+from psa_cli.log_query import exists_predicate, parse_where, validate_field
+from psa_cli.positions import validate_position_event
+from psa_cli.storage import StorageBackend, get_backend, strategy_not_found
+from psa_cli.strategy_cache import read_compiled, write_compiled
+from psa_cli.timings import phase
+
+if TYPE_CHECKING:
+    from psa_core.types import StrategySpec
 
 STRATEGY_ID_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,127}$")
+MIGRATION_BATCH_SIZE = 1000
+LIST_LOG_STATS_FIELDS = ("records", "first_ts", "last_ts", "bytes")
 
 
 def _utc_now_iso() -> str:
@@ -44,295 +48,276 @@ def _validate_strategy_id(strategy_id: str) -> str:
     return strategy_id
 
 
-def _store_root() -> Path:
-    return Path.cwd() / ".psa" / "strategies"
-
-
-def _strategy_dir(strategy_id: str) -> Path:
-    return _store_root() / strategy_id
-
-
-def _strategy_json_path(strategy_id: str) -> Path:
-    return _strategy_dir(strategy_id) / "strategy.json"
-
-
-def _log_ndjson_path(strategy_id: str) -> Path:
-    return _strategy_dir(strategy_id) / "log.ndjson"
-
-
-def _lock_path(strategy_id: str) -> Path:
-    return _strategy_dir(strategy_id) / ".lock"
-
-
-def _strategy_not_found(strategy_id: str) -> CliDomainError:
-    return CliDomainError(
-        "strategy_not_found",
-        f"strategy '{strategy_id}' was not found",
-        details={"strategy_id": strategy_id},
-    )
-
-
-def _read_json_file(path: Path) -> Mapping[str, Any]:
-    try:
-        text = path.read_text(encoding="utf-8")
-    except OSError as exc:
-        raise CliDomainError(
-            "storage_error",
-            f"failed to read {path}",
-            details={"path": str(path), "reason": exc.strerror or str(exc)},
-        ) from exc
-
-    try:
-        payload = json.loads(text)
-    except json.JSONDecodeError as exc:
-        raise CliDomainError(
-            "storage_corrupted",
-            f"file is not valid JSON: {path}",
-            details={"path": str(path), "reason": exc.msg},
-        ) from exc
-
-    return _ensure_mapping(payload, name=str(path))
-
-
-def _write_atomic_json(path: Path, payload: Mapping[str, Any]) -> None:
-    tmp_path = path.parent / f".{path.name}.{uuid.uuid4().hex}.tmp"
-    text = json.dumps(payload, separators=(",", ":"), sort_keys=False) + "\n"
-    try:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with tmp_path.open("w", encoding="utf-8") as handle:
-            handle.write(text)
-            handle.flush()
-            os.fsync(handle.fileno())
-        os.replace(tmp_path, path)
-    except OSError as exc:
-        raise CliDomainError(
-            "storage_error",
-            f"failed to write {path}",
-            details={"path": str(path), "reason": exc.strerror or str(exc)},
-        ) from exc
-    finally:
-        if tmp_path.exists():
-            try:
-                tmp_path.unlink()
-            except OSError:
-                pass
-
-
-def _load_strategy_record(strategy_id: str) -> Mapping[str, Any]:
-    path = _strategy_json_path(strategy_id)
-    if not path.is_file():
-        raise _strategy_not_found(strategy_id)
-    return _read_json_file(path)
-
-
-def _load_logs(strategy_id: str) -> list[dict[str, Any]]:
-    _load_strategy_record(strategy_id)
-    log_path = _log_ndjson_path(strategy_id)
-    if not log_path.is_file():
-        return []
-
-    rows: list[dict[str, Any]] = []
-    try:
-        lines = log_path.read_text(encoding="utf-8").splitlines()
-    except OSError as exc:
-        raise CliDomainError(
-            "storage_error",
-            f"failed to read {log_path}",
-            details={"path": str(log_path), "reason": exc.strerror or str(exc)},
-        ) from exc
-
-    for idx, line in enumerate(lines):
-        if not line.strip():
-            continue
-        try:
-            payload = json.loads(line)
-        except json.JSONDecodeError as exc:
-            raise CliDomainError(
-                "storage_corrupted",
-                f"log line {idx + 1} is not valid JSON",
-                details={"path": str(log_path), "line": idx + 1, "reason": exc.msg},
-            ) from exc
-        if not isinstance(payload, dict):
-            raise CliDomainError(
-                "storage_corrupted",
-                f"log line {idx + 1} must be a JSON object",
-                details={"path": str(log_path), "line": idx + 1},
-            )
-        rows.append(payload)
-    return rows
+def _load_strategy_record(backend: StorageBackend, strategy_id: str) -> Mapping[str, Any]:
+    record = backend.read_strategy(strategy_id)
+    if record is None:
+        raise strategy_not_found(strategy_id)
+    return record
 
 
 def upsert_strategy(strategy_id: str, payload: Any) -> dict[str, Any]:
     _validate_strategy_id(strategy_id)
+    from psa_core.contracts import parse_strategy
+
     strategy_payload = dict(_ensure_mapping(payload, name="strategy"))
     parse_strategy(strategy_payload)
 
-    path = _strategy_json_path(strategy_id)
-    with exclusive_lock(_lock_path(strategy_id)):
+    outcome = {"result": "created"}
+
+    def build_record(current: Mapping[str, Any] | None) -> Mapping[str, Any] | None:
         now = _utc_now_iso()
-        if path.is_file():
-            current = _load_strategy_record(strategy_id)
-            previous_strategy = current.get("strategy")
-            previous_revision = current.get("revision")
-            previous_updated_at = current.get("updated_at")
-
-            if not isinstance(previous_revision, int) or previous_revision < 1:
-                raise CliDomainError(
-                    "storage_corrupted",
-                    "strategy revision must be a positive integer",
-                    details={"strategy_id": strategy_id, "path": str(path)},
-                )
-            if not isinstance(previous_updated_at, str):
-                raise CliDomainError(
-                    "storage_corrupted",
-                    "strategy updated_at must be a string",
-                    details={"strategy_id": strategy_id, "path": str(path)},
-                )
-
-            if previous_strategy == strategy_payload:
-                return {
-                    "strategy_id": strategy_id,
-                    "result": "updated",
-                    "revision": previous_revision,
-                    "updated_at": previous_updated_at,
-                }
-
-            record = {
+        if current is None:
+            return {
                 "strategy_id": strategy_id,
-                "revision": previous_revision + 1,
+                "revision": 1,
                 "updated_at": now,
                 "strategy": strategy_payload,
             }
-            _write_atomic_json(path, record)
-            return {
-                "strategy_id": strategy_id,
-                "result": "updated",
-                "revision": record["revision"],
-                "updated_at": record["updated_at"],
-            }
 
-        record = {
-            "strategy_id": strategy_id,
-            "revision": 1,
-            "updated_at": now,
-            "strategy": strategy_payload,
-        }
-        _write_atomic_json(path, record)
+        outcome["result"] = "updated"
+        previous_revision = current.get("revision")
+        previous_updated_at = current.get("updated_at")
+        if not isinstance(previous_revision, int) or previous_revision < 1:
+            raise CliDomainError(
+                "storage_corrupted",
+                "strategy revision must be a positive integer",
+                details={"strategy_id": strategy_id},
+            )
+        if not isinstance(previous_updated_at, str):
+            raise CliDomainError(
+                "storage_corrupted",
+                "strategy updated_at must be a string",
+                details={"strategy_id": strategy_id},
+            )
+        if current.get("strategy") == strategy_payload:
+            return None
         return {
             "strategy_id": strategy_id,
-            "result": "created",
-            "revision": 1,
+            "revision": previous_revision + 1,
             "updated_at": now,
+            "strategy": strategy_payload,
         }
 
+    record = get_backend().update_strategy(strategy_id, build_record)
+    return {
+        "strategy_id": strategy_id,
+        "result": outcome["result"],
+        "revision": record["revision"],
+        "updated_at": record["updated_at"],
+    }
+
 
-def list_strategies() -> list[dict[str, Any]]:
-    root = _store_root()
-    if not root.exists():
-        return []
-    if not root.is_dir():
+def _strategy_summary(record: Mapping[str, Any]) -> dict[str, Any]:
+    strategy_id = record.get("strategy_id")
+    revision = record.get("revision")
+    updated_at = record.get("updated_at")
+    if not isinstance(strategy_id, str):
         raise CliDomainError(
-            "storage_error",
-            "strategy storage root is not a directory",
-            details={"path": str(root)},
+            "storage_corrupted",
+            "strategy_id must be a string",
+            details={"strategy_id": strategy_id},
         )
+    if not isinstance(revision, int):
+        raise CliDomainError(
+            "storage_corrupted",
+            "revision must be an integer",
+            details={"strategy_id": strategy_id},
+        )
+    if not isinstance(updated_at, str):
+        raise CliDomainError(
+            "storage_corrupted",
+            "updated_at must be a string",
+            details={"strategy_id": strategy_id},
+        )
+    return {
+        "strategy_id": strategy_id,
+        "revision": revision,
+        "updated_at": updated_at,
+    }
 
-    try:
-        strategy_dirs = sorted(path for path in root.iterdir() if path.is_dir())
-    except OSError as exc:
+
+def list_strategies(
+    *,
+    prefix: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+    with_log_stats: bool = False,
+) -> dict[str, Any]:
+    if limit is not None and limit < 1:
+        raise CliValidationError("limit must be >= 1")
+    if cursor is not None and not STRATEGY_ID_RE.match(cursor):
+        raise CliValidationError("cursor must be a strategy_id returned as next_cursor")
+
+    backend = get_backend()
+    strategies: list[dict[str, Any]] = []
+    next_cursor: str | None = None
+    for record in backend.iter_strategies(prefix=prefix, after=cursor):
+        if limit is not None and len(strategies) >= limit:
+            next_cursor = strategies[-1]["strategy_id"]
+            break
+        strategies.append(_strategy_summary(record))
+    if with_log_stats:
+        for summary in strategies:
+            stats = backend.log_stats(summary["strategy_id"])
+            summary["log_stats"] = {key: stats[key] for key in LIST_LOG_STATS_FIELDS}
+    return {"strategies": strategies, "next_cursor": next_cursor}
+
+
+def reindex_strategies() -> dict[str, Any]:
+    backend = get_backend()
+    return {"backend": backend.name, "strategies": backend.reindex_strategies()}
+
+
+def _load_revision(backend: StorageBackend, strategy_id: str, revision: int) -> Mapping[str, Any]:
+    record = backend.read_revision(strategy_id, revision)
+    if record is None:
         raise CliDomainError(
-            "storage_error",
-            f"failed to list strategy storage root {root}",
-            details={"path": str(root), "reason": exc.strerror or str(exc)},
-        ) from exc
-
-    rows: list[dict[str, Any]] = []
-    for strategy_dir in strategy_dirs:
-        path = strategy_dir / "strategy.json"
-        if not path.is_file():
-            continue
-        record = _read_json_file(path)
-        strategy_id = record.get("strategy_id")
-        revision = record.get("revision")
-        updated_at = record.get("updated_at")
-        if not isinstance(strategy_id, str):
-            raise CliDomainError(
-                "storage_corrupted",
-                "strategy_id must be a string",
-                details={"path": str(path)},
-            )
-        if not isinstance(revision, int):
-            raise CliDomainError(
-                "storage_corrupted",
-                "revision must be an integer",
-                details={"path": str(path)},
-            )
-        if not isinstance(updated_at, str):
-            raise CliDomainError(
-                "storage_corrupted",
-                "updated_at must be a string",
-                details={"path": str(path)},
-            )
-        rows.append(
-            {
-                "strategy_id": strategy_id,
-                "revision": revision,
-                "updated_at": updated_at,
-            }
+            "revision_not_found",
+            f"strategy '{strategy_id}' has no revision {revision}",
+            details={"strategy_id": strategy_id, "revision": revision},
         )
-    return rows
+    return record
+
+
+def iter_earlier_revisions(
+    backend: StorageBackend, record: Mapping[str, Any]
+) -> Iterator[Mapping[str, Any]]:
+    # Revision records before the current one, oldest first, for copying a strategy's history
+    # into another store. Revisions whose payload blob is missing cannot be carried over.
+    strategy_id = str(record["strategy_id"])
+    for entry in backend.iter_revisions(strategy_id):
+        if entry["revision"] == record["revision"]:
+            continue
+        earlier = backend.read_revision(strategy_id, entry["revision"])
+        if earlier is not None:
+            yield earlier
 
 
-def show_strategy(strategy_id: str) -> dict[str, Any]:
+def show_strategy(strategy_id: str, *, revision: int | None = None) -> dict[str, Any]:
     _validate_strategy_id(strategy_id)
-    record = dict(_load_strategy_record(strategy_id))
+    backend = get_backend()
+    if revision is None:
+        record = dict(_load_strategy_record(backend, strategy_id))
+    else:
+        record = dict(_load_revision(backend, strategy_id, revision))
     record_strategy = record.get("strategy")
     _ensure_mapping(record_strategy, name="strategy")
     return record
 
 
+def strategy_history(strategy_id: str) -> dict[str, Any]:
+    _validate_strategy_id(strategy_id)
+    return {
+        "strategy_id": strategy_id,
+        "revisions": list(get_backend().iter_revisions(strategy_id)),
+    }
+
+
+def diff_strategy(
+    strategy_id: str, *, from_revision: int | None = None, to_revision: int | None = None
+) -> dict[str, Any]:
+    # Defaults compare the current revision with the one before it.
+    _validate_strategy_id(strategy_id)
+    from psa_core.contracts import parse_strategy, strategy_diff_to_dict
+    from psa_core.diff import diff_strategies
+
+    from psa_cli.revisions import content_hash
+
+    backend = get_backend()
+    if to_revision is None:
+        to_revision = int(_load_strategy_record(backend, strategy_id)["revision"])
+    if from_revision is None:
+        from_revision = max(to_revision - 1, 1)
+    sides = []
+    for revision in (from_revision, to_revision):
+        record = _load_revision(backend, strategy_id, revision)
+        payload = _ensure_mapping(record.get("strategy"), name="strategy")
+        sides.append(
+            ({"revision": revision, "content_hash": content_hash(payload)}, parse_strategy(payload))
+        )
+    (old_side, old_spec), (new_side, new_spec) = sides
+    return {
+        "strategy_id": strategy_id,
+        "from": old_side,
+        "to": new_side,
+        **strategy_diff_to_dict(diff_strategies(old_spec, new_spec)),
+    }
+
+
 def strategy_exists(strategy_id: str) -> bool:
     _validate_strategy_id(strategy_id)
-    return _strategy_json_path(strategy_id).is_file()
+    return get_backend().strategy_exists(strategy_id)
 
 
 def load_strategy_payload(strategy_id: str) -> Mapping[str, Any]:
     _validate_strategy_id(strategy_id)
-    record = _load_strategy_record(strategy_id)
+    record = _load_strategy_record(get_backend(), strategy_id)
     strategy_payload = record.get("strategy")
     return _ensure_mapping(strategy_payload, name="strategy")
 
 
-def append_log(strategy_id: str, payload: Any) -> dict[str, Any]:
+def load_strategy_spec(strategy_id: str) -> StrategySpec:
     _validate_strategy_id(strategy_id)
-    log_payload = dict(_ensure_mapping(payload, name="log payload"))
-    ts = _utc_now_iso()
-    log_id = uuid.uuid4().hex
-    entry = {
-        "log_id": log_id,
+    backend = get_backend()
+    fingerprint = backend.strategy_fingerprint(strategy_id)
+    if fingerprint is None:
+        raise strategy_not_found(strategy_id)
+    compiled_path = backend.compiled_strategy_path(strategy_id)
+    with phase("store"):
+        spec = read_compiled(compiled_path, fingerprint)
+    if spec is None:
+        from psa_core.contracts import parse_strategy
+
+        record = _load_strategy_record(backend, strategy_id)
+        spec = parse_strategy(_ensure_mapping(record.get("strategy"), name="strategy"))
+        with phase("store"):
+            write_compiled(compiled_path, fingerprint, spec)
+    return spec
+
+
+def _log_entry(strategy_id: str, payload: Mapping[str, Any], *, name: str) -> dict[str, Any]:
+    import uuid  # only log appends need it, and it is slow to import
+
+    validate_position_event(payload, name=name)
+    return {
+        "log_id": uuid.uuid4().hex,
         "strategy_id": strategy_id,
-        "ts": ts,
-        "payload": log_payload,
+        "ts": _utc_now_iso(),
+        "payload": dict(payload),
     }
-    serialized = json.dumps(entry, separators=(",", ":"), sort_keys=False) + "\n"
 
-    with exclusive_lock(_lock_path(strategy_id)):
-        _load_strategy_record(strategy_id)
-        log_path = _log_ndjson_path(strategy_id)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            with log_path.open("a", encoding="utf-8") as handle:
-                handle.write(serialized)
-                handle.flush()
-                os.fsync(handle.fileno())
-        except OSError as exc:
-            raise CliDomainError(
-                "storage_error",
-                f"failed to append log record for strategy '{strategy_id}'",
-                details={"path": str(log_path), "reason": exc.strerror or str(exc)},
-            ) from exc
 
-    return {"log_id": log_id, "strategy_id": strategy_id, "ts": ts}
+def append_log(strategy_id: str, payload: Any) -> dict[str, Any]:
+    _validate_strategy_id(strategy_id)
+    entry = _log_entry(
+        strategy_id, _ensure_mapping(payload, name="log payload"), name="log payload"
+    )
+    get_backend().append_logs(strategy_id, [entry])
+    return {"log_id": entry["log_id"], "strategy_id": strategy_id, "ts": entry["ts"]}
+
+
+def append_logs(strategy_id: str, payloads: Sequence[Any]) -> list[dict[str, Any]]:
+    _validate_strategy_id(strategy_id)
+    if len(payloads) == 0:
+        raise CliValidationError("log batch must contain at least one record")
+    entries = [
+        _log_entry(
+            strategy_id,
+            _ensure_mapping(payload, name=f"log payload[{idx}]"),
+            name=f"log payload[{idx}]",
+        )
+        for idx, payload in enumerate(payloads)
+    ]
+    get_backend().append_logs(strategy_id, entries)
+    return [
+        {"log_id": entry["log_id"], "strategy_id": strategy_id, "ts": entry["ts"]}
+        for entry in entries
+    ]
+
+
+def rotate_logs(strategy_id: str) -> dict[str, Any]:
+    _validate_strategy_id(strategy_id)
+    return get_backend().rotate_logs(strategy_id)
 
 
 def list_logs(
@@ -342,16 +327,79 @@ def list_logs(
     from_ts: str | None = None,
     to_ts: str | None = None,
 ) -> list[dict[str, Any]]:
+    return list(iter_logs(strategy_id, limit=limit, from_ts=from_ts, to_ts=to_ts))
+
+
+def iter_logs(
+    strategy_id: str,
+    *,
+    limit: int | None = None,
+    from_ts: str | None = None,
+    to_ts: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    # Arguments and strategy existence are checked eagerly; rows are read as they are consumed.
     _validate_strategy_id(strategy_id)
     if limit is not None and limit < 1:
         raise CliValidationError("limit must be >= 1")
+    from_dt, to_dt = _parse_ts_bounds(from_ts, to_ts)
+    rows = get_backend().iter_logs(strategy_id, from_dt=from_dt, to_dt=to_dt)
+    return _filter_logs(strategy_id, rows, from_dt=from_dt, to_dt=to_dt, limit=limit)
+
+
+def query_logs(
+    strategy_id: str,
+    *,
+    where: Sequence[str] = (),
+    has: Sequence[str] = (),
+    limit: int | None = None,
+    from_ts: str | None = None,
+    to_ts: str | None = None,
+) -> list[dict[str, Any]]:
+    return list(
+        iter_queried_logs(
+            strategy_id, where=where, has=has, limit=limit, from_ts=from_ts, to_ts=to_ts
+        )
+    )
+
+
+def iter_queried_logs(
+    strategy_id: str,
+    *,
+    where: Sequence[str] = (),
+    has: Sequence[str] = (),
+    limit: int | None = None,
+    from_ts: str | None = None,
+    to_ts: str | None = None,
+) -> Iterator[dict[str, Any]]:
+    _validate_strategy_id(strategy_id)
+    if limit is not None and limit < 1:
+        raise CliValidationError("limit must be >= 1")
+    predicates = [parse_where(expression) for expression in where]
+    predicates.extend(exists_predicate(field) for field in has)
+    from_dt, to_dt = _parse_ts_bounds(from_ts, to_ts)
+    rows = get_backend().query_logs(strategy_id, predicates, from_dt=from_dt, to_dt=to_dt)
+    return _filter_logs(strategy_id, rows, from_dt=from_dt, to_dt=to_dt, limit=limit)
+
+
+def _parse_ts_bounds(
+    from_ts: str | None, to_ts: str | None
+) -> tuple[datetime | None, datetime | None]:
     from_dt = _parse_iso_datetime(from_ts, field_name="from_ts") if from_ts else None
     to_dt = _parse_iso_datetime(to_ts, field_name="to_ts") if to_ts else None
     if from_dt and to_dt and from_dt > to_dt:
         raise CliValidationError("from_ts must be <= to_ts")
+    return from_dt, to_dt
 
-    rows = _load_logs(strategy_id)
-    filtered: list[dict[str, Any]] = []
+
+def _filter_logs(
+    strategy_id: str,
+    rows: Iterable[dict[str, Any]],
+    *,
+    from_dt: datetime | None,
+    to_dt: datetime | None,
+    limit: int | None,
+) -> Iterator[dict[str, Any]]:
+    returned = 0
     for row in rows:
         ts = row.get("ts")
         if not isinstance(ts, str):
@@ -372,33 +420,121 @@ def list_logs(
             continue
         if to_dt and ts_dt > to_dt:
             continue
-        filtered.append(row)
+        yield row
+        returned += 1
+        if limit is not None and returned >= limit:
+            return
 
-    if limit is not None:
-        return filtered[:limit]
-    return filtered
+
+def log_stats(strategy_id: str) -> dict[str, Any]:
+    _validate_strategy_id(strategy_id)
+    return {"strategy_id": strategy_id, **get_backend().log_stats(strategy_id)}
+
+
+def list_log_indexes(strategy_id: str) -> dict[str, Any]:
+    _validate_strategy_id(strategy_id)
+    return {"strategy_id": strategy_id, "fields": get_backend().list_log_indexes(strategy_id)}
+
+
+def create_log_index(strategy_id: str, field: str) -> dict[str, Any]:
+    _validate_strategy_id(strategy_id)
+    validate_field(field)
+    rows = get_backend().create_log_index(strategy_id, field)
+    return {"strategy_id": strategy_id, "field": field, "rows": rows}
+
+
+def drop_log_index(strategy_id: str, field: str) -> dict[str, Any]:
+    _validate_strategy_id(strategy_id)
+    validate_field(field)
+    dropped = get_backend().drop_log_index(strategy_id, field)
+    return {"strategy_id": strategy_id, "field": field, "dropped": dropped}
 
 
 def tail_logs(strategy_id: str, *, limit: int) -> list[dict[str, Any]]:
+    return list(iter_tail_logs(strategy_id, limit=limit))
+
+
+def iter_tail_logs(strategy_id: str, *, limit: int) -> Iterator[dict[str, Any]]:
     _validate_strategy_id(strategy_id)
     if limit < 1:
         raise CliValidationError("limit must be >= 1")
-    rows = _load_logs(strategy_id)
-    if len(rows) <= limit:
-        return rows
-    return rows[-limit:]
+    return get_backend().tail_logs(strategy_id, limit=limit)
+
+
+def show_position(strategy_id: str) -> dict[str, Any]:
+    _validate_strategy_id(strategy_id)
+    return {"strategy_id": strategy_id, **get_backend().position_snapshot(strategy_id)}
 
 
 def show_log(strategy_id: str, *, log_id: str) -> dict[str, Any]:
     _validate_strategy_id(strategy_id)
     if not log_id:
         raise CliValidationError("log_id must be non-empty")
-    rows = _load_logs(strategy_id)
-    for row in rows:
-        if row.get("log_id") == log_id:
-            return row
+    row = get_backend().find_log(strategy_id, log_id)
+    if row is not None:
+        return row
     raise CliDomainError(
         "log_not_found",
         f"log '{log_id}' was not found for strategy '{strategy_id}'",
         details={"strategy_id": strategy_id, "log_id": log_id},
     )
+
+
+def relayout_store(layout: str) -> dict[str, Any]:
+    backend = get_backend()
+    moved = backend.relayout_strategies(layout)
+    update_config({"layout": layout})
+    return {
+        "backend": backend.name,
+        "layout": layout,
+        "moved": moved,
+        "config_path": str(config_path()),
+    }
+
+
+def migrate_store(target_backend: str) -> dict[str, Any]:
+    source = get_backend()
+    if source.name == target_backend:
+        raise CliValidationError(f"store already uses backend '{target_backend}'")
+    target = get_backend(target_backend)
+    if next(iter(target.iter_strategies()), None) is not None:
+        raise CliDomainError(
+            "migration_target_not_empty",
+            f"target backend '{target_backend}' already contains strategies",
+            details={"backend": target_backend},
+        )
+
+    strategy_count = 0
+    revision_count = 0
+    log_count = 0
+    for summary in source.iter_strategies():
+        strategy_id = str(summary["strategy_id"])
+        record = _load_strategy_record(source, strategy_id)
+        target.put_strategy(record)
+        strategy_count += 1
+        for earlier in iter_earlier_revisions(source, record):
+            target.put_revision(earlier)
+            revision_count += 1
+
+        batch: list[dict[str, Any]] = []
+        for row in source.iter_logs(strategy_id):
+            batch.append(row)
+            if len(batch) >= MIGRATION_BATCH_SIZE:
+                target.append_logs(strategy_id, batch)
+                log_count += len(batch)
+                batch = []
+        if batch:
+            target.append_logs(strategy_id, batch)
+            log_count += len(batch)
+        for field in source.list_log_indexes(strategy_id):
+            target.create_log_index(strategy_id, field)
+
+    update_config({"backend": target_backend})
+    return {
+        "source_backend": source.name,
+        "target_backend": target_backend,
+        "strategies": strategy_count,
+        "revisions": revision_count,
+        "logs": log_count,
+        "config_path": str(config_path()),
+    }
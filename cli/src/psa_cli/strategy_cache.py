@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import marshal
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from psa_core.types import StrategySpec
+
+# Compiled strategy sidecars let evaluate commands skip JSON parsing and strategy validation.
+# A sidecar stores the parsed StrategySpec as plain tuples (marshal) next to the fingerprint
+# of the stored record it was compiled from; any fingerprint change is a cache miss.
+# Sidecars are best-effort: unreadable or stale files are ignored and rewritten.
+
+CACHE_FORMAT_VERSION = 1
+COMPILED_FILE_NAME = "strategy.compiled"
+
+
+def _encode(spec: StrategySpec) -> tuple[Any, ...]:
+    return (
+        spec.market_mode,
+        tuple(
+            (segment.price_low, segment.price_high, segment.weight)
+            for segment in spec.price_segments
+        ),
+        tuple(
+            (segment.start_ts, segment.end_ts, segment.k_start, segment.k_end)
+            for segment in spec.time_segments
+        ),
+    )
+
+
+def _decode(value: tuple[Any, ...]) -> StrategySpec:
+    from psa_core.types import PriceSegment, StrategySpec, TimeSegment
+
+    market_mode, price_segments, time_segments = value
+    return StrategySpec(
+        market_mode=market_mode,
+        price_segments=tuple(PriceSegment(*segment) for segment in price_segments),
+        time_segments=tuple(TimeSegment(*segment) for segment in time_segments),
+    )
+
+
+def read_compiled(path: Path, fingerprint: tuple[Any, ...]) -> StrategySpec | None:
+    try:
+        version, cached_fingerprint, encoded = marshal.loads(path.read_bytes())
+        if version != CACHE_FORMAT_VERSION or cached_fingerprint != fingerprint:
+            return None
+        return _decode(encoded)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def write_compiled(path: Path, fingerprint: tuple[Any, ...], spec: StrategySpec) -> None:
+    data = marshal.dumps((CACHE_FORMAT_VERSION, fingerprint, _encode(spec)))
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+
+
+def discard_compiled(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass
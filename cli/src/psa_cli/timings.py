@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, nullcontext
+from typing import Any, TypeVar
+
+# Phase timings for `psa --timings`. Phases are exclusive: entering a phase pauses the
+# enclosing one, so lock waits inside store calls are not counted as store time and the phases
+# add up to `total_ms`. Time not claimed by another phase (handler logic, psa_core evaluation)
+# is `compute`. Recording is off, and `phase` is a no-op, unless `enable` was called.
+
+PHASES = ("parse", "input", "validate", "store", "lock_wait", "compute", "output")
+ROOT_PHASE = "compute"
+
+T = TypeVar("T")
+
+
+class _PhaseClock:
+    __slots__ = ("enabled", "started_at", "since", "stack", "totals")
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.started_at = 0.0
+        self.since = 0.0
+        self.stack: list[str] = []
+        self.totals: dict[str, float] = {}
+
+    def flush(self) -> None:
+        now = time.perf_counter()
+        current = self.stack[-1]
+        self.totals[current] = self.totals.get(current, 0.0) + (now - self.since)
+        self.since = now
+
+    def switch(self, name: str | None) -> None:
+        self.flush()
+        if name is None:
+            self.stack.pop()
+        else:
+            self.stack.append(name)
+
+
+_clock = _PhaseClock()
+_NO_PHASE = nullcontext()
+
+
+class _Phase:
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> None:
+        _clock.switch(self.name)
+
+    def __exit__(self, *exc_info: object) -> None:
+        _clock.switch(None)
+
+
+def enable(started_at: float) -> None:
+    # Time since `started_at` (before argument parsing) is recorded as the parse phase.
+    now = time.perf_counter()
+    _clock.enabled = True
+    _clock.started_at = started_at
+    _clock.since = now
+    _clock.stack = [ROOT_PHASE]
+    _clock.totals = {"parse": now - started_at}
+
+
+def enabled() -> bool:
+    return _clock.enabled
+
+
+def disable() -> None:
+    _clock.enabled = False
+    _clock.stack = []
+    _clock.totals = {}
+
+
+def phase(name: str) -> AbstractContextManager[None]:
+    return _Phase(name) if _clock.enabled else _NO_PHASE
+
+
+def timed_iter(name: str, items: Iterator[T]) -> Iterator[T]:
+    if not _clock.enabled:
+        return items
+    return _timed_items(name, items)
+
+
+def _timed_items(name: str, items: Iterator[T]) -> Iterator[T]:
+    while True:
+        with _Phase(name):
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+        yield item
+
+
+def phase_timings() -> dict[str, Any]:
+    if _clock.stack:
+        _clock.flush()
+    total = _clock.since - _clock.started_at
+    phases = {name: round(_clock.totals.get(name, 0.0) * 1000.0, 3) for name in PHASES}
+    return {"total_ms": round(total * 1000.0, 3), "phases": phases}
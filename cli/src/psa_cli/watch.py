@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from psa_core.contracts import parse_observation_row, row_to_dict
+from psa_core.engine import iter_evaluate_rows, target_asset_amount
+from psa_core.types import EvaluationRow, ObservationRow
+
+from psa_cli import timings
+from psa_cli.errors import CliValidationError
+from psa_cli.io_stream import follow_ndjson_records
+from psa_cli.schema import validate_request_item
+from psa_cli.store import load_strategy_spec
+
+# `psa watch`: one long-running process evaluates a followed NDJSON price feed against a stored
+# strategy that is loaded and validated once. A record is emitted for the first observation and
+# then only when target_share, or with holdings the rebalance delta (asset_amount_delta), has
+# moved by more than its threshold since the last emitted record. Comparing with the last
+# emitted record rather than the previous tick means slow drift is still reported.
+
+HOLDINGS_COLUMNS = ("target_asset_amount", "asset_amount_delta", "usd_delta")
+
+
+@dataclass(frozen=True, slots=True)
+class Holdings:
+    usd_amount: float
+    asset_amount: float
+
+
+def extra_columns(holdings: Holdings | None) -> tuple[str, ...]:
+    # Columns added to each evaluated row.
+    return (*(HOLDINGS_COLUMNS if holdings is not None else ()), "skipped")
+
+
+def _non_negative(value: float, *, name: str) -> float:
+    if not math.isfinite(value) or value < 0:
+        raise CliValidationError(f"{name} must be a finite number >= 0")
+    return value
+
+
+def _record(row: EvaluationRow, holdings: Holdings | None) -> dict[str, Any]:
+    record = row_to_dict(row)
+    if holdings is not None:
+        target = target_asset_amount(
+            row.target_share,
+            price=row.price,
+            usd_amount=holdings.usd_amount,
+            asset_amount=holdings.asset_amount,
+        )
+        delta = target - holdings.asset_amount
+        record["target_asset_amount"] = target
+        record["asset_amount_delta"] = delta
+        record["usd_delta"] = -delta * row.price
+    return record
+
+
+def _changed(
+    last: Mapping[str, Any],
+    record: Mapping[str, Any],
+    *,
+    share_threshold: float,
+    delta_threshold: float,
+) -> bool:
+    if abs(record["target_share"] - last["target_share"]) > share_threshold:
+        return True
+    if "asset_amount_delta" in record:
+        return abs(record["asset_amount_delta"] - last["asset_amount_delta"]) > delta_threshold
+    return False
+
+
+def _iter_changes(
+    rows: Iterable[EvaluationRow],
+    *,
+    holdings: Holdings | None,
+    share_threshold: float,
+    delta_threshold: float,
+) -> Iterator[dict[str, Any]]:
+    last: dict[str, Any] | None = None
+    skipped = 0
+    try:
+        for row in rows:
+            record = _record(row, holdings)
+            if last is not None and not _changed(
+                last, record, share_threshold=share_threshold, delta_threshold=delta_threshold
+            ):
+                skipped += 1
+                continue
+            record["skipped"] = skipped
+            skipped = 0
+            last = record
+            yield record
+    except KeyboardInterrupt:
+        return  # Ctrl-C ends the watch like the end of the feed
+
+
+def iter_watch(
+    strategy_id: str,
+    feed_path: str,
+    *,
+    holdings: Holdings | None,
+    share_threshold: float,
+    delta_threshold: float,
+    poll_seconds: float,
+    idle_timeout: float | None,
+) -> Iterator[dict[str, Any]]:
+    # Arguments, the strategy and the feed are checked before the first record is read.
+    _non_negative(share_threshold, name="--share-threshold")
+    _non_negative(delta_threshold, name="--delta-threshold")
+    _non_negative(poll_seconds, name="--poll-interval")
+    if idle_timeout is not None:
+        _non_negative(idle_timeout, name="--idle-timeout")
+    if holdings is not None:
+        _non_negative(holdings.usd_amount, name="--usd-amount")
+        _non_negative(holdings.asset_amount, name="--asset-amount")
+    strategy = load_strategy_spec(strategy_id)
+    records = follow_ndjson_records(feed_path, poll_seconds=poll_seconds, idle_timeout=idle_timeout)
+
+    def observations() -> Iterator[ObservationRow]:
+        for line, item in timings.timed_iter("input", records):
+            with timings.phase("validate"):
+                validate_request_item("watch", item, line=line)
+            yield parse_observation_row(item)
+
+    return _iter_changes(
+        iter_evaluate_rows(strategy, observations()),
+        holdings=holdings,
+        share_threshold=share_threshold,
+        delta_threshold=delta_threshold,
+    )
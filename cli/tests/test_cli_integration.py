@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import os
+import pstats
 import subprocess
 import sys
 from pathlib import Path
@@ -111,6 +112,63 @@ def test_strategy_list_multiple(tmp_path: Path) -> None:
     payload = json.loads(listed.stdout)
     ids = [item["strategy_id"] for item in payload["strategies"]]
     assert ids == ["s1", "s2"]
+    assert payload["next_cursor"] is None
+
+    paged = _run_cli(["strategy", "list", "--limit", "1", "--json"], cwd=tmp_path)
+    assert paged.returncode == 0, paged.stderr
+    assert json.loads(paged.stdout) == {
+        "strategies": payload["strategies"][:1],
+        "next_cursor": "s1",
+    }
+
+
+def test_timings_flag_reports_lock_events(tmp_path: Path) -> None:
+    created = _run_cli(
+        ["strategy", "upsert", "--strategy-id", "s1", "--input", "-", "--json"],
+        cwd=tmp_path,
+        input_text=json.dumps(_strategy_payload()),
+    )
+    assert created.returncode == 0, created.stderr
+
+    timed = _run_cli(
+        ["--timings", "log", "tail", "--strategy-id", "s1", "--limit", "1", "--json"], cwd=tmp_path
+    )
+    assert timed.returncode == 0, timed.stderr
+    timings = json.loads(timed.stderr)["timings"]
+    (lock,) = timings["locks"]
+    assert lock["mode"] == "shared"
+    assert lock["lock_path"].endswith(".lock")
+    assert set(timings["phases"]) == {
+        "parse",
+        "input",
+        "validate",
+        "store",
+        "lock_wait",
+        "compute",
+        "output",
+    }
+    assert timings["phases"]["store"] > 0
+    assert timings["phases"]["output"] > 0
+    assert sum(timings["phases"].values()) <= timings["total_ms"] + 0.01
+
+
+def test_profile_flag_writes_cprofile_stats(tmp_path: Path) -> None:
+    profile_path = tmp_path / "run.prof"
+    profiled = _run_cli(
+        ["--profile", str(profile_path), "strategy", "list", "--json"], cwd=tmp_path
+    )
+    assert profiled.returncode == 0, profiled.stderr
+    assert json.loads(profiled.stdout)["strategies"] == []
+
+    stats = pstats.Stats(str(profile_path))
+    assert "run_command" in stats.get_stats_profile().func_profiles
+
+    failed = _run_cli(
+        ["--profile", str(tmp_path / "missing" / "run.prof"), "strategy", "list", "--json"],
+        cwd=tmp_path,
+    )
+    assert failed.returncode == 3
+    _assert_error_payload(failed.stderr, code="io_error")
 
 
 def test_log_append_and_tail(tmp_path: Path) -> None:
@@ -139,6 +197,117 @@ def test_log_append_and_tail(tmp_path: Path) -> None:
     assert tail.returncode == 0, tail.stderr
     tail_payload = json.loads(tail.stdout)
     assert [row["log_id"] for row in tail_payload["logs"]] == log_ids[-2:]
+    assert list(tail_payload) == ["strategy_id", "logs"]
+
+
+def test_log_list_streams_ndjson_and_json_file_output(tmp_path: Path) -> None:
+    created = _run_cli(
+        ["strategy", "upsert", "--strategy-id", "main", "--input", "-", "--json"],
+        cwd=tmp_path,
+        input_text=json.dumps(_strategy_payload()),
+    )
+    assert created.returncode == 0, created.stderr
+    batch = "".join(json.dumps({"step": step}) + "\n" for step in range(5))
+    appended = _run_cli(
+        ["log", "append-batch", "--strategy-id", "main", "--input", "-", "--json"],
+        cwd=tmp_path,
+        input_text=batch,
+    )
+    assert appended.returncode == 0, appended.stderr
+
+    listed = _run_cli(["log", "list", "--strategy-id", "main", "--json"], cwd=tmp_path)
+    assert listed.returncode == 0, listed.stderr
+    logs = json.loads(listed.stdout)["logs"]
+    assert [row["payload"]["step"] for row in logs] == list(range(5))
+
+    ndjson = _run_cli(
+        ["log", "list", "--strategy-id", "main", "--output-format", "ndjson", "--json"],
+        cwd=tmp_path,
+    )
+    assert ndjson.returncode == 0, ndjson.stderr
+    assert [json.loads(line) for line in ndjson.stdout.splitlines()] == logs
+
+    exported = _run_cli(
+        ["log", "tail", "--strategy-id", "main", "--limit", "2", "--output", "tail.json", "--json"],
+        cwd=tmp_path,
+    )
+    assert exported.returncode == 0, exported.stderr
+    assert exported.stdout == ""
+    assert _load_json(tmp_path / "tail.json") == {"strategy_id": "main", "logs": logs[-2:]}
+
+    missing = _run_cli(
+        ["log", "list", "--strategy-id", "ghost", "--output", "ghost.json", "--json"],
+        cwd=tmp_path,
+    )
+    assert missing.returncode == 4
+    _assert_error_payload(missing.stderr, code="strategy_not_found")
+    assert not (tmp_path / "ghost.json").exists()
+
+
+def test_log_query_filters_payload_with_and_without_index(tmp_path: Path) -> None:
+    created = _run_cli(
+        ["strategy", "upsert", "--strategy-id", "main", "--input", "-", "--json"],
+        cwd=tmp_path,
+        input_text=json.dumps(_strategy_payload()),
+    )
+    assert created.returncode == 0, created.stderr
+    records = [{"action": "buy", "price": 42_000}, {"action": "sell", "price": 48_000}]
+    appended = _run_cli(
+        ["log", "append-batch", "--strategy-id", "main", "--input", "-", "--json"],
+        cwd=tmp_path,
+        input_text="".join(json.dumps(record) + "\n" for record in records),
+    )
+    assert appended.returncode == 0, appended.stderr
+
+    query_args = ["log", "query", "--strategy-id", "main", "--where", "price>45000", "--json"]
+    scanned = _run_cli(query_args, cwd=tmp_path)
+    assert scanned.returncode == 0, scanned.stderr
+    assert [row["payload"] for row in json.loads(scanned.stdout)["logs"]] == [records[1]]
+
+    indexed = _run_cli(
+        ["log", "index", "add", "--strategy-id", "main", "--field", "price", "--json"],
+        cwd=tmp_path,
+    )
+    assert indexed.returncode == 0, indexed.stderr
+    assert json.loads(indexed.stdout) == {"strategy_id": "main", "field": "price", "rows": 2}
+    assert _run_cli(query_args, cwd=tmp_path).stdout == scanned.stdout
+
+    invalid = _run_cli(
+        ["log", "query", "--strategy-id", "main", "--where", "price~1", "--json"], cwd=tmp_path
+    )
+    assert invalid.returncode == 4
+    _assert_error_payload(invalid.stderr, code="validation_error")
+
+
+def test_log_append_batch_reads_ndjson_and_returns_all_log_ids(tmp_path: Path) -> None:
+    created = _run_cli(
+        ["strategy", "upsert", "--strategy-id", "main", "--input", "-", "--json"],
+        cwd=tmp_path,
+        input_text=json.dumps(_strategy_payload()),
+    )
+    assert created.returncode == 0, created.stderr
+
+    records = "\n".join(json.dumps({"step": step}) for step in (1, 2, 3)) + "\n"
+    appended = _run_cli(
+        ["log", "append-batch", "--strategy-id", "main", "--input", "-", "--json"],
+        cwd=tmp_path,
+        input_text=records,
+    )
+    assert appended.returncode == 0, appended.stderr
+    log_ids = [row["log_id"] for row in json.loads(appended.stdout)["logs"]]
+    assert len(log_ids) == 3
+
+    listed = _run_cli(["log", "list", "--strategy-id", "main", "--json"], cwd=tmp_path)
+    assert listed.returncode == 0, listed.stderr
+    assert [row["log_id"] for row in json.loads(listed.stdout)["logs"]] == log_ids
+
+    rejected = _run_cli(
+        ["log", "append-batch", "--strategy-id", "main", "--input", "-", "--json"],
+        cwd=tmp_path,
+        input_text='{"step": 4}\n[1, 2]\n',
+    )
+    assert rejected.returncode == 4
+    _assert_error_payload(rejected.stderr, code="validation_error")
 
 
 def test_log_append_missing_strategy_returns_expected_error(tmp_path: Path) -> None:
@@ -183,6 +352,156 @@ def test_evaluate_point_uses_strategy_id_and_returns_schema_valid_json(tmp_path:
     )
 
 
+def test_evaluate_rows_streams_csv_and_ndjson(tmp_path: Path) -> None:
+    created = _run_cli(
+        ["strategy", "upsert", "--strategy-id", "main", "--input", "-", "--json"],
+        cwd=tmp_path,
+        input_text=json.dumps(_strategy_payload()),
+    )
+    assert created.returncode == 0, created.stderr
+
+    rows = [
+        {"timestamp": "2026-01-01T00:00:00Z", "price": 45_000},
+        {"timestamp": "2026-01-02T00:00:00Z", "price": 42_500.5},
+    ]
+    base_args = ["evaluate-rows", "--strategy-id", "main", "--input", "-", "--output", "-"]
+    materialized = _run_cli(
+        [*base_args, "--json"], cwd=tmp_path, input_text=json.dumps({"rows": rows})
+    )
+    assert materialized.returncode == 0, materialized.stderr
+
+    from_ndjson = _run_cli(
+        [*base_args, "--input-format", "ndjson", "--json"],
+        cwd=tmp_path,
+        input_text="".join(json.dumps(row) + "\n" for row in rows),
+    )
+    assert from_ndjson.returncode == 0, from_ndjson.stderr
+    assert from_ndjson.stdout == materialized.stdout
+
+    csv_text = "timestamp,price\n" + "".join(f"{row['timestamp']},{row['price']}\n" for row in rows)
+    to_ndjson = _run_cli(
+        [*base_args, "--input-format", "csv", "--output-format", "ndjson", "--json"],
+        cwd=tmp_path,
+        input_text=csv_text,
+    )
+    assert to_ndjson.returncode == 0, to_ndjson.stderr
+    streamed_rows = [json.loads(line) for line in to_ndjson.stdout.splitlines()]
+    assert streamed_rows == json.loads(materialized.stdout)["rows"]
+
+    to_csv = _run_cli(
+        [*base_args, "--output-format", "csv", "--json"],
+        cwd=tmp_path,
+        input_text=json.dumps({"rows": rows}),
+    )
+    assert to_csv.returncode == 0, to_csv.stderr
+    assert to_csv.stdout.splitlines()[0] == (
+        "timestamp,price,time_k,virtual_price,base_share,target_share"
+    )
+    assert len(to_csv.stdout.splitlines()) == 3
+
+    invalid = _run_cli(
+        [*base_args, "--input-format", "ndjson", "--json"],
+        cwd=tmp_path,
+        input_text=json.dumps(rows[0]) + "\n" + json.dumps({"timestamp": "x", "price": 1}) + "\n",
+    )
+    assert invalid.returncode == 4
+    _assert_error_payload(invalid.stderr, code="validation_error")
+    assert "line 2" in json.loads(invalid.stderr)["error"]["message"]
+
+
+def test_evaluate_ranges_streams_rows_in_requested_format(tmp_path: Path) -> None:
+    created = _run_cli(
+        ["strategy", "upsert", "--strategy-id", "main", "--input", "-", "--json"],
+        cwd=tmp_path,
+        input_text=json.dumps(_strategy_payload()),
+    )
+    assert created.returncode == 0, created.stderr
+
+    request_payload = {
+        "price_start": 50_000,
+        "price_end": 40_000,
+        "price_steps": 5,
+        "time_start": "2026-01-01T00:00:00Z",
+        "time_end": "2026-01-03T00:00:00Z",
+        "time_steps": 3,
+    }
+    base_args = ["evaluate-ranges", "--strategy-id", "main", "--input", "-", "--json"]
+    as_json = _run_cli(
+        [*base_args, "--output", "-"], cwd=tmp_path, input_text=json.dumps(request_payload)
+    )
+    assert as_json.returncode == 0, as_json.stderr
+    validate(
+        instance=json.loads(as_json.stdout),
+        schema=_load_json(SCHEMAS / "evaluate_rows.response.v1.json"),
+        format_checker=FORMAT_CHECKER,
+    )
+
+    output_path = tmp_path / "grid.ndjson"
+    as_ndjson = _run_cli(
+        [*base_args, "--output", str(output_path), "--output-format", "ndjson"],
+        cwd=tmp_path,
+        input_text=json.dumps(request_payload),
+    )
+    assert as_ndjson.returncode == 0, as_ndjson.stderr
+    streamed = [json.loads(line) for line in output_path.read_text(encoding="utf-8").splitlines()]
+    assert streamed == json.loads(as_json.stdout)["rows"]
+    assert len(streamed) == 15
+
+    cache_entries = list((tmp_path / ".psa" / "cache" / "results").glob("*.rows"))
+    assert len(cache_entries) == 1
+    for extra_args in ([], ["--no-cache"]):
+        replayed = _run_cli(
+            [*base_args, "--output", "-", *extra_args],
+            cwd=tmp_path,
+            input_text=json.dumps(request_payload),
+        )
+        assert replayed.returncode == 0, replayed.stderr
+        assert replayed.stdout == as_json.stdout
+
+
+def test_convert_prices_and_evaluate_binary_history(tmp_path: Path) -> None:
+    created = _run_cli(
+        ["strategy", "upsert", "--strategy-id", "main", "--input", "-", "--json"],
+        cwd=tmp_path,
+        input_text=json.dumps(_strategy_payload()),
+    )
+    assert created.returncode == 0, created.stderr
+
+    rows = [
+        {"timestamp": "2026-01-01T00:00:00Z", "price": 45_000},
+        {"timestamp": "2026-01-01T00:00:00.250000Z", "price": 42_500.5},
+    ]
+    converted = _run_cli(
+        ["convert-prices", "--input", "-", "--input-format", "ndjson"]
+        + ["--output", "history.psaprice", "--json"],
+        cwd=tmp_path,
+        input_text="".join(json.dumps(row) + "\n" for row in rows),
+    )
+    assert converted.returncode == 0, converted.stderr
+    assert json.loads(converted.stdout) == {
+        "output": "history.psaprice",
+        "rows": 2,
+        "bytes": 32 + 2 * 16,
+    }
+
+    base_args = ["evaluate-rows", "--strategy-id", "main", "--output", "-", "--json"]
+    from_binary = _run_cli(
+        [*base_args, "--input", "history.psaprice", "--input-format", "binary"], cwd=tmp_path
+    )
+    assert from_binary.returncode == 0, from_binary.stderr
+    from_json = _run_cli(
+        [*base_args, "--input", "-"], cwd=tmp_path, input_text=json.dumps({"rows": rows})
+    )
+    assert from_binary.stdout == from_json.stdout
+
+    (tmp_path / "broken.psaprice").write_bytes(b"PSAPRICE")
+    broken = _run_cli(
+        [*base_args, "--input", "broken.psaprice", "--input-format", "binary"], cwd=tmp_path
+    )
+    assert broken.returncode == 3
+    _assert_error_payload(broken.stderr, code="io_error")
+
+
 def test_evaluate_portfolio_uses_strategy_id_and_returns_schema_valid_json(tmp_path: Path) -> None:
     created = _run_cli(
         ["strategy", "upsert", "--strategy-id", "main", "--input", "-", "--json"],
@@ -221,6 +540,189 @@ def test_evaluate_portfolio_uses_strategy_id_and_returns_schema_valid_json(tmp_p
     )
 
 
+def test_position_show_evaluates_replayed_holdings(tmp_path: Path) -> None:
+    created = _run_cli(
+        ["strategy", "upsert", "--strategy-id", "main", "--input", "-", "--json"],
+        cwd=tmp_path,
+        input_text=json.dumps(_strategy_payload()),
+    )
+    assert created.returncode == 0, created.stderr
+    events = [
+        {"event_type": "transfer", "transfer": {"usd_amount": 10_000}},
+        {"event_type": "fill", "fill": {"side": "buy", "asset_amount": 0.2, "price": 40_000}},
+    ]
+    appended = _run_cli(
+        ["log", "append-batch", "--strategy-id", "main", "--input", "-", "--json"],
+        cwd=tmp_path,
+        input_text="".join(json.dumps(event) + "\n" for event in events),
+    )
+    assert appended.returncode == 0, appended.stderr
+
+    completed = _run_cli(
+        [
+            "position",
+            "show",
+            "--strategy-id",
+            "main",
+            "--price",
+            "45000",
+            "--timestamp",
+            "2026-01-01T00:00:00Z",
+            "--json",
+        ],
+        cwd=tmp_path,
+    )
+    assert completed.returncode == 0, completed.stderr
+    response = json.loads(completed.stdout)
+    assert response["position"]["asset_amount"] == 0.2
+    assert response["position"]["usd_amount"] == 2_000
+    validate(
+        instance={"portfolio": response["portfolio"]},
+        schema=_load_json(SCHEMAS / "evaluate_portfolio.response.v1.json"),
+        format_checker=FORMAT_CHECKER,
+    )
+    assert response["portfolio"]["avg_entry_price"] == 40_000
+
+    invalid = _run_cli(
+        ["log", "append", "--strategy-id", "main", "--input", "-", "--json"],
+        cwd=tmp_path,
+        input_text=json.dumps({"event_type": "fill", "fill": {"side": "hold"}}),
+    )
+    assert invalid.returncode == 4
+    _assert_error_payload(invalid.stderr, code="validation_error")
+
+
+def test_watch_emits_only_changed_evaluations(tmp_path: Path) -> None:
+    created = _run_cli(
+        ["strategy", "upsert", "--strategy-id", "main", "--input", "-", "--json"],
+        cwd=tmp_path,
+        input_text=json.dumps(_strategy_payload()),
+    )
+    assert created.returncode == 0, created.stderr
+    prices = [60_000, 55_000, 45_000, 45_010, 44_000, 30_000, 20_000]
+    feed = "".join(
+        json.dumps({"timestamp": f"2026-01-01T00:0{idx}:00Z", "price": price}) + "\n"
+        for idx, price in enumerate(prices)
+    )
+
+    watched = _run_cli(
+        ["watch", "--strategy-id", "main", "--feed", "-", "--share-threshold", "0.05", "--json"],
+        cwd=tmp_path,
+        input_text=feed,
+    )
+    assert watched.returncode == 0, watched.stderr
+    records = [json.loads(line) for line in watched.stdout.splitlines()]
+    assert [record["price"] for record in records] == [60_000, 45_000, 44_000, 30_000]
+    assert [record["skipped"] for record in records] == [0, 1, 1, 0]
+
+    feed_path = tmp_path / "feed.ndjson"
+    feed_path.write_text(feed, encoding="utf-8")
+    with_holdings = _run_cli(
+        [
+            "watch",
+            "--strategy-id",
+            "main",
+            "--feed",
+            str(feed_path),
+            "--idle-timeout",
+            "0",
+            "--share-threshold",
+            "1",
+            "--delta-threshold",
+            "0.01",
+            "--usd-amount",
+            "1000",
+            "--asset-amount",
+            "0.01",
+            "--json",
+        ],
+        cwd=tmp_path,
+    )
+    assert with_holdings.returncode == 0, with_holdings.stderr
+    records = [json.loads(line) for line in with_holdings.stdout.splitlines()]
+    assert len(records) < len(prices)
+    last = records[-1]
+    portfolio = _run_cli(
+        ["evaluate-portfolio", "--strategy-id", "main", "--input", "-", "--output", "-", "--json"],
+        cwd=tmp_path,
+        input_text=json.dumps(
+            {
+                "timestamp": last["timestamp"],
+                "price": last["price"],
+                "usd_amount": 1000,
+                "asset_amount": 0.01,
+            }
+        ),
+    )
+    assert portfolio.returncode == 0, portfolio.stderr
+    expected = json.loads(portfolio.stdout)["portfolio"]
+    assert last["asset_amount_delta"] == expected["asset_amount_delta"]
+    assert last["usd_delta"] == expected["usd_delta"]
+
+    invalid = _run_cli(
+        ["watch", "--strategy-id", "main", "--feed", "-", "--json"],
+        cwd=tmp_path,
+        input_text=json.dumps({"timestamp": "2026-01-01T00:00:00Z", "price": -1}) + "\n",
+    )
+    assert invalid.returncode == 4
+    _assert_error_payload(invalid.stderr, code="validation_error")
+
+
+def test_evaluate_all_streams_results_and_reports_failures_inline(tmp_path: Path) -> None:
+    for strategy_id in ("alpha", "beta", "gamma"):
+        created = _run_cli(
+            ["strategy", "upsert", "--strategy-id", strategy_id, "--input", "-", "--json"],
+            cwd=tmp_path,
+            input_text=json.dumps(_strategy_payload()),
+        )
+        assert created.returncode == 0, created.stderr
+    record_path = tmp_path / ".psa" / "strategies" / "beta" / "strategy.json"
+    record = _load_json(record_path)
+    record["strategy"]["price_segments"] = []
+    record_path.write_text(json.dumps(record), encoding="utf-8")
+
+    point_request = {"timestamp": "2026-01-01T00:00:00Z", "price": 45_000}
+    single = _run_cli(
+        ["evaluate-point", "--strategy-id", "alpha", "--input", "-", "--output", "-", "--json"],
+        cwd=tmp_path,
+        input_text=json.dumps(point_request),
+    )
+    assert single.returncode == 0, single.stderr
+
+    base_args = ["evaluate-all", "--input", "-", "--output", "-", "--json"]
+    pooled = _run_cli(
+        [*base_args, "--jobs", "2", "--output-format", "ndjson"],
+        cwd=tmp_path,
+        input_text=json.dumps(point_request),
+    )
+    assert pooled.returncode == 0, pooled.stderr
+    results = [json.loads(line) for line in pooled.stdout.splitlines()]
+    assert [result["strategy_id"] for result in results] == ["alpha", "beta", "gamma"]
+    assert results[0]["row"] == json.loads(single.stdout)["row"]
+    assert results[2]["row"] == results[0]["row"]
+    assert results[1]["error"]["code"] == "validation_error"
+
+    portfolio = _run_cli(
+        [*base_args, "--jobs", "1", "--prefix", "g"],
+        cwd=tmp_path,
+        input_text=json.dumps({**point_request, "usd_amount": 10_000, "asset_amount": 0.2}),
+    )
+    assert portfolio.returncode == 0, portfolio.stderr
+    (result,) = json.loads(portfolio.stdout)["results"]
+    assert result["strategy_id"] == "gamma"
+    validate(
+        instance={"portfolio": result["portfolio"]},
+        schema=_load_json(SCHEMAS / "evaluate_portfolio.response.v1.json"),
+        format_checker=FORMAT_CHECKER,
+    )
+
+    bad_jobs = _run_cli(
+        [*base_args, "--jobs", "0"], cwd=tmp_path, input_text=json.dumps(point_request)
+    )
+    assert bad_jobs.returncode == 4
+    _assert_error_payload(bad_jobs.stderr, code="validation_error")
+
+
 def test_cli_error_codes_and_error_json_format(tmp_path: Path) -> None:
     bad_args = _run_cli(["strategy", "list"], cwd=tmp_path)
     assert bad_args.returncode == 2
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Import-time budget for the `psa` entry point, in microseconds of total `-X importtime`
+# cumulative time across top-level imports. Recorded with warm bytecode at roughly 60ms for
+# `strategy exists`; the budget leaves headroom for slow CI machines. The module checks below
+# are the precise guard: they fail as soon as a command pulls a heavy dependency eagerly.
+IMPORT_BUDGET_US = 250_000
+
+# Modules only some commands need; none of them may load for a plain store lookup.
+COMMAND_SCOPED_MODULES = (
+    "jsonschema",
+    "sqlite3",
+    "concurrent.futures",
+    "importlib.metadata",
+    "psa_cli.schema",
+    "psa_cli.sqlite_storage",
+    "psa_cli.evaluate_all",
+    "psa_core.engine",
+    "psa_core.contracts",
+    "psa_core.portfolio",
+)
+
+
+def _import_times(
+    args: list[str], *, cwd: Path, input_text: str | None = None
+) -> dict[str, tuple[int, int]]:
+    env = os.environ.copy()
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env["PYTHONPYCACHEPREFIX"] = str(cwd / "pycache")
+    env["PSA_HOME"] = str(cwd / "home")
+    pythonpath_parts = [str(ROOT / "cli" / "src"), str(ROOT / "core" / "src")]
+    existing_pythonpath = env.get("PYTHONPATH")
+    if existing_pythonpath:
+        pythonpath_parts.append(existing_pythonpath)
+    env["PYTHONPATH"] = os.pathsep.join(pythonpath_parts)
+    command = [sys.executable, "-X", "importtime", "-m", "psa_cli", *args]
+    # The first run only writes bytecode so the measured run reflects a warm install.
+    for _ in range(2):
+        result = subprocess.run(
+            command,
+            input=input_text,
+            text=True,
+            capture_output=True,
+            cwd=cwd,
+            env=env,
+            check=False,
+        )
+    assert result.returncode == 0, result.stderr
+
+    times: dict[str, tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def _total_us(times: dict[str, tuple[int, int]]) -> int:
+    return sum(self_us for self_us, _ in times.values())
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["strategy", "exists", "--strategy-id", "s1", "--json"],
+        ["strategy", "list", "--json"],
+    ],
+)
+def test_store_commands_skip_command_scoped_imports(tmp_path: Path, args: list[str]) -> None:
+    times = _import_times(args, cwd=tmp_path)
+
+    assert "psa_cli.app" in times
+    loaded = sorted(name for name in COMMAND_SCOPED_MODULES if name in times)
+    assert loaded == []
+    assert _total_us(times) < IMPORT_BUDGET_US
+
+
+def test_version_flag_skips_command_modules(tmp_path: Path) -> None:
+    times = _import_times(["--version"], cwd=tmp_path)
+
+    assert "psa_cli.handlers" not in times
+    assert "psa_cli.store" not in times
+    assert "psa_core.types" not in times
+    assert _total_us(times) < IMPORT_BUDGET_US
+
+
+def test_valid_requests_skip_jsonschema(tmp_path: Path) -> None:
+    payload = {
+        "market_mode": "bear",
+        "price_segments": [{"price_low": 40_000, "price_high": 50_000, "weight": 100}],
+    }
+    args = ["strategy", "upsert", "--strategy-id", "s1", "--input", "-", "--json"]
+    times = _import_times(args, cwd=tmp_path, input_text=json.dumps(payload))
+
+    assert "psa_cli.schema" in times
+    assert "jsonschema" not in times
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from psa_cli.errors import CliValidationError
+from psa_cli.io_json import write_json_output
+from psa_cli.io_stream import (
+    StreamedResponse,
+    follow_ndjson_records,
+    iter_csv_records,
+    write_stream_output,
+)
+
+
+@pytest.mark.parametrize("pretty", [False, True])
+@pytest.mark.parametrize("item_count", [0, 1, 3])
+def test_streamed_json_matches_materialized_output(
+    tmp_path: Path, pretty: bool, item_count: int
+) -> None:
+    items = [
+        {"timestamp": f"2026-01-0{idx + 1}T00:00:00Z", "price": 1.5 * idx}
+        for idx in range(item_count)
+    ]
+    envelope = {"strategy_id": "main", "meta": {"count": item_count, "tags": ["a"]}}
+
+    expected_path = tmp_path / "expected.json"
+    write_json_output({**envelope, "rows": items}, str(expected_path), pretty=pretty)
+    streamed_path = tmp_path / "streamed.json"
+    response = StreamedResponse(
+        items_key="rows", items=iter(items), columns=("timestamp", "price"), envelope=envelope
+    )
+    write_stream_output(response, str(streamed_path), output_format="json", pretty=pretty)
+
+    assert streamed_path.read_text(encoding="utf-8") == expected_path.read_text(encoding="utf-8")
+
+
+def test_stream_output_leaves_no_partial_file_on_error(tmp_path: Path) -> None:
+    def items():
+        yield {"price": 1.0}
+        raise ValueError("bad row")
+
+    target = tmp_path / "out.ndjson"
+    response = StreamedResponse(items_key="rows", items=items(), columns=("price",))
+    with pytest.raises(ValueError):
+        write_stream_output(response, str(target), output_format="ndjson", pretty=False)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_csv_records_convert_cells_and_report_line_numbers(tmp_path: Path) -> None:
+    source = tmp_path / "rows.csv"
+    source.write_text(
+        "price,timestamp\n45000,2026-01-01T00:00:00Z\n\noops,2026-01-02T00:00:00Z\n",
+        encoding="utf-8",
+    )
+    records = iter_csv_records(str(source), columns={"timestamp": str, "price": float})
+
+    assert next(records) == (2, {"price": 45_000.0, "timestamp": "2026-01-01T00:00:00Z"})
+    with pytest.raises(CliValidationError, match="line 4"):
+        next(records)
+
+
+def test_follow_ndjson_records_waits_for_appended_and_partial_lines(tmp_path: Path) -> None:
+    feed = tmp_path / "feed.ndjson"
+    feed.write_text('{"n": 1}\n{"n": 2', encoding="utf-8")
+
+    records = follow_ndjson_records(str(feed), poll_seconds=0.001, idle_timeout=5.0)
+    assert next(records) == (1, {"n": 1})
+    with feed.open("a", encoding="utf-8") as handle:
+        handle.write('}\n{"n": 3}\n')
+    assert next(records) == (2, {"n": 2})
+    assert next(records) == (3, {"n": 3})
+
+    # A truncated (rewritten) feed is read again from its start.
+    feed.write_text('{"n": 4}\n', encoding="utf-8")
+    assert next(records) == (4, {"n": 4})
+
+
+def test_follow_ndjson_records_stops_after_idle_timeout(tmp_path: Path) -> None:
+    feed = tmp_path / "feed.ndjson"
+    feed.write_text('{"n": 1}\n{"n": 2}', encoding="utf-8")
+
+    records = follow_ndjson_records(str(feed), poll_seconds=0.001, idle_timeout=0.0)
+    assert list(records) == [(1, {"n": 1}), (2, {"n": 2})]
@@ -72,6 +72,41 @@ def test_parser_requires_json_flag() -> None:
         )
 
 
+def test_parser_parses_strategy_list_pagination() -> None:
+    parser = build_parser()
+    args = parser.parse_args(
+        ["strategy", "list", "--prefix", "btc", "--cursor", "btc-7", "--limit", "50", "--json"]
+    )
+    assert args.command_key == "strategy-list"
+    assert (args.prefix, args.cursor, args.limit) == ("btc", "btc-7", 50)
+
+
+def test_parser_parses_log_query_predicates_and_index_commands() -> None:
+    parser = build_parser()
+    args = parser.parse_args(
+        [
+            "log",
+            "query",
+            "--strategy-id",
+            "main",
+            "--where",
+            "action=buy",
+            "--where",
+            "price>=40000",
+            "--has",
+            "note",
+            "--json",
+        ]
+    )
+    assert args.command_key == "log-query"
+    assert (args.where, args.has, args.limit) == (["action=buy", "price>=40000"], ["note"], None)
+
+    args = parser.parse_args(
+        ["log", "index", "add", "--strategy-id", "main", "--field", "order.side", "--json"]
+    )
+    assert (args.command_key, args.field) == ("log-index-add", "order.side")
+
+
 def test_parser_parses_install_skill_with_supported_runtime() -> None:
     parser = build_parser()
     args = parser.parse_args(["install-skill", "codex", "--json"])
@@ -107,3 +142,84 @@ def test_parser_install_skill_runtime_choices_match_runtime_config(runtime: str)
     parser = build_parser()
     args = parser.parse_args(["install-skill", runtime, "--json"])
     assert args.runtime == runtime
+
+
+def test_parser_parses_store_migrate_target_backend() -> None:
+    parser = build_parser()
+    args = parser.parse_args(["store", "migrate", "--to", "sqlite", "--json"])
+    assert args.command_key == "store-migrate"
+    assert args.target_backend == "sqlite"
+
+    with pytest.raises(CliArgumentError):
+        parser.parse_args(["store", "migrate", "--to", "postgres", "--json"])
+
+
+def test_parser_parses_store_relayout_layout() -> None:
+    parser = build_parser()
+    args = parser.parse_args(["store", "relayout", "--layout", "sharded", "--json"])
+    assert args.command_key == "store-relayout"
+    assert args.layout == "sharded"
+
+    with pytest.raises(CliArgumentError):
+        parser.parse_args(["store", "relayout", "--layout", "deep", "--json"])
+
+
+def test_parser_parses_watch_defaults_and_thresholds() -> None:
+    parser = build_parser()
+    args = parser.parse_args(["watch", "--strategy-id", "s1", "--feed", "prices.ndjson", "--json"])
+    assert args.command_key == "watch"
+    assert args.feed_path == "prices.ndjson"
+    assert args.share_threshold == 0.0
+    assert args.idle_timeout is None
+    assert args.output_format == "ndjson"
+
+    args = parser.parse_args(
+        [
+            "watch",
+            "--strategy-id",
+            "s1",
+            "--feed",
+            "-",
+            "--share-threshold",
+            "0.05",
+            "--usd-amount",
+            "100",
+            "--asset-amount",
+            "0.5",
+            "--json",
+        ]
+    )
+    assert args.share_threshold == 0.05
+    assert (args.usd_amount, args.asset_amount) == (100.0, 0.5)
+
+    with pytest.raises(CliArgumentError):
+        parser.parse_args(
+            ["watch", "--strategy-id", "s1", "--feed", "-", "--output-format", "json"]
+        )
+
+
+def test_parser_parses_store_export_and_import() -> None:
+    parser = build_parser()
+    exported = parser.parse_args(["store", "export", "--output", "store.tar.gz", "--json"])
+    assert exported.command_key == "store-export"
+    assert exported.bundle_path == "store.tar.gz"
+
+    imported = parser.parse_args(["store", "import", "--input", "-", "--jobs", "4", "--json"])
+    assert imported.command_key == "store-import"
+    assert imported.bundle_path == "-"
+    assert imported.jobs == 4
+
+
+def test_parser_parses_strategy_history_and_diff() -> None:
+    parser = build_parser()
+    show = parser.parse_args(
+        ["strategy", "show", "--strategy-id", "a", "--revision", "2", "--json"]
+    )
+    assert show.revision == 2
+
+    history = parser.parse_args(["strategy", "history", "--strategy-id", "a", "--json"])
+    assert history.command_key == "strategy-history"
+
+    diff = parser.parse_args(["strategy", "diff", "--strategy-id", "a", "--from", "1", "--json"])
+    assert diff.command_key == "strategy-diff"
+    assert (diff.from_revision, diff.to_revision) == (1, None)
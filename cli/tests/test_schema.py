@@ -4,6 +4,8 @@ import json
 from pathlib import Path
 
 import psa_cli.schema as schema_module
+from jsonschema import Draft202012Validator
+from psa_cli.schema_compiler import compile_schema
 
 
 class _FakeResourceFile:
@@ -143,3 +145,71 @@ def test_validate_request_rejects_evaluate_portfolio_with_inline_strategy() -> N
         assert "request does not match schema" in str(exc)
     else:
         raise AssertionError("expected schema validation failure")
+
+
+def test_every_request_schema_compiles_to_a_fast_check() -> None:
+    schema_module.load_schema.cache_clear()
+    for schema_file in set(schema_module.REQUEST_SCHEMAS.values()):
+        schema = schema_module.load_schema(schema_file)
+        assert compile_schema(schema, formats=schema_module.FORMATS) is not None, schema_file
+
+
+def test_compiled_check_agrees_with_jsonschema() -> None:
+    schema_module.load_schema.cache_clear()
+    segment = {"price_low": 1.0, "price_high": 2.0, "weight": 100.0}
+    cases = {
+        "strategy_upsert.request.v1.json": [
+            {"market_mode": "bear", "price_segments": [segment]},
+            {"market_mode": "bull", "price_segments": [segment], "time_segments": []},
+            {"market_mode": "side", "price_segments": [segment]},
+            {"market_mode": "bear", "price_segments": []},
+            {"market_mode": "bear", "price_segments": [{**segment, "weight": 0}]},
+            {"market_mode": "bear", "price_segments": [{**segment, "weight": True}]},
+            {"market_mode": "bear", "price_segments": [segment], "extra": 1},
+            {"market_mode": "bear", "price_segments": [segment], "time_segments": [{}]},
+        ],
+        "evaluate_portfolio.request.v1.json": [
+            {"timestamp": "2026-01-01T00:00:00Z", "price": 1, "usd_amount": 0, "asset_amount": 0},
+            {
+                "timestamp": "2026-01-01T00:00:00+02:00",
+                "price": 1.5,
+                "usd_amount": 1,
+                "asset_amount": 1,
+                "avg_entry_price": None,
+            },
+            {
+                "timestamp": "2026-01-01T00:00:00Z",
+                "price": 1,
+                "usd_amount": 1,
+                "asset_amount": 1,
+                "avg_entry_price": 0,
+            },
+            {"timestamp": "2026-01-01", "price": 1, "usd_amount": 0, "asset_amount": 0},
+            {"timestamp": "2026-13-01T00:00:00Z", "price": 1, "usd_amount": 0, "asset_amount": 0},
+            {"timestamp": 0, "price": 1, "usd_amount": 0, "asset_amount": 0},
+            {"timestamp": "2026-01-01T00:00:00Z", "price": 1, "usd_amount": -1, "asset_amount": 0},
+        ],
+        "evaluate_rows.request.v1.json": [
+            {"rows": []},
+            {"rows": [{"timestamp": "2026-01-01T00:00:00Z", "price": 2}]},
+            {"rows": [{"timestamp": "2026-01-01T00:00:00Z", "price": "2"}]},
+            {"rows": {}},
+            [],
+        ],
+    }
+    for schema_file, payloads in cases.items():
+        schema = schema_module.load_schema(schema_file)
+        check = compile_schema(schema, formats=schema_module.FORMATS)
+        assert check is not None
+        validator = Draft202012Validator(schema, format_checker=schema_module._format_checker())
+        for payload in payloads:
+            assert check(payload) == validator.is_valid(payload), (schema_file, payload)
+
+
+def test_schema_with_unsupported_keyword_falls_back_to_jsonschema() -> None:
+    schema = {"type": "array", "uniqueItems": True}
+    assert compile_schema(schema, formats=schema_module.FORMATS) is None
+
+    validator = schema_module._CachedValidator("unique.json", schema)
+    assert validator.error([1, 2]) is None
+    assert validator.error([1, 1]) == "[1, 1] has non-unique elements"
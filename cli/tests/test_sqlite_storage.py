@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+
+import pytest
+from psa_cli.errors import CliDomainError, CliValidationError
+from psa_cli.store import (
+    append_log,
+    create_log_index,
+    diff_strategy,
+    drop_log_index,
+    list_log_indexes,
+    list_logs,
+    list_strategies,
+    load_strategy_spec,
+    log_stats,
+    migrate_store,
+    query_logs,
+    relayout_store,
+    rotate_logs,
+    show_log,
+    show_position,
+    show_strategy,
+    strategy_exists,
+    strategy_history,
+    tail_logs,
+    upsert_strategy,
+)
+
+
+def _strategy_payload(weight: float = 100.0) -> dict:
+    return {
+        "market_mode": "bear",
+        "price_segments": [{"price_low": 10_000.0, "price_high": 20_000.0, "weight": weight}],
+        "time_segments": [],
+    }
+
+
+def test_sqlite_backend_round_trips_strategies_and_logs(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PSA_STORE_BACKEND", "sqlite")
+
+    assert strategy_exists("main") is False
+    assert list_strategies() == {"strategies": [], "next_cursor": None}
+
+    created = upsert_strategy("main", _strategy_payload())
+    repeated = upsert_strategy("main", _strategy_payload())
+    updated = upsert_strategy("main", _strategy_payload(weight=50.0))
+    assert (created["result"], created["revision"]) == ("created", 1)
+    assert (repeated["result"], repeated["revision"]) == ("updated", 1)
+    assert (updated["result"], updated["revision"]) == ("updated", 2)
+    assert show_strategy("main")["strategy"] == _strategy_payload(weight=50.0)
+    assert load_strategy_spec("main").price_segments[0].weight == 50.0
+    assert (tmp_path / ".psa" / "cache" / "strategies" / "main.compiled").is_file()
+
+    appended = [append_log("main", {"step": step}) for step in (1, 2, 3)]
+    assert [row["log_id"] for row in list_logs("main")] == [row["log_id"] for row in appended]
+    assert [row["payload"]["step"] for row in tail_logs("main", limit=2)] == [2, 3]
+    assert show_log("main", log_id=appended[0]["log_id"])["payload"] == {"step": 1}
+    assert [row["log_id"] for row in list_logs("main", from_ts=appended[1]["ts"])] == [
+        row["log_id"] for row in appended[1:]
+    ]
+
+    assert (tmp_path / ".psa" / "store.sqlite3").is_file()
+    assert not (tmp_path / ".psa" / "strategies").exists()
+    with sqlite3.connect(tmp_path / ".psa" / "store.sqlite3") as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_sqlite_backend_reports_missing_strategy_and_rotation(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PSA_STORE_BACKEND", "sqlite")
+
+    with pytest.raises(CliDomainError) as excinfo:
+        append_log("missing", {"event": "x"})
+    assert excinfo.value.error_code == "strategy_not_found"
+
+    upsert_strategy("main", _strategy_payload())
+    with pytest.raises(CliDomainError) as excinfo:
+        rotate_logs("main")
+    assert excinfo.value.error_code == "unsupported_operation"
+    with pytest.raises(CliDomainError) as excinfo:
+        relayout_store("sharded")
+    assert excinfo.value.error_code == "unsupported_operation"
+
+
+def test_sqlite_log_query_uses_payload_expression_index(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PSA_STORE_BACKEND", "sqlite")
+    upsert_strategy("main", _strategy_payload())
+    for payload in ({"action": "buy", "price": 1}, {"action": 1}, {"action": "sell"}):
+        append_log("main", payload)
+
+    assert create_log_index("main", "action")["rows"] == 3
+    assert list_log_indexes("main")["fields"] == ["action"]
+    assert [row["payload"] for row in query_logs("main", where=["action=buy"])] == [
+        {"action": "buy", "price": 1}
+    ]
+    assert [row["payload"] for row in query_logs("main", where=["action=1"])] == [{"action": 1}]
+    assert len(query_logs("main", has=["price"])) == 1
+
+    database = tmp_path / ".psa" / "store.sqlite3"
+    with sqlite3.connect(database) as connection:
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT payload FROM logs WHERE strategy_id = ? "
+            """AND json_extract(payload, '$."action"') = ? ORDER BY seq""",
+            ("main", "buy"),
+        ).fetchall()
+    assert "logs_payload_" in " ".join(str(step[-1]) for step in plan)
+
+    assert drop_log_index("main", "action")["dropped"] is True
+    assert drop_log_index("main", "action")["dropped"] is False
+    with sqlite3.connect(database) as connection:
+        indexes = connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'logs_payload_%'"
+        ).fetchall()
+    assert indexes == []
+
+
+def test_sqlite_log_stats_are_updated_on_append_and_backfilled(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PSA_STORE_BACKEND", "sqlite")
+    upsert_strategy("main", _strategy_payload())
+    appended = [append_log("main", {"step": step}) for step in (1, 2)]
+
+    stats = log_stats("main")
+    assert stats["records"] == 2
+    assert (stats["first_ts"], stats["last_ts"]) == (appended[0]["ts"], appended[1]["ts"])
+    # `bytes` is the size of the NDJSON lines the files backend would write.
+    lines = [json.dumps(row, separators=(",", ":")) + "\n" for row in list_logs("main")]
+    assert stats["bytes"] == len("".join(lines).encode("utf-8"))
+    assert sum(stats["days"].values()) == 2
+    assert list_strategies(with_log_stats=True)["strategies"][0]["log_stats"]["records"] == 2
+
+    # Stores created before the summary tables existed are backfilled on upgrade.
+    database = tmp_path / ".psa" / "store.sqlite3"
+    with sqlite3.connect(database) as connection:
+        connection.execute("DROP TABLE log_summaries")
+        connection.execute("DROP TABLE log_days")
+        connection.execute("PRAGMA user_version=2")
+    assert log_stats("main") == stats
+
+    # Version 5 summaries counted payload bytes only and are recounted.
+    with sqlite3.connect(database) as connection:
+        connection.execute("UPDATE log_summaries SET bytes = 20")
+        connection.execute("PRAGMA user_version=5")
+    assert log_stats("main") == stats
+
+
+def test_sqlite_position_checkpoint_is_incremental(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PSA_STORE_BACKEND", "sqlite")
+    upsert_strategy("main", _strategy_payload())
+    upsert_strategy("other", _strategy_payload())
+
+    fill = {"event_type": "fill", "fill": {"side": "buy", "asset_amount": 0.5, "price": 30_000}}
+    append_log("main", {"event_type": "transfer", "transfer": {"usd_amount": 20_000}})
+    append_log("main", fill)
+    append_log("other", fill)
+    first = show_position("main")
+    assert (first["records"], first["replayed"]) == (2, 2)
+    assert first["position"]["usd_amount"] == pytest.approx(5_000)
+
+    append_log("main", {**fill, "fill": {**fill["fill"], "side": "sell", "asset_amount": 0.25}})
+    second = show_position("main")
+    assert (second["records"], second["replayed"]) == (3, 1)
+    assert second["position"]["asset_amount"] == pytest.approx(0.25)
+    assert second["position"]["avg_entry_price"] == pytest.approx(30_000)
+    assert show_position("main")["replayed"] == 0
+
+
+def test_sqlite_strategy_history_and_diff(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PSA_STORE_BACKEND", "sqlite")
+    for weight in (100.0, 10.0, 100.0):
+        upsert_strategy("alpha", _strategy_payload(weight=weight))
+
+    history = strategy_history("alpha")["revisions"]
+    assert [entry["revision"] for entry in history] == [1, 2, 3]
+    assert history[0]["content_hash"] == history[2]["content_hash"]
+    assert show_strategy("alpha", revision=2)["strategy"] == _strategy_payload(weight=10.0)
+    with sqlite3.connect(tmp_path / ".psa" / "store.sqlite3") as connection:
+        assert connection.execute("SELECT COUNT(*) FROM strategy_blobs").fetchone() == (2,)
+
+    changed = diff_strategy("alpha", from_revision=1, to_revision=2)["price_segments"]["changed"]
+    assert [(pair["from"]["weight"], pair["to"]["weight"]) for pair in changed] == [(100.0, 10.0)]
+
+
+def test_migrate_store_copies_files_into_sqlite(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    upsert_strategy("alpha", _strategy_payload())
+    upsert_strategy("beta", _strategy_payload(weight=10.0))
+    upsert_strategy("beta", _strategy_payload(weight=20.0))
+    history = strategy_history("beta")
+    logs = [append_log("alpha", {"step": step}) for step in (1, 2)]
+    create_log_index("alpha", "step")
+    stats = log_stats("alpha")
+
+    migrated = migrate_store("sqlite")
+    assert (migrated["strategies"], migrated["revisions"], migrated["logs"]) == (2, 1, 2)
+    config = json.loads((tmp_path / ".psa" / "config.json").read_text(encoding="utf-8"))
+    assert config == {"backend": "sqlite"}
+
+    assert [row["strategy_id"] for row in list_strategies()["strategies"]] == ["alpha", "beta"]
+    assert [row["log_id"] for row in list_logs("alpha")] == [row["log_id"] for row in logs]
+    assert log_stats("alpha") == stats
+    assert list_log_indexes("alpha")["fields"] == ["step"]
+    assert strategy_history("beta") == history
+    assert diff_strategy("beta")["price_segments"]["changed"]
+    assert show_strategy("beta", revision=1)["strategy"] == _strategy_payload(weight=10.0)
+
+    with pytest.raises(CliValidationError):
+        migrate_store("sqlite")
+    with pytest.raises(CliDomainError) as excinfo:
+        migrate_store("files")
+    assert excinfo.value.error_code == "migration_target_not_empty"
@@ -1,20 +1,40 @@
 from __future__ import annotations
 
+import io
+import json
+import os
+import tarfile
 import time
+from collections.abc import Sequence
 from multiprocessing import Process
 from pathlib import Path
 
 import pytest
-from psa_cli.errors import CliDomainError
-from psa_cli.locks import exclusive_lock
+from psa_cli import bundle, catalog, result_cache, segments
+from psa_cli.errors import CliDomainError, CliValidationError
+from psa_cli.locks import exclusive_lock, lock_events, reset_lock_events, shared_lock
 from psa_cli.store import (
     append_log,
+    append_logs,
+    create_log_index,
+    diff_strategy,
     list_logs,
+    list_strategies,
+    load_strategy_spec,
+    log_stats,
+    query_logs,
+    reindex_strategies,
+    relayout_store,
+    rotate_logs,
     show_log,
+    show_position,
+    show_strategy,
     strategy_exists,
+    strategy_history,
     tail_logs,
     upsert_strategy,
 )
+from psa_core import contracts
 
 
 def _hold_lock_for_test(lock_path: str, ready_path: str) -> None:
@@ -33,6 +53,13 @@ def _strategy_payload() -> dict:
     }
 
 
+def _fill(side: str, amount: float, price: float, **extra: float) -> dict:
+    return {
+        "event_type": "fill",
+        "fill": {"side": side, "asset_amount": amount, "price": price, **extra},
+    }
+
+
 def test_upsert_is_idempotent_for_same_payload(monkeypatch, tmp_path: Path) -> None:
     monkeypatch.chdir(tmp_path)
 
@@ -72,6 +99,604 @@ def test_tail_returns_last_records_in_order(monkeypatch, tmp_path: Path) -> None
     assert len(listed) == 2
 
 
+def test_append_logs_writes_batch_with_single_fsync(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    upsert_strategy("main", _strategy_payload())
+
+    fsync_calls: list[int] = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: (fsync_calls.append(fd), real_fsync(fd)))
+    appended = append_logs("main", [{"step": 1}, {"step": 2}, {"step": 3}])
+
+    assert len(fsync_calls) == 1
+    assert len({row["log_id"] for row in appended}) == 3
+    listed = list_logs("main")
+    assert [row["log_id"] for row in listed] == [row["log_id"] for row in appended]
+    assert [row["payload"]["step"] for row in listed] == [1, 2, 3]
+
+
+def test_append_logs_is_all_or_nothing(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    upsert_strategy("main", _strategy_payload())
+    first = append_log("main", {"step": 1})
+
+    with pytest.raises(CliValidationError):
+        append_logs("main", [{"step": 2}, ["not", "an", "object"]])
+
+    def failing_fsync(fd: int) -> None:
+        raise OSError(28, "No space left on device")
+
+    log_path = tmp_path / ".psa" / "strategies" / "main" / "log.ndjson"
+    size_before = log_path.stat().st_size
+    with monkeypatch.context() as patched:
+        patched.setattr(os, "fsync", failing_fsync)
+        with pytest.raises(CliDomainError) as excinfo:
+            append_logs("main", [{"step": 2}, {"step": 3}])
+
+    assert excinfo.value.error_code == "storage_error"
+    assert log_path.stat().st_size == size_before
+    assert [row["log_id"] for row in list_logs("main")] == [first["log_id"]]
+
+
+def test_rotation_seals_segments_and_readers_span_them(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PSA_LOG_SEGMENT_MAX_BYTES", "1")
+    upsert_strategy("main", _strategy_payload())
+
+    appended = [append_log("main", {"step": step}) for step in range(1, 5)]
+
+    strategy_dir = tmp_path / ".psa" / "strategies" / "main"
+    sealed = sorted(path.name for path in (strategy_dir / "segments").iterdir())
+    assert sealed == [f"00000{idx}.ndjson.gz" for idx in range(1, 5)]
+    assert not (strategy_dir / "log.ndjson").exists()
+
+    listed = list_logs("main")
+    assert [row["log_id"] for row in listed] == [row["log_id"] for row in appended]
+    assert [row["log_id"] for row in tail_logs("main", limit=3)] == [
+        row["log_id"] for row in appended[1:]
+    ]
+    assert show_log("main", log_id=appended[0]["log_id"])["payload"] == {"step": 1}
+
+    # Without a fresh summary the tail is collected from the newest segments instead.
+    (strategy_dir / "log.summary.json").unlink()
+    assert [row["log_id"] for row in tail_logs("main", limit=9)] == [
+        row["log_id"] for row in appended
+    ]
+
+
+def test_list_logs_skips_sealed_segments_outside_time_range(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    upsert_strategy("main", _strategy_payload())
+    old = append_log("main", {"step": "old"})
+    rotated = rotate_logs("main")
+    assert [segment["records"] for segment in rotated["sealed"]] == [1]
+
+    recent = append_log("main", {"step": "recent"})
+    segment_path = tmp_path / ".psa" / "strategies" / "main" / "segments" / "000001.ndjson.gz"
+    segment_path.write_bytes(b"not gzip")
+
+    listed = list_logs("main", from_ts=recent["ts"])
+    assert [row["log_id"] for row in listed] == [recent["log_id"]]
+
+    with pytest.raises(CliDomainError) as excinfo:
+        list_logs("main", to_ts=old["ts"])
+    assert excinfo.value.error_code == "storage_error"
+
+
+def test_pending_segment_is_read_and_sealed_on_next_rotation(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    upsert_strategy("main", _strategy_payload())
+    first = append_log("main", {"step": 1})
+
+    strategy_dir = tmp_path / ".psa" / "strategies" / "main"
+    (strategy_dir / "segments").mkdir()
+    (strategy_dir / "log.ndjson").rename(strategy_dir / "segments" / "000001.ndjson")
+    second = append_log("main", {"step": 2})
+
+    assert [row["log_id"] for row in list_logs("main")] == [first["log_id"], second["log_id"]]
+
+    rotated = rotate_logs("main")
+    assert [segment["seq"] for segment in rotated["segments"]] == [1, 2]
+    assert not (strategy_dir / "segments" / "000001.ndjson").exists()
+    assert [row["log_id"] for row in list_logs("main")] == [first["log_id"], second["log_id"]]
+
+
+def test_query_logs_uses_index_across_rotation_and_repairs_stale_index(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    upsert_strategy("main", _strategy_payload())
+    append_logs("main", [{"action": "buy", "price": 40_000 + step} for step in range(4)])
+    assert create_log_index("main", "action")["rows"] == 4
+    rotate_logs("main")
+    append_logs("main", [{"action": "sell", "price": 41_000}, {"action": "buy", "price": 1.5}])
+    append_log("main", {"note": "no action", "meta": {"ok": True}})
+
+    def full_scan(*args, **kwargs):
+        raise AssertionError("indexed query must not scan the whole log")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(segments, "iter_log_rows", full_scan)
+        bought = query_logs("main", where=["action=buy", "price>=40002"])
+        assert [row["payload"]["price"] for row in bought] == [40_002, 40_003]
+        assert [row["payload"]["price"] for row in query_logs("main", where=["action=buy"])] == [
+            40_000,
+            40_001,
+            40_002,
+            40_003,
+            1.5,
+        ]
+        assert query_logs("main", where=["action=hold"]) == []
+
+    assert [row["payload"]["note"] for row in query_logs("main", has=["meta.ok"])] == ["no action"]
+    assert query_logs("main", where=["meta.ok=1"]) == []
+    assert len(query_logs("main", where=["price<41000"], limit=2)) == 2
+    with pytest.raises(CliValidationError):
+        query_logs("main", where=["price>{}"])
+
+    # A log append that never reached the index leaves it stale: queries fall back to a scan
+    # and the next append rebuilds it.
+    strategy_dir = tmp_path / ".psa" / "strategies" / "main"
+    with (strategy_dir / "log.ndjson").open("a", encoding="utf-8") as handle:
+        row = {"log_id": "manual", "strategy_id": "main", "ts": "2026-01-01T00:00:00Z"}
+        handle.write(json.dumps({**row, "payload": {"action": "buy"}}) + "\n")
+    assert [row["log_id"] for row in query_logs("main", where=["action=buy"])][-1] == "manual"
+    append_log("main", {"action": "buy", "price": 2})
+    with monkeypatch.context() as patched:
+        patched.setattr(segments, "iter_log_rows", full_scan)
+        assert len(query_logs("main", where=["action=buy"])) == 7
+
+
+def test_log_stats_are_maintained_on_append_without_scanning(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    upsert_strategy("main", _strategy_payload())
+    upsert_strategy("quiet", _strategy_payload())
+    assert log_stats("main") == {
+        "strategy_id": "main",
+        "records": 0,
+        "first_ts": None,
+        "last_ts": None,
+        "bytes": 0,
+        "days": {},
+    }
+
+    first = append_log("main", {"step": 1})
+    rotate_logs("main")
+
+    def full_scan(*args, **kwargs):
+        raise AssertionError("appending must not rescan the log")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(segments, "iter_log_rows", full_scan)
+        appended = append_logs("main", [{"step": 2}, {"step": 3}])
+        stats = log_stats("main")
+
+    strategy_dir = tmp_path / ".psa" / "strategies" / "main"
+    assert stats["records"] == 3
+    assert (stats["first_ts"], stats["last_ts"]) == (first["ts"], appended[-1]["ts"])
+    assert stats["bytes"] == segments.total_log_bytes(strategy_dir)
+    assert sum(stats["days"].values()) == 3
+    assert set(stats["days"]) <= {first["ts"][:10], appended[-1]["ts"][:10]}
+
+    (strategy_dir / "log.summary.json").unlink()
+    assert log_stats("main") == stats
+
+    listed = list_strategies(with_log_stats=True)["strategies"]
+    assert [row["log_stats"]["records"] for row in listed] == [3, 0]
+    assert listed[0]["log_stats"]["last_ts"] == appended[-1]["ts"]
+
+
+def test_position_replays_only_records_since_checkpoint(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PSA_LOG_SEGMENT_MAX_BYTES", "1")
+    upsert_strategy("main", _strategy_payload())
+    append_logs(
+        "main",
+        [
+            {"event_type": "transfer", "transfer": {"usd_amount": 10_000}},
+            _fill("buy", 0.1, 40_000),
+            {"event_type": "checkin"},
+            _fill("buy", 0.1, 20_000, fee_usd=10),
+        ],
+    )
+
+    first = show_position("main")
+    assert (first["records"], first["replayed"]) == (4, 4)
+    assert first["position"]["asset_amount"] == pytest.approx(0.2)
+    assert first["position"]["usd_amount"] == pytest.approx(3_990)
+    assert first["position"]["avg_entry_price"] == pytest.approx(30_050)
+
+    # The log was rotated into a sealed segment; replay resumes after the checkpointed rows.
+    append_log("main", _fill("sell", 0.1, 50_000))
+    second = show_position("main")
+    assert (second["records"], second["replayed"]) == (5, 1)
+    assert second["position"]["realized_pnl_usd"] == pytest.approx(50_000 * 0.1 - 3_005)
+    assert second["position"]["avg_entry_price"] == pytest.approx(30_050)
+    assert show_position("main")["replayed"] == 0
+
+    append_log("main", _fill("sell", 1.0, 50_000))
+    oversold = show_position("main")["position"]
+    assert (oversold["fills"], oversold["rejected"]) == (3, 1)
+    assert oversold["asset_amount"] == pytest.approx(0.1)
+
+    (tmp_path / ".psa" / "strategies" / "main" / "position.checkpoint.json").unlink()
+    assert show_position("main")["position"] == pytest.approx(oversold)
+
+    with pytest.raises(CliValidationError, match=r"log payload\[1\]\.fill\.price"):
+        append_logs("main", [{"step": 1}, _fill("buy", 1.0, 0)])
+
+
+def test_position_rejects_dust_sell_without_holdings(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    upsert_strategy("main", _strategy_payload())
+    append_logs("main", [_fill("sell", 1e-13, 100), _fill("buy", 0.5, 100)])
+
+    position = show_position("main")["position"]
+    assert (position["fills"], position["rejected"]) == (1, 1)
+    assert position["asset_amount"] == pytest.approx(0.5)
+    assert position["avg_entry_price"] == pytest.approx(100)
+
+
+def test_relayout_moves_strategies_under_psa_home(monkeypatch, tmp_path: Path) -> None:
+    home = tmp_path / "central"
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PSA_HOME", str(home))
+    upsert_strategy("alpha", _strategy_payload())
+    logged = append_log("alpha", {"step": 1})
+    assert (home / "strategies" / "alpha" / "strategy.json").is_file()
+    assert not (tmp_path / ".psa").exists()
+
+    relayout = relayout_store("sharded")
+    assert (relayout["layout"], relayout["moved"]) == ("sharded", 1)
+    assert json.loads((home / "config.json").read_text(encoding="utf-8"))["layout"] == "sharded"
+    sharded = list((home / "strategies" / "_shards").glob("*/*/alpha"))
+    assert len(sharded) == 1
+    assert not (home / "strategies" / "alpha").exists()
+
+    upsert_strategy("beta", _strategy_payload())
+    assert len(list((home / "strategies" / "_shards").glob("*/*/beta"))) == 1
+    assert [row["log_id"] for row in list_logs("alpha")] == [logged["log_id"]]
+    assert reindex_strategies()["strategies"] == 2
+    ids = [row["strategy_id"] for row in list_strategies()["strategies"]]
+    assert ids == ["alpha", "beta"]
+
+    # A strategy left in the other layout is still found.
+    monkeypatch.setenv("PSA_STORE_LAYOUT", "flat")
+    assert load_strategy_spec("beta").price_segments[0].weight == 100.0
+    monkeypatch.delenv("PSA_STORE_LAYOUT")
+
+    assert relayout_store("flat")["moved"] == 2
+    assert sorted(path.name for path in (home / "strategies").iterdir() if path.is_dir()) == [
+        "alpha",
+        "beta",
+    ]
+
+
+def test_list_strategies_pages_catalog_without_reading_strategy_files(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    for strategy_id in ("alpha-1", "alpha-2", "alpha-3", "beta-1"):
+        upsert_strategy(strategy_id, _strategy_payload())
+
+    (tmp_path / ".psa" / "strategies" / "alpha-2" / "strategy.json").write_text(
+        "{", encoding="utf-8"
+    )
+
+    first = list_strategies(prefix="alpha", limit=2)
+    assert [row["strategy_id"] for row in first["strategies"]] == ["alpha-1", "alpha-2"]
+    assert first["next_cursor"] == "alpha-2"
+    second = list_strategies(prefix="alpha", cursor=first["next_cursor"], limit=2)
+    assert [row["strategy_id"] for row in second["strategies"]] == ["alpha-3"]
+    assert second["next_cursor"] is None
+
+    with pytest.raises(CliValidationError):
+        list_strategies(limit=0)
+
+
+def test_catalog_is_rebuilt_when_missing_and_compacts_journal(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(catalog, "COMPACT_JOURNAL_BYTES", 1)
+    upsert_strategy("main", _strategy_payload())
+    root = tmp_path / ".psa" / "strategies"
+
+    for path in root.glob(".catalog.*"):
+        path.unlink()
+    assert [row["strategy_id"] for row in list_strategies()["strategies"]] == ["main"]
+
+    upsert_strategy("other", _strategy_payload())
+    head = json.loads((root / ".catalog.head.json").read_text(encoding="utf-8"))
+    assert head == {"version": 1, "generation": 2}
+    assert not (root / ".catalog.1.json").exists()
+    assert [row["strategy_id"] for row in list_strategies()["strategies"]] == ["main", "other"]
+
+    assert reindex_strategies() == {"backend": "files", "strategies": 2}
+
+
+def test_compiled_strategy_is_reused_until_upsert(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    upsert_strategy("main", _strategy_payload())
+    compiled_path = tmp_path / ".psa" / "strategies" / "main" / "strategy.compiled"
+
+    first = load_strategy_spec("main")
+    assert compiled_path.is_file()
+
+    with monkeypatch.context() as patched:
+        patched.setattr(contracts, "parse_strategy", lambda payload: pytest.fail("cache miss"))
+        assert load_strategy_spec("main") == first
+
+    changed = _strategy_payload()
+    changed["market_mode"] = "bull"
+    upsert_strategy("main", changed)
+    assert not compiled_path.exists()
+    assert load_strategy_spec("main").market_mode == "bull"
+
+
+def test_result_cache_replays_hits_and_evicts_least_recently_used(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    upsert_strategy("main", _strategy_payload())
+    strategy = load_strategy_spec("main")
+    columns = ("price", "target_share")
+    rows = [{"price": float(price), "target_share": 0.5} for price in range(100)]
+
+    def cached(time_start: str, *, max_bytes: int = 1 << 20) -> list:
+        params = {"price_start": 1.0, "time_start": time_start, "time_end": time_start}
+        return list(
+            result_cache.cached_rows(
+                "main", strategy, params, columns, max_bytes=max_bytes, evaluate=lambda: rows
+            )
+        )
+
+    assert cached("2026-01-01T00:00:00Z") == rows
+    with monkeypatch.context() as patched:
+        patched.setattr(result_cache, "record_rows", lambda *args, **kwargs: pytest.fail("miss"))
+        assert cached("2026-01-01T00:00:00+00:00") == rows
+
+    entries = sorted(result_cache.cache_dir().glob("*.rows"))
+    assert len(entries) == 1
+    entry_size = entries[0].stat().st_size
+    for day in (2, 3):
+        assert cached(f"2026-01-0{day}T00:00:00Z") == rows
+    by_age = sorted(result_cache.cache_dir().glob("*.rows"), key=lambda path: path.stat().st_mtime)
+    for age, path in enumerate(reversed(by_age)):
+        stamp = time.time() - 10 * (age + 1)
+        os.utime(path, (stamp, stamp))
+    oldest = by_age[0]
+    assert cached("2026-01-01T00:00:00Z") == rows  # refreshes the oldest entry
+
+    cached("2026-01-04T00:00:00Z", max_bytes=3 * entry_size)
+    remaining = set(result_cache.cache_dir().glob("*.rows"))
+    assert len(remaining) == 3
+    assert oldest in remaining
+    assert by_age[1] not in remaining
+
+    assert cached("2026-01-05T00:00:00Z", max_bytes=entry_size - 1) == rows
+    assert len(list(result_cache.cache_dir().glob("*.rows"))) == 3
+    assert not list(result_cache.cache_dir().glob(".*.tmp"))
+
+    changed = _strategy_payload()
+    changed["market_mode"] = "bull"
+    upsert_strategy("main", changed)
+    upsert_strategy("main", _strategy_payload())
+    assert load_strategy_spec("main") == strategy
+    with monkeypatch.context() as patched:
+        patched.setattr(result_cache, "record_rows", lambda *args, **kwargs: pytest.fail("miss"))
+        assert cached("2026-01-01T00:00:00Z") == rows  # reverted strategy hits its entries
+
+
+def test_store_bundle_round_trips_into_other_backend(monkeypatch, tmp_path: Path) -> None:
+    for name in ("source", "target"):
+        (tmp_path / name).mkdir()
+    monkeypatch.chdir(tmp_path / "source")
+    monkeypatch.setattr(bundle, "BUNDLE_LOG_CHUNK", 2)
+    monkeypatch.setattr(bundle, "BUNDLE_REVISION_CHUNK", 1)
+    for strategy_id in ("alpha", "beta", "gamma"):
+        upsert_strategy(strategy_id, _strategy_payload())
+    changed = _strategy_payload()
+    changed["market_mode"] = "bull"
+    upsert_strategy("alpha", changed)
+    upsert_strategy("alpha", _strategy_payload())
+    history = strategy_history("alpha")
+    logs = append_logs("alpha", [{"step": step} for step in range(5)])
+    append_log("gamma", {"step": 0})
+    create_log_index("alpha", "step")
+    bundle_path = tmp_path / "store.tar.gz"
+
+    exported = bundle.export_store(str(bundle_path))
+    assert (exported["strategies"], exported["revisions"], exported["logs"]) == (3, 2, 6)
+
+    monkeypatch.chdir(tmp_path / "target")
+    monkeypatch.setenv("PSA_STORE_BACKEND", "sqlite")
+    imported = bundle.import_store(str(bundle_path), jobs=2)
+    assert imported == {
+        "input": str(bundle_path),
+        "backend": "sqlite",
+        "strategies": 3,
+        "revisions": 2,
+        "logs": 6,
+    }
+    assert strategy_history("alpha") == history
+    assert diff_strategy("alpha")["market_mode"] == {"from": "bull", "to": "bear"}
+    assert show_strategy("alpha", revision=2)["strategy"]["market_mode"] == "bull"
+    assert [row["log_id"] for row in list_logs("alpha")] == [row["log_id"] for row in logs]
+    assert query_logs("alpha", where=["step=3"])[0]["payload"] == {"step": 3}
+    assert list_strategies()["strategies"][2]["revision"] == 1
+
+    with pytest.raises(CliDomainError) as excinfo:
+        bundle.import_store(str(bundle_path))
+    assert excinfo.value.error_code == "import_target_not_empty"
+
+    # Version 1 bundles carry no revision members and still import.
+    monkeypatch.setattr(bundle, "BUNDLE_VERSION", 1)
+    with monkeypatch.context() as patched:
+        patched.chdir(tmp_path / "source")
+        patched.delenv("PSA_STORE_BACKEND")
+        patched.setattr("psa_cli.store.iter_earlier_revisions", lambda backend, record: iter(()))
+        original_add = bundle._add_member
+
+        def add_v1_member(archive, name, data):
+            if name == bundle.BUNDLE_MANIFEST:
+                manifest = json.loads(data)
+                del manifest["revisions"]
+                data = json.dumps(manifest).encode("utf-8")
+            original_add(archive, name, data)
+
+        patched.setattr(bundle, "_add_member", add_v1_member)
+        bundle.export_store(str(tmp_path / "v1.tar.gz"))
+    monkeypatch.setenv("PSA_HOME", str(tmp_path / "v1"))
+    assert bundle.import_store(str(tmp_path / "v1.tar.gz"))["revisions"] == 0
+    assert [row["revision"] for row in strategy_history("alpha")["revisions"]] == [3]
+
+    with pytest.raises(CliDomainError) as excinfo:
+        bundle.import_store(str(bundle_path))
+    assert excinfo.value.error_code == "import_target_not_empty"
+
+
+def test_store_import_rejects_tampered_and_truncated_bundles(monkeypatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    upsert_strategy("alpha", _strategy_payload())
+    append_log("alpha", {"step": 1})
+    bundle_path = tmp_path / "store.tar.gz"
+    bundle.export_store(str(bundle_path))
+    with tarfile.open(bundle_path, mode="r:gz") as archive:
+        members = [(member, archive.extractfile(member)) for member in archive]
+        members = [(member, handle.read() if handle else b"") for member, handle in members]
+
+    def rewrite(name: str, entries: list) -> str:
+        path = tmp_path / name
+        with tarfile.open(path, mode="w:gz", format=tarfile.PAX_FORMAT) as archive:
+            for member, data in entries:
+                member.size = len(data)
+                archive.addfile(member, io.BytesIO(data))
+        return str(path)
+
+    tampered = [
+        (member, data.replace(b'"step":1', b'"step":2') if "/logs/" in member.name else data)
+        for member, data in members
+    ]
+    for name, entries, message in (
+        ("tampered.tar.gz", tampered, "checksum mismatch"),
+        ("truncated.tar.gz", members[:-1], "before its manifest"),
+    ):
+        monkeypatch.setenv("PSA_HOME", str(tmp_path / name.split(".")[0]))
+        with pytest.raises(CliDomainError) as excinfo:
+            bundle.import_store(rewrite(name, entries), jobs=1)
+        assert excinfo.value.error_code == "invalid_bundle"
+        assert message in excinfo.value.message
+
+
+def test_store_import_rejects_malformed_members_before_writing_them(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    record = {
+        "strategy_id": "alpha",
+        "revision": 1,
+        "updated_at": "2026-01-01T00:00:00Z",
+        "strategy": _strategy_payload(),
+    }
+    log = {"log_id": "a1", "strategy_id": "alpha", "ts": "2026-01-01T00:00:00Z", "payload": {}}
+
+    def write_bundle(name: str, members: Sequence[tuple[str, object]]) -> str:
+        path = tmp_path / name
+        with tarfile.open(path, mode="w:gz", format=tarfile.PAX_FORMAT) as archive:
+            header = {"format": bundle.BUNDLE_FORMAT, "version": bundle.BUNDLE_VERSION}
+            bundle._add_member(archive, bundle.BUNDLE_HEADER, json.dumps(header).encode())
+            for member, value in members:
+                data = value if isinstance(value, bytes) else json.dumps(value).encode()
+                bundle._add_member(archive, f"strategies/alpha/{member}", data)
+        return str(path)
+
+    cases = (
+        ("no-body", [("strategy.json", {"strategy_id": "alpha"})], "invalid strategy entry"),
+        (
+            "bad-strategy",
+            [("strategy.json", {**record, "strategy": {"market_mode": "sideways"}})],
+            "invalid strategy entry",
+        ),
+        (
+            "log-not-object",
+            [("strategy.json", record), ("logs/000001.ndjson", b"[1]\n")],
+            "invalid log entry",
+        ),
+        (
+            "log-bad-ts",
+            [("strategy.json", record), ("logs/000001.ndjson", {**log, "ts": "yesterday"})],
+            "invalid log entry",
+        ),
+        (
+            "index-traversal",
+            [("strategy.json", record), ("indexes.json", ["../../../../pwned"])],
+            "invalid index field",
+        ),
+        (
+            "index-sql",
+            [("strategy.json", record), ("indexes.json", ["x'), 1) ; DROP TABLE strategies; --"])],
+            "invalid index field",
+        ),
+        ("index-number", [("strategy.json", record), ("indexes.json", [7])], "invalid index field"),
+    )
+    for backend in ("files", "sqlite"):
+        monkeypatch.setenv("PSA_STORE_BACKEND", backend)
+        for name, members, message in cases:
+            home = tmp_path / backend / name / "home"
+            monkeypatch.setenv("PSA_HOME", str(home))
+            with pytest.raises(CliDomainError) as excinfo:
+                bundle.import_store(write_bundle(f"{name}.tar.gz", members), jobs=1)
+            assert excinfo.value.error_code == "invalid_bundle"
+            assert message in excinfo.value.message
+            assert excinfo.value.details["entry"].startswith("strategies/alpha/")
+        assert not list(tmp_path.rglob("pwned*"))
+
+
+def test_strategy_history_keeps_revisions_as_deduplicated_blobs(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    original = _strategy_payload()
+    changed = _strategy_payload()
+    changed["price_segments"] = [
+        {"price_low": 10_000.0, "price_high": 20_000.0, "weight": 50.0},
+        {"price_low": 20_000.0, "price_high": 30_000.0, "weight": 50.0},
+    ]
+    for payload in (original, changed, original):
+        upsert_strategy("main", payload)
+
+    history = strategy_history("main")["revisions"]
+    assert [entry["revision"] for entry in history] == [1, 2, 3]
+    assert history[0]["content_hash"] == history[2]["content_hash"]
+    assert history[0]["content_hash"] != history[1]["content_hash"]
+    assert len(list((tmp_path / ".psa" / "blobs").glob("*/*.json"))) == 2
+    assert show_strategy("main", revision=2)["strategy"] == changed
+
+    latest = diff_strategy("main")
+    assert latest["from"]["revision"] == 2
+    assert latest["to"] == {"revision": 3, "content_hash": history[2]["content_hash"]}
+    assert latest["price_segments"]["removed"] == [
+        {"price_low": 20_000.0, "price_high": 30_000.0, "weight": 50.0}
+    ]
+    assert latest["price_segments"]["changed"][0]["to"]["weight"] == 100.0
+    assert diff_strategy("main", from_revision=1, to_revision=3)["identical"] is True
+
+    with pytest.raises(CliDomainError) as excinfo:
+        show_strategy("main", revision=4)
+    assert excinfo.value.error_code == "revision_not_found"
+
+
+def test_strategy_history_starts_at_current_revision_without_index(
+    monkeypatch, tmp_path: Path
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    upsert_strategy("main", _strategy_payload())
+    (tmp_path / ".psa" / "strategies" / "main" / "revisions.ndjson").unlink()
+
+    history = strategy_history("main")["revisions"]
+    assert [entry["revision"] for entry in history] == [1]
+    assert diff_strategy("main")["identical"] is True
+
+
 def test_exclusive_lock_times_out_when_other_process_holds_lock(tmp_path: Path) -> None:
     lock_path = tmp_path / ".psa" / "strategies" / "main" / ".lock"
     ready_path = tmp_path / "ready"
@@ -92,3 +717,29 @@ def test_exclusive_lock_times_out_when_other_process_holds_lock(tmp_path: Path)
         if process.is_alive():
             process.terminate()
             process.join(timeout=2.0)
+
+
+def test_shared_lock_waits_for_writer_and_records_contention(tmp_path: Path) -> None:
+    lock_path = tmp_path / ".psa" / "strategies" / "main" / ".lock"
+    ready_path = tmp_path / "ready"
+    reset_lock_events()
+
+    process = Process(target=_hold_lock_for_test, args=(str(lock_path), str(ready_path)))
+    process.start()
+    try:
+        for _ in range(50):
+            if ready_path.exists():
+                break
+            time.sleep(0.01)
+        with shared_lock(lock_path, timeout_seconds=2.0):
+            with shared_lock(lock_path, timeout_seconds=0.05):
+                pass
+    finally:
+        process.join(timeout=2.0)
+
+    nested, waited = lock_events()
+    assert nested["mode"] == "shared"
+    assert nested["contended"] is False
+    assert waited["mode"] == "shared"
+    assert waited["contended"] is True
+    assert 0 < waited["wait_ms"] < 2000
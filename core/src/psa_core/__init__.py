@@ -1,20 +1,65 @@
-from psa_core.engine import (
-    build_rows_from_ranges,
-    evaluate_point,
-    evaluate_portfolio,
-    evaluate_rows,
-    evaluate_rows_from_ranges,
-)
-from psa_core.types import (
-    EvaluationRow,
-    MarketMode,
-    ObservationRow,
-    PortfolioEvaluation,
-    PortfolioObservation,
-    PriceSegment,
-    StrategySpec,
-    TimeSegment,
-)
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from psa_core.diff import SegmentDiff, StrategyDiff, diff_strategies
+    from psa_core.engine import (
+        build_rows_from_ranges,
+        evaluate_point,
+        evaluate_portfolio,
+        evaluate_rows,
+        evaluate_rows_from_ranges,
+        iter_evaluate_rows,
+        iter_evaluate_rows_from_ranges,
+        iter_rows_from_ranges,
+        target_asset_amount,
+        target_share_curve,
+    )
+    from psa_core.price_history import PriceHistory, write_price_history
+    from psa_core.surface import TargetShareSurface
+    from psa_core.types import (
+        EvaluationRow,
+        MarketMode,
+        ObservationRow,
+        PortfolioEvaluation,
+        PortfolioObservation,
+        PriceSegment,
+        ShareCurve,
+        StrategySpec,
+        TimeSegment,
+    )
+
+# Public names are resolved on first access, so importing one submodule (e.g. `psa_core.types`)
+# does not load the engine and price history modules as well.
+_EXPORT_MODULES = {
+    "MarketMode": "psa_core.types",
+    "PriceSegment": "psa_core.types",
+    "TimeSegment": "psa_core.types",
+    "StrategySpec": "psa_core.types",
+    "ObservationRow": "psa_core.types",
+    "EvaluationRow": "psa_core.types",
+    "PortfolioObservation": "psa_core.types",
+    "PortfolioEvaluation": "psa_core.types",
+    "ShareCurve": "psa_core.types",
+    "build_rows_from_ranges": "psa_core.engine",
+    "evaluate_portfolio": "psa_core.engine",
+    "evaluate_point": "psa_core.engine",
+    "evaluate_rows": "psa_core.engine",
+    "evaluate_rows_from_ranges": "psa_core.engine",
+    "iter_evaluate_rows": "psa_core.engine",
+    "iter_evaluate_rows_from_ranges": "psa_core.engine",
+    "iter_rows_from_ranges": "psa_core.engine",
+    "target_asset_amount": "psa_core.engine",
+    "target_share_curve": "psa_core.engine",
+    "SegmentDiff": "psa_core.diff",
+    "StrategyDiff": "psa_core.diff",
+    "diff_strategies": "psa_core.diff",
+    "TargetShareSurface": "psa_core.surface",
+    "PriceHistory": "psa_core.price_history",
+    "write_price_history": "psa_core.price_history",
+}
 
 __all__ = [
     "MarketMode",
@@ -25,9 +70,34 @@ __all__ = [
     "EvaluationRow",
     "PortfolioObservation",
     "PortfolioEvaluation",
+    "ShareCurve",
     "build_rows_from_ranges",
     "evaluate_portfolio",
     "evaluate_point",
     "evaluate_rows",
     "evaluate_rows_from_ranges",
+    "iter_evaluate_rows",
+    "iter_evaluate_rows_from_ranges",
+    "iter_rows_from_ranges",
+    "target_asset_amount",
+    "target_share_curve",
+    "SegmentDiff",
+    "StrategyDiff",
+    "diff_strategies",
+    "TargetShareSurface",
+    "PriceHistory",
+    "write_price_history",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module 'psa_core' has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -3,11 +3,13 @@ from __future__ import annotations
 from collections.abc import Mapping, Sequence
 from typing import Any
 
+from psa_core.diff import StrategyDiff
 from psa_core.engine import (
     evaluate_point,
     evaluate_portfolio,
     evaluate_rows,
     evaluate_rows_from_ranges,
+    target_share_curve,
 )
 from psa_core.types import (
     EvaluationRow,
@@ -15,6 +17,7 @@ from psa_core.types import (
     PortfolioEvaluation,
     PortfolioObservation,
     PriceSegment,
+    ShareCurve,
     StrategySpec,
     TimeSegment,
 )
@@ -125,23 +128,34 @@ def parse_strategy(payload: Mapping[str, Any]) -> StrategySpec:
     return strategy
 
 
+def _request_strategy(obj: Mapping[str, Any], strategy: StrategySpec | None) -> StrategySpec:
+    # Callers holding an already parsed and validated strategy skip the payload's copy.
+    if strategy is not None:
+        return strategy
+    return parse_strategy(_ensure_mapping(obj.get("strategy"), name="strategy"))
+
+
 def parse_observation_row(payload: Mapping[str, Any]) -> ObservationRow:
     obj = _ensure_mapping(payload, name="row")
     return ObservationRow(timestamp=_str_field(obj, "timestamp"), price=_float_field(obj, "price"))
 
 
-def read_evaluate_point_request(payload: Mapping[str, Any]) -> tuple[StrategySpec, ObservationRow]:
+def read_evaluate_point_request(
+    payload: Mapping[str, Any], *, strategy: StrategySpec | None = None
+) -> tuple[StrategySpec, ObservationRow]:
     obj = _ensure_mapping(payload, name="request")
-    strategy = parse_strategy(_ensure_mapping(obj.get("strategy"), name="strategy"))
+    strategy = _request_strategy(obj, strategy)
     row = ObservationRow(timestamp=_str_field(obj, "timestamp"), price=_float_field(obj, "price"))
     return strategy, row
 
 
 def read_evaluate_rows_request(
     payload: Mapping[str, Any],
+    *,
+    strategy: StrategySpec | None = None,
 ) -> tuple[StrategySpec, list[ObservationRow]]:
     obj = _ensure_mapping(payload, name="request")
-    strategy = parse_strategy(_ensure_mapping(obj.get("strategy"), name="strategy"))
+    strategy = _request_strategy(obj, strategy)
 
     raw_rows = _ensure_sequence(obj.get("rows"), name="rows")
     rows = [
@@ -153,9 +167,11 @@ def read_evaluate_rows_request(
 
 def read_evaluate_rows_ranges_request(
     payload: Mapping[str, Any],
+    *,
+    strategy: StrategySpec | None = None,
 ) -> tuple[StrategySpec, dict[str, Any]]:
     obj = _ensure_mapping(payload, name="request")
-    strategy = parse_strategy(_ensure_mapping(obj.get("strategy"), name="strategy"))
+    strategy = _request_strategy(obj, strategy)
 
     params = {
         "price_start": _float_field(obj, "price_start"),
@@ -165,15 +181,34 @@ def read_evaluate_rows_ranges_request(
         "time_end": _str_field(obj, "time_end"),
         "time_steps": _int_field(obj, "time_steps"),
         "include_price_breakpoints": _bool_field(obj, "include_price_breakpoints", True),
+        "tolerance": _optional_float_field(obj, "tolerance"),
     }
     return strategy, params
 
 
+def read_evaluate_curve_request(
+    payload: Mapping[str, Any],
+    *,
+    strategy: StrategySpec | None = None,
+) -> tuple[StrategySpec, list[str]]:
+    obj = _ensure_mapping(payload, name="request")
+    strategy = _request_strategy(obj, strategy)
+    raw_timestamps = _ensure_sequence(obj.get("timestamps"), name="timestamps")
+    timestamps: list[str] = []
+    for idx, value in enumerate(raw_timestamps):
+        if not isinstance(value, str):
+            raise ContractError(f"field 'timestamps[{idx}]' must be a string")
+        timestamps.append(value)
+    return strategy, timestamps
+
+
 def read_evaluate_portfolio_request(
     payload: Mapping[str, Any],
+    *,
+    strategy: StrategySpec | None = None,
 ) -> tuple[StrategySpec, PortfolioObservation]:
     obj = _ensure_mapping(payload, name="request")
-    strategy = parse_strategy(_ensure_mapping(obj.get("strategy"), name="strategy"))
+    strategy = _request_strategy(obj, strategy)
     observation = PortfolioObservation(
         timestamp=_str_field(obj, "timestamp"),
         price=_float_field(obj, "price"),
@@ -197,6 +232,59 @@ def row_to_dict(row: EvaluationRow) -> dict[str, Any]:
     }
 
 
+def share_curve_to_dict(curve: ShareCurve) -> dict[str, Any]:
+    return {
+        "timestamp": curve.timestamp,
+        "time_k": curve.time_k,
+        "knots": [{"price": price, "target_share": share} for price, share in curve.knots],
+    }
+
+
+def price_segment_to_dict(segment: PriceSegment) -> dict[str, Any]:
+    return {
+        "price_low": segment.price_low,
+        "price_high": segment.price_high,
+        "weight": segment.weight,
+    }
+
+
+def time_segment_to_dict(segment: TimeSegment) -> dict[str, Any]:
+    return {
+        "start_ts": segment.start_ts,
+        "end_ts": segment.end_ts,
+        "k_start": segment.k_start,
+        "k_end": segment.k_end,
+    }
+
+
+def strategy_diff_to_dict(diff: StrategyDiff) -> dict[str, Any]:
+    market_mode = None
+    if diff.market_mode is not None:
+        market_mode = {"from": diff.market_mode[0], "to": diff.market_mode[1]}
+    price = diff.price_segments
+    time = diff.time_segments
+    return {
+        "identical": diff.identical,
+        "market_mode": market_mode,
+        "price_segments": {
+            "added": [price_segment_to_dict(segment) for segment in price.added],
+            "removed": [price_segment_to_dict(segment) for segment in price.removed],
+            "changed": [
+                {"from": price_segment_to_dict(old), "to": price_segment_to_dict(new)}
+                for old, new in price.changed
+            ],
+        },
+        "time_segments": {
+            "added": [time_segment_to_dict(segment) for segment in time.added],
+            "removed": [time_segment_to_dict(segment) for segment in time.removed],
+            "changed": [
+                {"from": time_segment_to_dict(old), "to": time_segment_to_dict(new)}
+                for old, new in time.changed
+            ],
+        },
+    }
+
+
 def portfolio_to_dict(portfolio: PortfolioEvaluation) -> dict[str, Any]:
     return {
         "timestamp": portfolio.timestamp,
@@ -220,25 +308,44 @@ def portfolio_to_dict(portfolio: PortfolioEvaluation) -> dict[str, Any]:
     }
 
 
-def evaluate_point_payload(payload: Mapping[str, Any]) -> dict[str, Any]:
-    strategy, row = read_evaluate_point_request(payload)
+def evaluate_point_payload(
+    payload: Mapping[str, Any], *, strategy: StrategySpec | None = None
+) -> dict[str, Any]:
+    strategy, row = read_evaluate_point_request(payload, strategy=strategy)
     evaluated = evaluate_point(strategy=strategy, timestamp=row.timestamp, price=row.price)
     return {"row": row_to_dict(evaluated)}
 
 
-def evaluate_rows_payload(payload: Mapping[str, Any]) -> dict[str, Any]:
-    strategy, rows = read_evaluate_rows_request(payload)
+def evaluate_rows_payload(
+    payload: Mapping[str, Any], *, strategy: StrategySpec | None = None
+) -> dict[str, Any]:
+    strategy, rows = read_evaluate_rows_request(payload, strategy=strategy)
     evaluated = evaluate_rows(strategy=strategy, rows=rows)
     return {"rows": [row_to_dict(row) for row in evaluated]}
 
 
-def evaluate_rows_from_ranges_payload(payload: Mapping[str, Any]) -> dict[str, Any]:
-    strategy, params = read_evaluate_rows_ranges_request(payload)
-    evaluated = evaluate_rows_from_ranges(strategy=strategy, **params)
+def evaluate_rows_from_ranges_payload(
+    payload: Mapping[str, Any],
+    *,
+    strategy: StrategySpec | None = None,
+    max_rows: int | None = None,
+) -> dict[str, Any]:
+    strategy, params = read_evaluate_rows_ranges_request(payload, strategy=strategy)
+    evaluated = evaluate_rows_from_ranges(strategy=strategy, **params, max_rows=max_rows)
     return {"rows": [row_to_dict(row) for row in evaluated]}
 
 
-def evaluate_portfolio_payload(payload: Mapping[str, Any]) -> dict[str, Any]:
-    strategy, observation = read_evaluate_portfolio_request(payload)
+def evaluate_curve_payload(
+    payload: Mapping[str, Any], *, strategy: StrategySpec | None = None
+) -> dict[str, Any]:
+    strategy, timestamps = read_evaluate_curve_request(payload, strategy=strategy)
+    curves = [target_share_curve(strategy, timestamp) for timestamp in timestamps]
+    return {"curves": [share_curve_to_dict(curve) for curve in curves]}
+
+
+def evaluate_portfolio_payload(
+    payload: Mapping[str, Any], *, strategy: StrategySpec | None = None
+) -> dict[str, Any]:
+    strategy, observation = read_evaluate_portfolio_request(payload, strategy=strategy)
     portfolio = evaluate_portfolio(strategy=strategy, observation=observation)
     return {"portfolio": portfolio_to_dict(portfolio)}
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Sequence
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from psa_core.types import MarketMode, PriceSegment, StrategySpec, TimeSegment
+
+S = TypeVar("S", PriceSegment, TimeSegment)
+
+
+@dataclass(frozen=True, slots=True)
+class SegmentDiff(Generic[S]):
+    # Segments are matched by their range: price_low/price_high for price segments,
+    # start_ts/end_ts for time segments. A matched pair whose other fields differ is `changed`.
+    added: tuple[S, ...]
+    removed: tuple[S, ...]
+    changed: tuple[tuple[S, S], ...]
+
+    @property
+    def identical(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+@dataclass(frozen=True, slots=True)
+class StrategyDiff:
+    market_mode: tuple[MarketMode, MarketMode] | None
+    price_segments: SegmentDiff[PriceSegment]
+    time_segments: SegmentDiff[TimeSegment]
+
+    @property
+    def identical(self) -> bool:
+        return (
+            self.market_mode is None
+            and self.price_segments.identical
+            and self.time_segments.identical
+        )
+
+
+def _price_key(segment: PriceSegment) -> Hashable:
+    return (segment.price_low, segment.price_high)
+
+
+def _time_key(segment: TimeSegment) -> Hashable:
+    return (segment.start_ts, segment.end_ts)
+
+
+def _diff_segments(
+    old: Sequence[S], new: Sequence[S], key: Callable[[S], Hashable]
+) -> SegmentDiff[S]:
+    # Validated strategies have non-overlapping segments, so a range identifies one segment.
+    new_by_key = {key(segment): segment for segment in new}
+    old_keys = {key(segment) for segment in old}
+    removed: list[S] = []
+    changed: list[tuple[S, S]] = []
+    for segment in old:
+        match = new_by_key.get(key(segment))
+        if match is None:
+            removed.append(segment)
+        elif match != segment:
+            changed.append((segment, match))
+    added = [segment for segment in new if key(segment) not in old_keys]
+    return SegmentDiff(added=tuple(added), removed=tuple(removed), changed=tuple(changed))
+
+
+def diff_strategies(old: StrategySpec, new: StrategySpec) -> StrategyDiff:
+    market_mode = None if old.market_mode == new.market_mode else (old.market_mode, new.market_mode)
+    return StrategyDiff(
+        market_mode=market_mode,
+        price_segments=_diff_segments(old.price_segments, new.price_segments, _price_key),
+        time_segments=_diff_segments(old.time_segments, new.time_segments, _time_key),
+    )
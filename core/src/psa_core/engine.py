@@ -1,26 +1,42 @@
 from __future__ import annotations
 
 import math
-from collections.abc import Sequence
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from datetime import UTC, datetime
 
-from psa_core.math import compute_price_share, compute_time_coefficient, compute_virtual_price
+from psa_core.math import (
+    EPS,
+    compute_price_share,
+    compute_time_coefficient,
+    compute_virtual_price,
+)
 from psa_core.types import (
     EvaluationRow,
     ObservationRow,
     PortfolioEvaluation,
     PortfolioObservation,
     PriceSegment,
+    ShareCurve,
     StrategySpec,
 )
 from psa_core.validation import (
+    parse_iso8601_utc,
     validate_alignment_search_bounds,
     validate_observation,
     validate_portfolio_observation,
     validate_range_arguments,
+    validate_sampling_tolerance,
     validate_strategy,
 )
 
+ADAPTIVE_MAX_DEPTH = 8
+
+
+class GridLimitError(ValueError):
+    def __init__(self, limit: int) -> None:
+        super().__init__(f"adaptive grid exceeds {limit} rows; raise tolerance")
+        self.limit = limit
+
 
 def _linspace(start: float, end: float, steps: int) -> list[float]:
     if steps < 1:
@@ -85,6 +101,16 @@ def _portfolio_share(usd_amount: float, asset_amount: float, price: float) -> fl
     return float(asset_amount * price / denominator)
 
 
+def target_asset_amount(
+    target_share: float, *, price: float, usd_amount: float, asset_amount: float
+) -> float:
+    # Asset amount the portfolio holds once rebalanced to `target_share` at `price`; the same
+    # arithmetic as the target_asset_amount field of evaluate_portfolio.
+    portfolio_value_usd = usd_amount + asset_amount * price
+    target_asset_value_usd = target_share * portfolio_value_usd
+    return float(target_asset_value_usd / price)
+
+
 def _target_share_at_price(
     strategy: StrategySpec,
     *,
@@ -159,8 +185,9 @@ def _find_alignment_price(
     return float((left + right) * 0.5)
 
 
-def evaluate_point(strategy: StrategySpec, timestamp: str, price: float) -> EvaluationRow:
-    validate_strategy(strategy)
+def _evaluate_validated_point(
+    strategy: StrategySpec, timestamp: str, price: float
+) -> EvaluationRow:
     validate_observation(timestamp, price)
 
     time_k = compute_time_coefficient(timestamp, strategy.time_segments)
@@ -182,15 +209,25 @@ def evaluate_point(strategy: StrategySpec, timestamp: str, price: float) -> Eval
     )
 
 
-def evaluate_rows(strategy: StrategySpec, rows: Sequence[ObservationRow]) -> list[EvaluationRow]:
+def evaluate_point(strategy: StrategySpec, timestamp: str, price: float) -> EvaluationRow:
     validate_strategy(strategy)
-    output: list[EvaluationRow] = []
-    for row in rows:
-        output.append(evaluate_point(strategy=strategy, timestamp=row.timestamp, price=row.price))
-    return output
+    return _evaluate_validated_point(strategy, timestamp, price)
 
 
-def build_rows_from_ranges(
+def iter_evaluate_rows(
+    strategy: StrategySpec, rows: Iterable[ObservationRow]
+) -> Iterator[EvaluationRow]:
+    # Streaming counterpart of evaluate_rows: the strategy is validated once, up front,
+    # and rows are consumed and produced one at a time.
+    validate_strategy(strategy)
+    return (_evaluate_validated_point(strategy, row.timestamp, row.price) for row in rows)
+
+
+def evaluate_rows(strategy: StrategySpec, rows: Sequence[ObservationRow]) -> list[EvaluationRow]:
+    return list(iter_evaluate_rows(strategy, rows))
+
+
+def iter_rows_from_ranges(
     strategy: StrategySpec,
     *,
     price_start: float,
@@ -200,7 +237,13 @@ def build_rows_from_ranges(
     time_end: str,
     time_steps: int,
     include_price_breakpoints: bool = True,
-) -> list[ObservationRow]:
+    tolerance: float | None = None,
+    max_rows: int | None = None,
+) -> Iterator[ObservationRow]:
+    # Arguments are validated eagerly; the grid itself is produced one time step at a time,
+    # so only the price axis is held in memory. With a tolerance, price_steps and time_steps
+    # give the initial grid, which is refined into a non-uniform one (see _refine_axes);
+    # max_rows bounds that refinement and does not apply to uniform grids.
     validate_strategy(strategy)
     start_ts, end_ts = validate_range_arguments(
         price_start=price_start,
@@ -210,6 +253,7 @@ def build_rows_from_ranges(
         time_end=time_end,
         time_steps=time_steps,
     )
+    validate_sampling_tolerance(tolerance)
 
     price_points = _linspace(float(price_start), float(price_end), price_steps)
     if include_price_breakpoints:
@@ -218,22 +262,133 @@ def build_rows_from_ranges(
         price_points.extend(_price_breakpoints_in_range(strategy.price_segments, low, high))
 
     descending_price = float(price_end) < float(price_start)
-    unique_prices = _unique_sorted(price_points, reverse=descending_price)
+    if tolerance is None:
+        unique_prices = _unique_sorted(price_points, reverse=descending_price)
+        return _iter_grid(unique_prices, start_ts.timestamp(), end_ts.timestamp(), time_steps)
 
-    start_s = start_ts.timestamp()
-    end_s = end_ts.timestamp()
-    time_points = _linspace(start_s, end_s, time_steps)
-    time_datetimes = [datetime.fromtimestamp(point, tz=UTC) for point in time_points]
-    time_iso = [_to_iso_z(ts) for ts in time_datetimes]
+    prices, times = _refine_axes(
+        strategy,
+        _unique_sorted(price_points, reverse=False),
+        _linspace(start_ts.timestamp(), end_ts.timestamp(), time_steps),
+        tolerance=float(tolerance),
+        max_rows=max_rows,
+    )
+    if descending_price:
+        prices.reverse()
+    return _iter_axes(prices, times)
 
-    rows: list[ObservationRow] = []
-    for ts in time_iso:
-        for price in unique_prices:
-            rows.append(ObservationRow(timestamp=ts, price=price))
-    return rows
 
+def _iter_grid(
+    prices: Sequence[float], start_s: float, end_s: float, time_steps: int
+) -> Iterator[ObservationRow]:
+    # Same points as _linspace(start_s, end_s, time_steps), computed one at a time.
+    step_size = 0.0 if time_steps == 1 else (end_s - start_s) / float(time_steps - 1)
+    for idx in range(time_steps):
+        point = float(start_s) if time_steps == 1 else float(start_s + step_size * idx)
+        ts = _to_iso_z(datetime.fromtimestamp(point, tz=UTC))
+        for price in prices:
+            yield ObservationRow(timestamp=ts, price=price)
 
-def evaluate_rows_from_ranges(
+
+def _iter_axes(prices: Sequence[float], times: Sequence[float]) -> Iterator[ObservationRow]:
+    for point in times:
+        ts = _to_iso_z(datetime.fromtimestamp(point, tz=UTC))
+        for price in prices:
+            yield ObservationRow(timestamp=ts, price=price)
+
+
+def _refine_axis(
+    axis: list[float],
+    shares_at: Callable[[float], list[float]],
+    *,
+    tolerance: float,
+    min_width: float,
+    columns: int,
+    max_rows: int | None,
+) -> list[float]:
+    # Bisects every interval whose midpoint shares differ from the linear interpolation of its
+    # end points by more than `tolerance`, recursively, down to `min_width`. Each axis point
+    # becomes `columns` rows of the grid.
+    if len(axis) < 2:
+        return list(axis)
+    refined = [axis[0]]
+    left_shares = shares_at(axis[0])
+    for right in axis[1:]:
+        right_shares = shares_at(right)
+        stack = [(refined[-1], left_shares, right, right_shares)]
+        while stack:
+            low, low_shares, high, high_shares = stack.pop()
+            if abs(high - low) > min_width:
+                mid = (low + high) * 0.5
+                mid_shares = shares_at(mid)
+                if any(
+                    abs(value - (a + b) * 0.5) > tolerance
+                    for value, a, b in zip(mid_shares, low_shares, high_shares, strict=True)
+                ):
+                    stack.append((mid, mid_shares, high, high_shares))
+                    stack.append((low, low_shares, mid, mid_shares))
+                    continue
+            refined.append(high)
+            if max_rows is not None and (len(refined) + len(stack)) * columns > max_rows:
+                raise GridLimitError(max_rows)
+        left_shares = right_shares
+    return refined
+
+
+def _refine_axes(
+    strategy: StrategySpec,
+    prices: list[float],
+    times: list[float],
+    *,
+    tolerance: float,
+    max_rows: int | None,
+) -> tuple[list[float], list[float]]:
+    # Adaptive sampling for a tensor grid: the price axis is refined against every sampled
+    # time and the time axis against every sampled price, alternating until neither changes.
+    # Intervals are split at most ADAPTIVE_MAX_DEPTH times relative to the initial grid.
+    time_k_cache: dict[float, float] = {}
+
+    def time_k(point: float) -> float:
+        value = time_k_cache.get(point)
+        if value is None:
+            ts = _to_iso_z(datetime.fromtimestamp(point, tz=UTC))
+            value = compute_time_coefficient(ts, strategy.time_segments)
+            time_k_cache[point] = value
+        return value
+
+    def shares_at_price(price: float) -> list[float]:
+        return [_target_share_at_price(strategy, price=price, time_k=time_k(t)) for t in times]
+
+    def shares_at_time(point: float) -> list[float]:
+        k = time_k(point)
+        return [_target_share_at_price(strategy, price=price, time_k=k) for price in prices]
+
+    scale = float(2**ADAPTIVE_MAX_DEPTH)
+    min_price_width = abs(prices[-1] - prices[0]) / max(len(prices) - 1, 1) / scale
+    min_time_width = abs(times[-1] - times[0]) / max(len(times) - 1, 1) / scale
+    while True:
+        size = (len(prices), len(times))
+        prices = _refine_axis(
+            prices,
+            shares_at_price,
+            tolerance=tolerance,
+            min_width=min_price_width,
+            columns=len(times),
+            max_rows=max_rows,
+        )
+        times = _refine_axis(
+            times,
+            shares_at_time,
+            tolerance=tolerance,
+            min_width=min_time_width,
+            columns=len(prices),
+            max_rows=max_rows,
+        )
+        if (len(prices), len(times)) == size:
+            return prices, times
+
+
+def build_rows_from_ranges(
     strategy: StrategySpec,
     *,
     price_start: float,
@@ -243,8 +398,39 @@ def evaluate_rows_from_ranges(
     time_end: str,
     time_steps: int,
     include_price_breakpoints: bool = True,
-) -> list[EvaluationRow]:
-    rows = build_rows_from_ranges(
+    tolerance: float | None = None,
+    max_rows: int | None = None,
+) -> list[ObservationRow]:
+    return list(
+        iter_rows_from_ranges(
+            strategy,
+            price_start=price_start,
+            price_end=price_end,
+            price_steps=price_steps,
+            time_start=time_start,
+            time_end=time_end,
+            time_steps=time_steps,
+            include_price_breakpoints=include_price_breakpoints,
+            tolerance=tolerance,
+            max_rows=max_rows,
+        )
+    )
+
+
+def iter_evaluate_rows_from_ranges(
+    strategy: StrategySpec,
+    *,
+    price_start: float,
+    price_end: float,
+    price_steps: int,
+    time_start: str,
+    time_end: str,
+    time_steps: int,
+    include_price_breakpoints: bool = True,
+    tolerance: float | None = None,
+    max_rows: int | None = None,
+) -> Iterator[EvaluationRow]:
+    rows = iter_rows_from_ranges(
         strategy,
         price_start=price_start,
         price_end=price_end,
@@ -253,8 +439,60 @@ def evaluate_rows_from_ranges(
         time_end=time_end,
         time_steps=time_steps,
         include_price_breakpoints=include_price_breakpoints,
+        tolerance=tolerance,
+        max_rows=max_rows,
+    )
+    return iter_evaluate_rows(strategy, rows)
+
+
+def evaluate_rows_from_ranges(
+    strategy: StrategySpec,
+    *,
+    price_start: float,
+    price_end: float,
+    price_steps: int,
+    time_start: str,
+    time_end: str,
+    time_steps: int,
+    include_price_breakpoints: bool = True,
+    tolerance: float | None = None,
+    max_rows: int | None = None,
+) -> list[EvaluationRow]:
+    return list(
+        iter_evaluate_rows_from_ranges(
+            strategy,
+            price_start=price_start,
+            price_end=price_end,
+            price_steps=price_steps,
+            time_start=time_start,
+            time_end=time_end,
+            time_steps=time_steps,
+            include_price_breakpoints=include_price_breakpoints,
+            tolerance=tolerance,
+            max_rows=max_rows,
+        )
+    )
+
+
+def target_share_curve(strategy: StrategySpec, timestamp: str) -> ShareCurve:
+    # At a fixed timestamp the virtual price is price * k (bull) or price / k (bear), and the
+    # share is piecewise linear in the virtual price with knots at the segment bounds. The
+    # curve is therefore exact with one knot per distinct bound, mapped back to price.
+    validate_strategy(strategy)
+    parse_iso8601_utc(timestamp)
+    time_k = compute_time_coefficient(timestamp, strategy.time_segments)
+    bounds = {float(segment.price_low) for segment in strategy.price_segments} | {
+        float(segment.price_high) for segment in strategy.price_segments
+    }
+    safe_k = max(time_k, EPS)
+    knots = tuple(
+        (
+            float(bound * safe_k if strategy.market_mode == "bear" else bound / safe_k),
+            float(compute_price_share(bound, strategy.price_segments, strategy.market_mode)),
+        )
+        for bound in sorted(bounds)
     )
-    return evaluate_rows(strategy=strategy, rows=rows)
+    return ShareCurve(timestamp=timestamp, time_k=float(time_k), knots=knots)
 
 
 def evaluate_portfolio(
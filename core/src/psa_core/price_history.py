@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from types import TracebackType
+
+from psa_core.types import ObservationRow
+from psa_core.validation import parse_iso8601_utc
+
+# Binary price history (.psaprice), little-endian:
+#   header  32 bytes: magic b"PSAPRICE", u16 version, u16 flags (0), u32 reserved (0),
+#                     u64 row count, 8 reserved bytes (0)
+#   column  int64[count]   observation timestamps, milliseconds since the Unix epoch (UTC)
+#   column  float64[count] observation prices
+# Both columns start on 8-byte boundaries, so they are read as memoryview casts over an mmap
+# without copying.
+
+PRICE_HISTORY_MAGIC = b"PSAPRICE"
+PRICE_HISTORY_VERSION = 1
+_HEADER = struct.Struct("<8sHHIQ8x")
+_WRITE_CHUNK_ROWS = 65_536
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def _require_little_endian() -> None:
+    if sys.byteorder != "little":
+        raise ValueError("price history files require a little-endian host")
+
+
+def _timestamp_ms_to_iso(value: int) -> str:
+    return (_EPOCH + timedelta(milliseconds=value)).isoformat().replace("+00:00", "Z")
+
+
+def timestamp_to_epoch_ms(timestamp: str) -> int:
+    return (parse_iso8601_utc(timestamp) - _EPOCH) // timedelta(milliseconds=1)
+
+
+class PriceHistory:
+    def __init__(self, buffer: memoryview, *, owner: mmap.mmap | None = None) -> None:
+        _require_little_endian()
+        if len(buffer) < _HEADER.size:
+            raise ValueError("price history is truncated: missing header")
+        magic, version, flags, _, count = _HEADER.unpack_from(buffer, 0)
+        if magic != PRICE_HISTORY_MAGIC:
+            raise ValueError("not a price history file: bad magic")
+        if version != PRICE_HISTORY_VERSION or flags != 0:
+            raise ValueError(f"unsupported price history version {version}")
+        expected_size = _HEADER.size + count * 16
+        if len(buffer) != expected_size:
+            raise ValueError(
+                f"price history size mismatch: expected {expected_size} bytes, got {len(buffer)}"
+            )
+
+        prices_offset = _HEADER.size + count * 8
+        self._buffer = buffer
+        self._owner = owner
+        self.timestamps_ms = buffer[_HEADER.size : prices_offset].cast("q")
+        self.prices = buffer[prices_offset:expected_size].cast("d")
+
+    @classmethod
+    def open(cls, path: str | os.PathLike[str]) -> PriceHistory:
+        with open(path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size == 0:
+                raise ValueError("price history is truncated: missing header")
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        try:
+            return cls(view, owner=mapped)
+        except BaseException:
+            view.release()
+            mapped.close()
+            raise
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def iter_rows(self, start: int = 0, stop: int | None = None) -> Iterator[ObservationRow]:
+        end = len(self) if stop is None else min(stop, len(self))
+        timestamps = self.timestamps_ms
+        prices = self.prices
+        for idx in range(start, end):
+            yield ObservationRow(
+                timestamp=_timestamp_ms_to_iso(timestamps[idx]),
+                price=prices[idx],
+            )
+
+    def close(self) -> None:
+        for view in (self.timestamps_ms, self.prices, self._buffer):
+            view.release()
+        if self._owner is not None:
+            self._owner.close()
+            self._owner = None
+
+    def __enter__(self) -> PriceHistory:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def write_price_history(path: str | os.PathLike[str], rows: Iterable[tuple[int, float]]) -> int:
+    # Streams (epoch_ms, price) pairs to `path` in constant memory: timestamps go straight to
+    # the target after a placeholder header while prices are spooled to a temporary file,
+    # then appended, and the header is rewritten with the final count.
+    _require_little_endian()
+    target = Path(path)
+    count = 0
+    with open(target, "wb") as output, tempfile.TemporaryFile() as spool:
+        output.write(_HEADER.pack(PRICE_HISTORY_MAGIC, PRICE_HISTORY_VERSION, 0, 0, 0))
+        timestamps = array("q")
+        prices = array("d")
+        for timestamp_ms, price in rows:
+            timestamps.append(timestamp_ms)
+            prices.append(price)
+            if len(timestamps) >= _WRITE_CHUNK_ROWS:
+                count += len(timestamps)
+                timestamps.tofile(output)
+                prices.tofile(spool)
+                timestamps = array("q")
+                prices = array("d")
+        count += len(timestamps)
+        timestamps.tofile(output)
+        prices.tofile(spool)
+
+        spool.seek(0)
+        shutil.copyfileobj(spool, output)
+        output.seek(0)
+        output.write(_HEADER.pack(PRICE_HISTORY_MAGIC, PRICE_HISTORY_VERSION, 0, 0, count))
+    return count
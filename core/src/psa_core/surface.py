@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Iterator, Sequence
+
+from psa_core.diff import SegmentDiff, diff_strategies
+from psa_core.math import compute_price_share, compute_time_coefficient, compute_virtual_price
+from psa_core.types import EvaluationRow, PriceSegment, StrategySpec
+from psa_core.validation import validate_observation, validate_strategy
+
+
+def _total_weight(strategy: StrategySpec) -> float:
+    return math.fsum(float(segment.weight) for segment in strategy.price_segments)
+
+
+def _affected_span(diff: SegmentDiff[PriceSegment]) -> tuple[float, float] | None:
+    segments = [*diff.added, *diff.removed, *(side for pair in diff.changed for side in pair)]
+    if not segments:
+        return None
+    low = min(float(segment.price_low) for segment in segments)
+    high = max(float(segment.price_high) for segment in segments)
+    return low, high
+
+
+class TargetShareSurface:
+    # A strategy evaluated over a fixed price x time grid, keeping time_k per timestamp, base
+    # share per price and virtual price/target share per cell. `update` diffs the new strategy
+    # against the current one and recomputes only what the edit can change:
+    # - time_k is recomputed per timestamp (one call per timestamp, not per cell); timestamps
+    #   whose time_k changed get new virtual prices and target shares at every price;
+    # - at the other timestamps, cells whose virtual price lies between the lowest and highest
+    #   bound (old or new) of the added, removed and changed price segments get new target
+    #   shares. Above that span the edited segments contribute 0, below it their whole
+    #   normalized weights, which add up to the same share as long as the total weight is
+    #   unchanged.
+    # A market_mode change or a different total weight (every normalized weight moves)
+    # recomputes the whole surface.
+    __slots__ = ("_strategy", "_prices", "_timestamps", "_time_k", "_base", "_virtual", "_share")
+
+    def __init__(
+        self, strategy: StrategySpec, *, prices: Sequence[float], timestamps: Sequence[str]
+    ) -> None:
+        validate_strategy(strategy)
+        if not prices or not timestamps:
+            raise ValueError("surface prices and timestamps must not be empty")
+        # A cell is valid when its timestamp and price are, so each axis is checked once.
+        for timestamp in timestamps:
+            validate_observation(timestamp, prices[0])
+        for price in prices:
+            validate_observation(timestamps[0], price)
+        self._strategy = strategy
+        self._prices = [float(price) for price in prices]
+        self._timestamps = list(timestamps)
+        self._time_k: list[float] = []
+        self._base: list[float] = []
+        self._virtual: list[list[float]] = []
+        self._share: list[list[float]] = []
+        self._rebuild()
+
+    @property
+    def strategy(self) -> StrategySpec:
+        return self._strategy
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self._timestamps), len(self._prices)
+
+    def _price_share(self, price: float) -> float:
+        strategy = self._strategy
+        return float(compute_price_share(price, strategy.price_segments, strategy.market_mode))
+
+    def _compute_timestamp(self, time_index: int) -> None:
+        mode = self._strategy.market_mode
+        time_k = self._time_k[time_index]
+        virtual = [float(compute_virtual_price(price, time_k, mode)) for price in self._prices]
+        self._virtual[time_index] = virtual
+        self._share[time_index] = [self._price_share(price) for price in virtual]
+
+    def _rebuild(self) -> None:
+        segments = self._strategy.time_segments
+        self._time_k = [
+            float(compute_time_coefficient(timestamp, segments)) for timestamp in self._timestamps
+        ]
+        self._base = [self._price_share(price) for price in self._prices]
+        self._virtual = [[] for _ in self._timestamps]
+        self._share = [[] for _ in self._timestamps]
+        for time_index in range(len(self._timestamps)):
+            self._compute_timestamp(time_index)
+
+    def update(self, strategy: StrategySpec) -> int:
+        # Returns the number of cells whose target share was recomputed.
+        validate_strategy(strategy)
+        old = self._strategy
+        diff = diff_strategies(old, strategy)
+        self._strategy = strategy
+        if diff.identical:
+            return 0
+        time_count, price_count = self.shape
+        if diff.market_mode is not None or _total_weight(old) != _total_weight(strategy):
+            self._rebuild()
+            return time_count * price_count
+
+        moved: set[int] = set()
+        if not diff.time_segments.identical:
+            for time_index, timestamp in enumerate(self._timestamps):
+                time_k = float(compute_time_coefficient(timestamp, strategy.time_segments))
+                if time_k != self._time_k[time_index]:
+                    self._time_k[time_index] = time_k
+                    moved.add(time_index)
+
+        span = _affected_span(diff.price_segments)
+        if span is not None:
+            low, high = span
+            self._base = [
+                self._price_share(price) if low <= price <= high else share
+                for price, share in zip(self._prices, self._base, strict=True)
+            ]
+
+        recomputed = 0
+        for time_index in range(time_count):
+            if time_index in moved:
+                self._compute_timestamp(time_index)
+                recomputed += price_count
+                continue
+            if span is None:
+                continue
+            low, high = span
+            shares = self._share[time_index]
+            for price_index, price in enumerate(self._virtual[time_index]):
+                if low <= price <= high:
+                    shares[price_index] = self._price_share(price)
+                    recomputed += 1
+        return recomputed
+
+    def target_share(self, time_index: int, price_index: int) -> float:
+        return self._share[time_index][price_index]
+
+    def iter_rows(self) -> Iterator[EvaluationRow]:
+        # Same order as iter_evaluate_rows_from_ranges: one timestamp at a time, prices inner.
+        for time_index, timestamp in enumerate(self._timestamps):
+            time_k = self._time_k[time_index]
+            virtual = self._virtual[time_index]
+            shares = self._share[time_index]
+            for price_index, price in enumerate(self._prices):
+                yield EvaluationRow(
+                    timestamp=timestamp,
+                    price=price,
+                    time_k=time_k,
+                    virtual_price=virtual[price_index],
+                    base_share=self._base[price_index],
+                    target_share=shares[price_index],
+                )
@@ -44,6 +44,15 @@ class EvaluationRow:
     target_share: float
 
 
+@dataclass(frozen=True, slots=True)
+class ShareCurve:
+    # Target share by price at one timestamp: linear between consecutive (price, target_share)
+    # knots, constant below the first knot and above the last.
+    timestamp: str
+    time_k: float
+    knots: tuple[tuple[float, float], ...]
+
+
 @dataclass(frozen=True, slots=True)
 class PortfolioObservation:
     timestamp: str
@@ -167,3 +167,8 @@ def validate_range_arguments(
     start_ts = parse_iso8601_utc(time_start)
     end_ts = parse_iso8601_utc(time_end)
     return start_ts, end_ts
+
+
+def validate_sampling_tolerance(tolerance: float | None) -> None:
+    if tolerance is not None:
+        _require_positive("tolerance", tolerance)
@@ -7,10 +7,12 @@ import pytest
 from jsonschema import Draft202012Validator, FormatChecker, ValidationError, validate
 from psa_core.contracts import (
     ContractError,
+    evaluate_curve_payload,
     evaluate_point_payload,
     evaluate_portfolio_payload,
     evaluate_rows_from_ranges_payload,
     evaluate_rows_payload,
+    parse_strategy,
 )
 
 ROOT = Path(__file__).resolve().parents[2]
@@ -153,6 +155,15 @@ def test_rows_payload_matches_example_row_count() -> None:
     assert len(response["rows"]) == len(payload["rows"])
 
 
+def test_rows_payload_accepts_preparsed_strategy() -> None:
+    payload = _load_json(EXAMPLES / "batch_timeseries_rows.json")
+    strategy = parse_strategy(payload["strategy"])
+    expected = evaluate_rows_payload(payload)
+
+    request = {"rows": payload["rows"]}
+    assert evaluate_rows_payload(request, strategy=strategy) == expected
+
+
 def test_ranges_payload_includes_breakpoints() -> None:
     payload = _load_json(EXAMPLES / "range_timeseries_rows.json")
     response = evaluate_rows_from_ranges_payload(payload)
@@ -172,6 +183,20 @@ def test_ranges_payload_rejects_bool_steps_in_contract_adapter() -> None:
         evaluate_rows_from_ranges_payload(payload)
 
 
+def test_curve_payload_matches_schema_and_rejects_non_string_timestamps() -> None:
+    payload = _load_json(EXAMPLES / "share_curve.json")
+    request_schema = _load_json(SCHEMAS / "evaluate_curve.request.v1.json")
+    response_schema = _load_json(SCHEMAS / "evaluate_curve.response.v1.json")
+    validate({"timestamps": payload["timestamps"]}, request_schema, format_checker=FORMAT_CHECKER)
+    response = evaluate_curve_payload(payload)
+    validate(response, response_schema, format_checker=FORMAT_CHECKER)
+    assert len(response["curves"]) == len(payload["timestamps"])
+
+    payload["timestamps"] = [1_767_225_600]
+    with pytest.raises(ContractError, match="timestamps"):
+        evaluate_curve_payload(payload)
+
+
 def test_portfolio_payload_rejects_non_numeric_avg_entry_price() -> None:
     payload = _load_json(EXAMPLES / "evaluate_portfolio.json")
     payload["avg_entry_price"] = "oops"
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from psa_core import PriceSegment, StrategySpec, TimeSegment, diff_strategies
+from psa_core.contracts import strategy_diff_to_dict
+
+
+def _strategy(**overrides: object) -> StrategySpec:
+    fields: dict = {
+        "market_mode": "bear",
+        "price_segments": (
+            PriceSegment(price_low=10_000.0, price_high=20_000.0, weight=60.0),
+            PriceSegment(price_low=20_000.0, price_high=30_000.0, weight=40.0),
+        ),
+        "time_segments": (
+            TimeSegment(
+                start_ts="2026-01-01T00:00:00Z",
+                end_ts="2026-06-01T00:00:00Z",
+                k_start=1.0,
+                k_end=0.5,
+            ),
+        ),
+    }
+    fields.update(overrides)
+    return StrategySpec(**fields)
+
+
+def test_diff_of_identical_strategies_is_empty() -> None:
+    diff = diff_strategies(_strategy(), _strategy())
+    assert diff.identical
+    assert strategy_diff_to_dict(diff) == {
+        "identical": True,
+        "market_mode": None,
+        "price_segments": {"added": [], "removed": [], "changed": []},
+        "time_segments": {"added": [], "removed": [], "changed": []},
+    }
+
+
+def test_diff_matches_segments_by_range() -> None:
+    old = _strategy()
+    new = _strategy(
+        market_mode="bull",
+        price_segments=(
+            PriceSegment(price_low=20_000.0, price_high=30_000.0, weight=40.0),
+            PriceSegment(price_low=10_000.0, price_high=20_000.0, weight=50.0),
+            PriceSegment(price_low=30_000.0, price_high=40_000.0, weight=10.0),
+        ),
+        time_segments=(),
+    )
+    payload = strategy_diff_to_dict(diff_strategies(old, new))
+
+    assert payload["identical"] is False
+    assert payload["market_mode"] == {"from": "bear", "to": "bull"}
+    assert payload["price_segments"] == {
+        "added": [{"price_low": 30_000.0, "price_high": 40_000.0, "weight": 10.0}],
+        "removed": [],
+        "changed": [
+            {
+                "from": {"price_low": 10_000.0, "price_high": 20_000.0, "weight": 60.0},
+                "to": {"price_low": 10_000.0, "price_high": 20_000.0, "weight": 50.0},
+            }
+        ],
+    }
+    assert payload["time_segments"]["removed"] == [
+        {
+            "start_ts": "2026-01-01T00:00:00Z",
+            "end_ts": "2026-06-01T00:00:00Z",
+            "k_start": 1.0,
+            "k_end": 0.5,
+        }
+    ]
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import tracemalloc
+from datetime import datetime
+
 import pytest
 from psa_core import (
+    MarketMode,
     ObservationRow,
     PortfolioObservation,
     PriceSegment,
@@ -12,6 +16,10 @@ from psa_core import (
     evaluate_portfolio,
     evaluate_rows,
     evaluate_rows_from_ranges,
+    iter_evaluate_rows,
+    iter_rows_from_ranges,
+    target_asset_amount,
+    target_share_curve,
 )
 from psa_core.math import compute_time_coefficient
 
@@ -119,6 +127,28 @@ def test_evaluate_rows_is_deterministic_and_preserves_order() -> None:
     assert [row.timestamp for row in first] == [row.timestamp for row in rows]
 
 
+def test_iter_evaluate_rows_consumes_rows_lazily() -> None:
+    strategy = _bear_strategy()
+    consumed: list[int] = []
+
+    def rows():
+        for idx, price in enumerate((47_000, 44_000, 41_000)):
+            consumed.append(idx)
+            yield ObservationRow(timestamp="2026-02-01T00:00:00Z", price=price)
+
+    evaluated = iter_evaluate_rows(strategy, rows())
+    assert consumed == []
+    first = next(evaluated)
+    assert consumed == [0]
+    assert [first, *evaluated] == evaluate_rows(
+        strategy,
+        [
+            ObservationRow(timestamp="2026-02-01T00:00:00Z", price=p)
+            for p in (47_000, 44_000, 41_000)
+        ],
+    )
+
+
 def test_build_rows_from_ranges_includes_price_breakpoints() -> None:
     strategy = _bear_strategy()
     rows = build_rows_from_ranges(
@@ -140,6 +170,106 @@ def test_build_rows_from_ranges_includes_price_breakpoints() -> None:
     assert len(rows) == 3 * len(prices_first_ts)
 
 
+def test_iter_rows_from_ranges_matches_build_and_stays_bounded() -> None:
+    strategy = _bear_strategy()
+    params = {
+        "price_start": 60_000,
+        "price_end": 25_000,
+        "price_steps": 4,
+        "time_start": "2026-02-01T00:00:00Z",
+        "time_end": "2026-04-01T00:00:00Z",
+        "time_steps": 3,
+    }
+    assert list(iter_rows_from_ranges(strategy, **params)) == build_rows_from_ranges(
+        strategy, **params
+    )
+
+    with pytest.raises(ValueError):
+        iter_rows_from_ranges(strategy, **{**params, "time_steps": 0})
+
+    params.update(price_steps=100, time_steps=1_000)
+    tracemalloc.start()
+    try:
+        count = sum(1 for _ in iter_rows_from_ranges(strategy, **params))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert count >= 100_000
+    assert peak < 1_000_000
+
+
+def test_build_rows_from_ranges_refines_where_share_bends() -> None:
+    strategy = _bear_strategy()
+    params = {
+        "price_start": 70_000,
+        "price_end": 20_000,
+        "price_steps": 3,
+        "time_start": "2025-12-01T00:00:00Z",
+        "time_end": "2026-07-01T00:00:00Z",
+        "time_steps": 3,
+    }
+    rows = build_rows_from_ranges(strategy, **params, tolerance=0.01)
+    prices = [row.price for row in rows if row.timestamp == rows[0].timestamp]
+    timestamps = list(dict.fromkeys(row.timestamp for row in rows))
+    assert len(rows) == len(prices) * len(timestamps)
+    assert prices == sorted(prices, reverse=True)
+    assert (prices[0], prices[-1]) == (70_000, 20_000)
+
+    # Samples cluster where the share bends, so the grid is non-uniform.
+    ordered = sorted(prices)
+    gaps = [high - low for low, high in zip(ordered, ordered[1:], strict=False)]
+    assert max(gaps) >= 4 * min(gaps)
+
+    # Linear interpolation between neighbouring prices stays close to the exact share.
+    for timestamp in timestamps:
+        for low, high in zip(ordered, ordered[1:], strict=False):
+            mid = (low + high) * 0.5
+            exact = evaluate_point(strategy, timestamp, mid).target_share
+            ends = [evaluate_point(strategy, timestamp, p).target_share for p in (low, high)]
+            assert abs(exact - sum(ends) * 0.5) <= 0.01
+
+    # A uniform grid needs the finest spacing of both axes everywhere.
+    seconds = [datetime.fromisoformat(ts.replace("Z", "+00:00")).timestamp() for ts in timestamps]
+    time_gaps = [later - earlier for earlier, later in zip(seconds, seconds[1:], strict=False)]
+    uniform_prices = 50_000 / min(gaps) + 1
+    uniform_times = (seconds[-1] - seconds[0]) / min(time_gaps) + 1
+    assert len(rows) * 3 < uniform_prices * uniform_times
+    with pytest.raises(ValueError):
+        build_rows_from_ranges(strategy, **params, tolerance=0.0)
+
+
+@pytest.mark.parametrize("market_mode", ["bear", "bull"])
+def test_target_share_curve_is_exact_between_knots(market_mode: MarketMode) -> None:
+    strategy = StrategySpec(
+        market_mode=market_mode,
+        price_segments=_bear_strategy().price_segments,
+        time_segments=_bear_strategy().time_segments,
+    )
+    for timestamp in ("2025-12-01T00:00:00Z", "2026-03-15T12:00:00Z", "2026-07-01T00:00:00Z"):
+        curve = target_share_curve(strategy, timestamp)
+        assert curve.time_k == compute_time_coefficient(timestamp, strategy.time_segments)
+        prices = [price for price, _ in curve.knots]
+        assert len(curve.knots) == 5
+        assert prices == sorted(prices)
+
+        for price, share in curve.knots:
+            assert evaluate_point(strategy, timestamp, price).target_share == pytest.approx(share)
+        pairs = zip(curve.knots, curve.knots[1:], strict=False)
+        for (low, low_share), (high, high_share) in pairs:
+            for ratio in (0.25, 0.5, 0.9):
+                price = low + (high - low) * ratio
+                expected = low_share + (high_share - low_share) * ratio
+                exact = evaluate_point(strategy, timestamp, price).target_share
+                assert exact == pytest.approx(expected, abs=1e-9)
+
+        below = evaluate_point(strategy, timestamp, prices[0] * 0.5).target_share
+        above = evaluate_point(strategy, timestamp, prices[-1] * 2.0).target_share
+        assert (below, above) == pytest.approx((curve.knots[0][1], curve.knots[-1][1]))
+
+    with pytest.raises(ValueError):
+        target_share_curve(strategy, "2026-01-01T00:00:00")
+
+
 def test_evaluate_rows_from_ranges_calls_evaluate_rows_flow() -> None:
     strategy = _bear_strategy()
     evaluated = evaluate_rows_from_ranges(
@@ -239,6 +369,20 @@ def test_evaluate_portfolio_computes_core_fields() -> None:
     assert evaluated.avg_entry_pnl_pct == pytest.approx((42_000 / 38_000) - 1.0)
 
 
+def test_target_asset_amount_matches_evaluate_portfolio() -> None:
+    observation = PortfolioObservation(
+        timestamp="2026-03-01T00:00:00Z", price=42_000, usd_amount=15_000, asset_amount=0.5
+    )
+
+    evaluated = evaluate_portfolio(_bear_strategy(), observation)
+    assert evaluated.target_asset_amount == target_asset_amount(
+        evaluated.target_share,
+        price=observation.price,
+        usd_amount=observation.usd_amount,
+        asset_amount=observation.asset_amount,
+    )
+
+
 def test_evaluate_portfolio_avg_entry_fields_are_null_when_not_provided() -> None:
     strategy = _bear_strategy()
     observation = PortfolioObservation(
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from psa_core import ObservationRow, PriceHistory, write_price_history
+from psa_core.price_history import timestamp_to_epoch_ms
+
+
+def test_price_history_round_trips_through_mmap(tmp_path: Path) -> None:
+    path = tmp_path / "history.psaprice"
+    rows = [
+        ("2026-01-01T00:00:00Z", 45_000.0),
+        ("2026-01-01T00:00:01.500000Z", 45_010.25),
+        ("2026-01-02T00:00:00Z", 44_000.0),
+    ]
+    written = write_price_history(path, ((timestamp_to_epoch_ms(ts), price) for ts, price in rows))
+    assert written == 3
+    assert path.stat().st_size == 32 + 3 * 16
+
+    with PriceHistory.open(path) as history:
+        assert len(history) == 3
+        assert history.prices.tolist() == [price for _, price in rows]
+        assert list(history.iter_rows(start=1)) == [
+            ObservationRow(timestamp=ts, price=price) for ts, price in rows[1:]
+        ]
+
+
+def test_price_history_rejects_foreign_and_truncated_files(tmp_path: Path) -> None:
+    foreign = tmp_path / "foreign.bin"
+    foreign.write_bytes(b"NOTPRICE" + bytes(24))
+    with pytest.raises(ValueError, match="bad magic"):
+        PriceHistory.open(foreign)
+
+    path = tmp_path / "history.psaprice"
+    write_price_history(path, [(0, 1.0), (1, 2.0)])
+    path.write_bytes(path.read_bytes()[:-8])
+    with pytest.raises(ValueError, match="size mismatch"):
+        PriceHistory.open(path)
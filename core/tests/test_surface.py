@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+from psa_core import (
+    ObservationRow,
+    PriceSegment,
+    StrategySpec,
+    TargetShareSurface,
+    TimeSegment,
+    evaluate_rows,
+)
+
+PRICES = [float(price) for price in range(5_000, 40_001, 2_500)]
+TIMESTAMPS = [
+    "2025-12-01T00:00:00Z",
+    "2026-01-01T00:00:00Z",
+    "2026-02-15T00:00:00Z",
+    "2026-04-01T00:00:00Z",
+    "2026-07-01T00:00:00Z",
+]
+
+
+def _strategy(**overrides: object) -> StrategySpec:
+    fields: dict = {
+        "market_mode": "bear",
+        "price_segments": (
+            PriceSegment(price_low=10_000.0, price_high=20_000.0, weight=60.0),
+            PriceSegment(price_low=20_000.0, price_high=30_000.0, weight=40.0),
+        ),
+        "time_segments": (
+            TimeSegment(
+                start_ts="2026-01-01T00:00:00Z",
+                end_ts="2026-03-01T00:00:00Z",
+                k_start=1.0,
+                k_end=0.8,
+            ),
+        ),
+    }
+    fields.update(overrides)
+    return StrategySpec(**fields)
+
+
+def _assert_matches_full_evaluation(surface: TargetShareSurface) -> None:
+    rows = [ObservationRow(timestamp=ts, price=price) for ts in TIMESTAMPS for price in PRICES]
+    expected = evaluate_rows(surface.strategy, rows)
+    actual = list(surface.iter_rows())
+    assert len(actual) == len(expected)
+    for got, want in zip(actual, expected, strict=True):
+        assert (got.timestamp, got.price, got.time_k) == (want.timestamp, want.price, want.time_k)
+        assert got.virtual_price == pytest.approx(want.virtual_price, rel=1e-12)
+        assert got.base_share == pytest.approx(want.base_share, abs=1e-12)
+        assert got.target_share == pytest.approx(want.target_share, abs=1e-12)
+
+
+def test_surface_matches_full_evaluation() -> None:
+    surface = TargetShareSurface(_strategy(), prices=PRICES, timestamps=TIMESTAMPS)
+    assert surface.shape == (len(TIMESTAMPS), len(PRICES))
+    _assert_matches_full_evaluation(surface)
+    assert surface.update(_strategy()) == 0
+
+
+def test_surface_recomputes_only_cells_in_edited_price_segment() -> None:
+    surface = TargetShareSurface(_strategy(), prices=PRICES, timestamps=TIMESTAMPS)
+    moved = _strategy(
+        price_segments=(
+            PriceSegment(price_low=10_000.0, price_high=20_000.0, weight=60.0),
+            PriceSegment(price_low=22_000.0, price_high=30_000.0, weight=40.0),
+        )
+    )
+    recomputed = surface.update(moved)
+    assert 0 < recomputed < len(TIMESTAMPS) * len(PRICES)
+    _assert_matches_full_evaluation(surface)
+
+    shifted = _strategy(
+        price_segments=(
+            PriceSegment(price_low=10_000.0, price_high=20_000.0, weight=50.0),
+            PriceSegment(price_low=22_000.0, price_high=30_000.0, weight=50.0),
+        )
+    )
+    assert 0 < surface.update(shifted) < len(TIMESTAMPS) * len(PRICES)
+    _assert_matches_full_evaluation(surface)
+
+
+def test_surface_recomputes_timestamps_whose_time_coefficient_changed() -> None:
+    surface = TargetShareSurface(_strategy(), prices=PRICES, timestamps=TIMESTAMPS)
+    old_segment = _strategy().time_segments[0]
+    edited = _strategy(time_segments=(dataclasses.replace(old_segment, k_start=0.9),))
+    # k_start also applies before the segment; the timestamps after it keep k_end.
+    assert surface.update(edited) == 3 * len(PRICES)
+    _assert_matches_full_evaluation(surface)
+
+
+def test_surface_rebuilds_on_market_mode_or_total_weight_change() -> None:
+    surface = TargetShareSurface(_strategy(), prices=PRICES, timestamps=TIMESTAMPS)
+    cells = len(TIMESTAMPS) * len(PRICES)
+    assert surface.update(_strategy(market_mode="bull")) == cells
+    _assert_matches_full_evaluation(surface)
+
+    heavier = _strategy(
+        market_mode="bull",
+        price_segments=(
+            PriceSegment(price_low=10_000.0, price_high=20_000.0, weight=60.0),
+            PriceSegment(price_low=20_000.0, price_high=30_000.0, weight=90.0),
+        ),
+    )
+    assert surface.update(heavier) == cells
+    _assert_matches_full_evaluation(surface)
+
+
+def test_surface_rejects_invalid_axes() -> None:
+    with pytest.raises(ValueError):
+        TargetShareSurface(_strategy(), prices=[], timestamps=TIMESTAMPS)
+    with pytest.raises(ValueError):
+        TargetShareSurface(_strategy(), prices=[0.0], timestamps=TIMESTAMPS)
+    with pytest.raises(ValueError):
+        TargetShareSurface(_strategy(), prices=PRICES, timestamps=["2026-01-01T00:00:00"])
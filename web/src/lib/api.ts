@@ -17,6 +17,7 @@ type EvaluateRowsFromRangesRequest = {
   time_end: string;
   time_steps: number;
   include_price_breakpoints: boolean;
+  tolerance?: number;
 };
 
 type EvaluatePortfolioRequest = {